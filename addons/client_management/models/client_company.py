@@ -7,9 +7,11 @@ class ClientCompany(models.Model):
     _description = 'Data Perusahaan Klien'
 
     # Definisikan kolom-kolomnya
-    name = fields.Char(string="Nama Perusahaan", required=True)
+    # index='trigram': pencarian ilike '%...%' memakai index GIN pg_trgm
+    # (otomatis btree bila ekstensi pg_trgm tidak tersedia)
+    name = fields.Char(string="Nama Perusahaan", required=True, index='trigram')
     phone = fields.Char(string="Telepon Perusahaan")
-    email = fields.Char(string="Email Perusahaan")
+    email = fields.Char(string="Email Perusahaan", index='trigram')
 
     # --- INI BAGIAN PENTING ---
     # Kita membuat relasi Many2one (Banyak ke Satu) ke model 'res.partner'
@@ -1,3 +1,4 @@
 # File ini memberi tahu Python bahwa ini adalah sebuah package
-# Kita juga mengimpor sub-folder 'controllers'
+# Kita juga mengimpor sub-folder 'controllers' dan 'models'
 from . import controllers
+from . import models
@@ -14,6 +14,12 @@
         'views/templates.xml',
         'views/snippets.xml', # <-- TAMBAHKAN FILE BARU INI
     ],
+    'assets': {
+        'web.assets_frontend': [
+            # Memuat baris snippet tabel produk secara asinkron
+            'custom_page_module/static/src/js/product_table.js',
+        ],
+    },
     'installable': True,
     'application': False,
     'auto_install': False,
@@ -2,6 +2,8 @@
 from odoo import http
 from odoo.http import request
 
+from ..models.product_template import SNIPPET_MAX_PAGE_SIZE, SNIPPET_PAGE_SIZE
+
 class CustomWebPage(http.Controller):
 
     @http.route('/halaman-custom-saya', type='http', auth='public', website=True)
@@ -17,3 +19,27 @@ class CustomWebPage(http.Controller):
         # Kita hanya me-render 'cangkang' halamannya
         return request.render('custom_page_module.template_halaman_kustom', {})
 
+    @http.route('/halaman-custom-saya/produk', type='http', auth='public',
+                methods=['GET'], website=True, sitemap=False)
+    def snippet_products(self, search=None, after_id=None, limit=None, **kw):
+        """
+        Data untuk snippet "Tabel Produk Dinamis" (dimuat oleh JavaScript
+        setelah halaman tampil).
+
+        Query parameters:
+        - search: filter nama produk
+        - after_id: cursor, id produk terakhir dari halaman sebelumnya
+        - limit: jumlah produk per halaman (maks. 100)
+        """
+        try:
+            after_id = int(after_id or 0)
+            limit = min(max(int(limit or SNIPPET_PAGE_SIZE), 1), SNIPPET_MAX_PAGE_SIZE)
+        except ValueError:
+            return request.make_json_response(
+                {'error': 'Parameter after_id dan limit harus berupa angka.'}, status=400)
+
+        # Halaman di-cache di server (lihat _get_snippet_page) dan
+        # diinvalidasi saat produk yang tampil berubah
+        page = request.env['product.template']._get_snippet_page(
+            limit=limit, search=(search or '').strip(), after_id=after_id)
+        return request.make_json_response(page, headers=[('Cache-Control', 'private, max-age=60')])
@@ -0,0 +1,2 @@
+# Model tambahan untuk snippet
+from . import product_template
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+from odoo.tools import SQL
+from odoo.tools.lru import LRU
+
+# Jumlah produk per halaman snippet "Tabel Produk Dinamis"
+SNIPPET_PAGE_SIZE = 20
+SNIPPET_MAX_PAGE_SIZE = 100
+
+# Cache halaman JSON snippet (/halaman-custom-saya/produk) per proses worker.
+# Terpisah dari cache template QWeb: invalidasinya tidak ikut mengosongkan
+# template yang sudah dikompilasi.
+_snippet_cache = LRU(256)
+# Sequence signaling: dinaikkan setelah commit bila produk yang tampil
+# berubah, sehingga entry lama tidak berlaku lagi di semua worker
+SNIPPET_SEQUENCE = 'custom_page_module_snippet_seq'
+# Field yang menentukan produk mana yang tampil dan isi barisnya. write_date
+# (parameter 'unique' thumbnail) sengaja tidak dilacak: nilai lama tetap
+# menunjuk gambar yang sama selama image_1920 tidak berubah.
+_SNIPPET_FIELDS = {'name', 'type', 'active', 'company_id', 'image_1920'}
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    def init(self):
+        super().init()
+        self.env.cr.execute(SQL("CREATE SEQUENCE IF NOT EXISTS %s", SQL.identifier(SNIPPET_SEQUENCE)))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        templates = super().create(vals_list)
+        self._invalidate_snippet_product_table()
+        return templates
+
+    def write(self, vals):
+        res = super().write(vals)
+        if _SNIPPET_FIELDS.intersection(vals):
+            self._invalidate_snippet_product_table()
+        return res
+
+    def unlink(self):
+        self._invalidate_snippet_product_table()
+        return super().unlink()
+
+    def _invalidate_snippet_product_table(self):
+        """Naikkan sequence signaling snippet sekali per transaksi, setelah commit."""
+        cr = self.env.cr
+        if cr.postcommit.data.get('custom_page_module.snippet_changed'):
+            return
+        cr.postcommit.data['custom_page_module.snippet_changed'] = True
+        registry = self.env.registry
+
+        @cr.postcommit.add
+        def signal_changes():
+            with registry.cursor() as signal_cr:
+                signal_cr.execute(SQL("SELECT nextval(%s)", SNIPPET_SEQUENCE))
+
+    @api.model
+    def _snippet_cache_generation(self):
+        self.env.cr.execute(SQL(
+            "SELECT (last_value, is_called)::text FROM %s", SQL.identifier(SNIPPET_SEQUENCE)))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _get_snippet_page(self, limit=SNIPPET_PAGE_SIZE, search=None, after_id=0):
+        """
+        Satu halaman snippet yang siap dikirim sebagai JSON, di-cache per
+        worker. Kunci cache mencakup user, perusahaan aktif, bahasa dan
+        website karena semuanya memengaruhi produk yang terlihat.
+
+        Cache hit tidak bebas query: sequence signaling tetap dibaca (satu
+        SELECT ringan) untuk memastikan entry masih berlaku, tetapi produk,
+        gambar dan label tidak dibaca ulang.
+
+        :return: dict ``{'data': [...], 'next_cursor': id atau None}``
+        """
+        key = (
+            self.env.cr.dbname, self.env.uid, tuple(self.env.companies.ids),
+            self.env.lang, self.env.context.get('website_id'), search, after_id, limit,
+        )
+        # Generation dibaca sebelum query: perubahan yang commit di tengah
+        # jalan menaikkan sequence sehingga entry ini langsung kedaluwarsa
+        generation = self._snippet_cache_generation()
+        entry = _snippet_cache.get(key)
+        if entry and entry[0] == generation:
+            return entry[1]
+
+        # Ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+        products = self._get_snippet_product_table(limit=limit + 1, search=search, after_id=after_id)
+        has_more = len(products) > limit
+        products = products[:limit]
+        page = {
+            'data': self._snippet_product_rows(products),
+            'next_cursor': products[-1].id if has_more else None,
+        }
+        _snippet_cache[key] = (generation, page)
+        return page
+
+    @api.model
+    def _get_snippet_product_table(self, limit=SNIPPET_PAGE_SIZE, search=None, after_id=0):
+        """
+        Satu halaman produk untuk snippet tabel produk, diurutkan per id
+        (cursor = id terakhir) agar biaya query sama di halaman mana pun.
+
+        Bila katalog produk custom_rest_api terpasang dan aktif, baca dari
+        read-model (satu query ber-index); id-nya sama dengan product.template.
+        Katalog dibaca dengan sudo, jadi dibatasi ke product.template yang
+        terlihat oleh user saat ini (record rule perusahaan/website).
+        """
+        domain = [('id', '>', after_id)] if after_id else []
+        if search:
+            domain.append(('name', 'ilike', search))
+        if 'rest.product.catalog' in self.env:
+            catalog = self.env['rest.product.catalog'].sudo()
+            if catalog._is_enabled():
+                visible = [('id', 'in', self._search([]))]
+                return catalog.search_fetch(
+                    domain + visible, ['name', 'type', 'source_write_date'], limit=limit, order='id')
+        return self.search_fetch(domain, ['name', 'type', 'write_date'], limit=limit, order='id')
+
+    @api.model
+    def _snippet_product_rows(self, products):
+        """Data baris tabel (JSON) untuk hasil _get_snippet_product_table."""
+        type_labels = dict(self._fields['type']._description_selection(self.env))
+        rows = []
+        for product in products:
+            if product._name == 'rest.product.catalog':
+                changed = product.source_write_date
+            else:
+                changed = product.write_date
+            # 'unique' berubah bila produk berubah, jadi thumbnail boleh
+            # di-cache browser tanpa revalidasi
+            unique = changed.strftime('%Y%m%d%H%M%S') if changed else ''
+            rows.append({
+                'id': product.id,
+                'name': product.name,
+                'type': type_labels.get(product.type, product.type),
+                'image_url': '/web/image/product.template/%s/image_128?unique=%s' % (product.id, unique),
+            })
+        return rows
@@ -0,0 +1,124 @@
+/** @odoo-module **/
+
+/**
+ * Snippet "Tabel Produk Dinamis" (views/snippets.xml).
+ *
+ * Halaman hanya berisi cangkang snippet; baris produk diambil dari
+ * /halaman-custom-saya/produk setelah halaman tampil, per halaman dengan
+ * cursor (id produk terakhir). Thumbnail memakai loading="lazy" sehingga
+ * gambar baru diunduh saat barisnya terlihat.
+ */
+
+const SEARCH_DELAY = 300;
+
+function initProductTable(section) {
+    const endpoint = section.dataset.productEndpoint;
+    const pageSize = parseInt(section.dataset.pageSize, 10) || 20;
+    const table = section.querySelector(".o_product_table");
+    const rows = section.querySelector(".o_product_table_rows");
+    const empty = section.querySelector(".o_product_table_empty");
+    const status = section.querySelector(".o_product_table_status");
+    const moreButton = section.querySelector(".o_product_table_more");
+    const searchInput = section.querySelector(".o_product_table_search");
+
+    let cursor = null;
+    let search = "";
+    let controller = null;
+    let searchTimer = null;
+
+    function renderRow(product) {
+        const tr = document.createElement("tr");
+
+        const imageCell = document.createElement("td");
+        const img = document.createElement("img");
+        img.src = product.image_url;
+        img.alt = product.name;
+        img.loading = "lazy";
+        img.className = "img img-fluid";
+        img.style.maxWidth = "75px";
+        imageCell.appendChild(img);
+
+        const nameCell = document.createElement("td");
+        nameCell.textContent = product.name;
+        const typeCell = document.createElement("td");
+        typeCell.textContent = product.type;
+
+        tr.append(imageCell, nameCell, typeCell);
+        return tr;
+    }
+
+    async function loadPage(reset) {
+        if (controller) {
+            // Batalkan request lama (mis. saat kata kunci pencarian berubah)
+            controller.abort();
+        }
+        controller = new AbortController();
+        if (reset) {
+            cursor = null;
+        }
+
+        const params = new URLSearchParams({ limit: pageSize });
+        if (cursor) {
+            params.set("after_id", cursor);
+        }
+        if (search) {
+            params.set("search", search);
+        }
+
+        status.textContent = "Memuat produk...";
+        status.classList.remove("d-none");
+        moreButton.disabled = true;
+        try {
+            const response = await fetch(`${endpoint}?${params}`, {
+                signal: controller.signal,
+                headers: { Accept: "application/json" },
+            });
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            const result = await response.json();
+
+            if (reset) {
+                rows.replaceChildren();
+            }
+            rows.append(...result.data.map(renderRow));
+            cursor = result.next_cursor;
+
+            const hasRows = rows.children.length > 0;
+            table.classList.toggle("d-none", !hasRows);
+            empty.classList.toggle("d-none", hasRows);
+            moreButton.classList.toggle("d-none", !cursor);
+            status.classList.add("d-none");
+        } catch (error) {
+            if (error.name !== "AbortError") {
+                status.textContent = "Gagal memuat produk.";
+            }
+        } finally {
+            moreButton.disabled = false;
+        }
+    }
+
+    moreButton.addEventListener("click", () => loadPage(false));
+    searchInput.addEventListener("input", () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => {
+            search = searchInput.value.trim();
+            loadPage(true);
+        }, SEARCH_DELAY);
+    });
+
+    // Baris dari render sebelumnya (mis. tersimpan oleh editor) selalu diganti
+    loadPage(true);
+}
+
+function initAll() {
+    for (const section of document.querySelectorAll(".s_dynamic_table[data-product-endpoint]")) {
+        initProductTable(section);
+    }
+}
+
+if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", initAll);
+} else {
+    initAll();
+}
@@ -1,2 +1,48 @@
+import logging
+
+import psycopg2
+
+from odoo.tools import sql
+
 # Memberi tahu Odoo untuk memuat folder 'controllers'
-from . import controllers
\ No newline at end of file
+from . import controllers
+from . import models
+
+_logger = logging.getLogger(__name__)
+
+# Index trigram model dari modul lain yang mungkin sudah terpasang sebelum
+# pg_trgm aktif, sehingga terlanjur dibuat sebagai btree
+_TRIGRAM_INDEXES = [('client_company', 'name'), ('client_company', 'email')]
+
+
+def _enable_trigram(env):
+    """
+    Pasang ekstensi pg_trgm agar field index='trigram' mendapat index GIN
+    (filter ilike '%...%' di REST API). Bila user database tidak berhak
+    membuat ekstensi, Odoo otomatis memakai index btree biasa.
+    """
+    cr = env.cr
+    if not sql.has_trigram(cr):
+        try:
+            with cr.savepoint():
+                cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except psycopg2.Error as e:
+            _logger.warning("Ekstensi pg_trgm tidak bisa dipasang, index trigram diganti btree: %s", e)
+            return
+    # Registry membaca status pg_trgm saat dimuat; perbarui agar index
+    # trigram langsung dibuat pada instalasi ini
+    env.registry.has_trigram = True
+
+    # Hapus index btree pengganti; registry membuatnya ulang sebagai GIN
+    # saat model yang di-inherit modul ini diinisialisasi
+    for table, column in _TRIGRAM_INDEXES:
+        index_name = sql.make_index_name(table, column)
+        cr.execute("SELECT indexdef FROM pg_indexes WHERE indexname = %s", [index_name])
+        row = cr.fetchone()
+        if row and 'gin_trgm_ops' not in row[0]:
+            sql.drop_index(cr, index_name, table)
+
+
+def _build_search_index(env):
+    """Index pencarian /api/search untuk data yang sudah ada sebelum modul dipasang."""
+    env['rest.api.search.document']._rebuild()
@@ -10,8 +10,18 @@
     'depends': [
         'base',      # Selalu dibutuhkan
         'contacts',  # Karena kita akan mengambil data dari modul Contacts
+        'hr',        # Endpoint karyawan & departemen (model di-inherit untuk invalidasi cache)
+        'stock',     # Endpoint produk membaca qty_available / virtual_available
+        'client_management',  # client.company ikut di /api/search
     ],
-    'data': [],
+    'data': [
+        'security/ir.model.access.csv',
+        'data/ir_cron.xml',
+        'data/rest_product_catalog.xml',
+        'data/rest_api_search.xml',
+    ],
+    'pre_init_hook': '_enable_trigram',
+    'post_init_hook': '_build_search_index',
     'installable': True,
     'application': False,
     'auto_install': False,
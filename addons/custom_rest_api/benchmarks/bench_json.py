@@ -0,0 +1,75 @@
+"""
+Micro-benchmark encoder JSON REST API: stdlib json vs orjson.
+
+Payload meniru satu halaman /api/products (100 baris, relasi Many2one
+sebagai dict, teks Html, tanggal dan Decimal). Tidak butuh Odoo:
+
+    python addons/custom_rest_api/benchmarks/bench_json.py [--rows 100] [--repeat 2000]
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import timeit
+from decimal import Decimal
+
+# Muat tools/encoder.py langsung agar package tools (yang mengimpor odoo)
+# tidak ikut dimuat
+_ENCODER_PATH = os.path.join(os.path.dirname(__file__), os.pardir, 'tools', 'encoder.py')
+_spec = importlib.util.spec_from_file_location('rest_api_encoder', _ENCODER_PATH)
+encoder = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(encoder)
+
+
+def make_page(rows):
+    now = datetime.datetime(2025, 1, 1, 8, 30)
+    return {
+        'count': rows,
+        'total': rows * 10,
+        'has_more': True,
+        'limit': rows,
+        'offset': 0,
+        'data': [{
+            'id': i,
+            'name': 'Produk %d' % i,
+            'default_code': 'SKU-%05d' % i,
+            'barcode': None,
+            'list_price': 125000.0 + i,
+            'standard_price': Decimal('99000.50'),
+            'qty_available': float(i % 17),
+            'uom': 'Units',
+            'category': {'id': 3, 'name': 'All / Saleable'},
+            'description': '<p>Deskripsi produk <b>%d</b></p>' % i,
+            'active': True,
+            'write_date': now + datetime.timedelta(minutes=i),
+            'image_url': 'http://localhost:8069/web/image/product.template/%d/image_128' % i,
+        } for i in range(rows)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    page = make_page(args.rows)
+    baseline_size = len(json.dumps(page, default=str).encode())
+    print('payload: %d baris, json.dumps default=str: %d bytes' % (args.rows, baseline_size))
+
+    results = {
+        'json.dumps().encode() (lama)': lambda: json.dumps(page, default=str).encode(),
+    }
+    for name, dumps in encoder.BACKENDS.items():
+        results['encoder %s' % name] = lambda dumps=dumps: dumps(page)
+    if 'orjson' not in encoder.BACKENDS:
+        print('orjson tidak terpasang, hanya backend stdlib yang diukur')
+
+    for label, func in results.items():
+        best = min(timeit.repeat(func, number=args.repeat, repeat=5)) / args.repeat
+        print('%-32s %8.1f us/halaman  %7d bytes' % (label, best * 1e6, len(func())))
+
+
+if __name__ == '__main__':
+    main()
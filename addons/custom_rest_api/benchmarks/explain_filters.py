@@ -0,0 +1,87 @@
+"""
+Benchmark EXPLAIN untuk filter list REST API, sebelum vs sesudah index trigram.
+
+Dijalankan di dalam odoo-bin shell (variabel ``env`` tersedia):
+
+    EXPLAIN_TERM=kantor odoo-bin shell -d <db> < addons/custom_rest_api/benchmarks/explain_filters.py
+
+Setiap domain dijalankan dengan EXPLAIN (ANALYZE, BUFFERS) dua kali:
+dengan index GIN pg_trgm yang dipasang modul ("sesudah") dan setelah index
+tersebut di-DROP di dalam savepoint ("sebelum"). Savepoint di-rollback,
+jadi index tidak benar-benar hilang, tetapi tabel terkunci selama
+pengukuran: jalankan di database development/staging.
+"""
+import os
+
+from odoo.tools import SQL
+
+TERM = os.environ.get('EXPLAIN_TERM', 'a')
+
+
+def _sample_ids(model_name, limit=3):
+    return env[model_name].sudo().search([], limit=limit).ids
+
+
+def cases():
+    yield 'employees department=<nama>', 'hr.employee', [('department_id.name', 'ilike', TERM)]
+    yield 'employees department_id=<id>', 'hr.employee', [('department_id', 'in', _sample_ids('hr.department'))]
+    yield 'employees company=<nama>', 'hr.employee', [('company_id.name', 'ilike', TERM)]
+    yield 'departments name=<nama>', 'hr.department', [('name', 'ilike', TERM)]
+    yield 'products category=<nama>', 'product.template', [('categ_id.name', 'ilike', TERM)]
+    yield 'products categ_id=<id>', 'product.template', [('categ_id', 'in', _sample_ids('product.category'))]
+    yield 'products name', 'product.template', [('name', 'ilike', TERM)]
+    yield 'catalog category=<nama>', 'rest.product.catalog', [('categ_name', 'ilike', TERM)]
+    if 'client.company' in env:
+        yield 'client.company name', 'client.company', [('name', 'ilike', TERM)]
+        yield 'client.company email', 'client.company', [('email', 'ilike', TERM)]
+
+
+def trigram_indexes():
+    env.cr.execute(SQL("""
+        SELECT schemaname, indexname FROM pg_indexes
+         WHERE indexdef LIKE %s AND tablename IN %s
+    """, '%gin_trgm_ops%', (
+        'hr_department', 'res_company', 'product_category',
+        'product_template', 'rest_product_catalog', 'client_company',
+    )))
+    return env.cr.fetchall()
+
+
+def explain(model_name, domain):
+    query = env[model_name].sudo()._search(domain)
+    env.cr.execute(SQL("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) %s", query.select()))
+    plan = env.cr.fetchone()[0][0]
+    return plan['Execution Time'], _scan_nodes(plan['Plan'])
+
+
+def _scan_nodes(node):
+    """Ringkas node scan di plan, mis. 'Bitmap Index Scan(hr_department__name_index)'."""
+    found = []
+    if 'Scan' in node['Node Type']:
+        target = node.get('Index Name') or node.get('Relation Name')
+        found.append('%s(%s)' % (node['Node Type'], target))
+    for child in node.get('Plans', []):
+        found.extend(_scan_nodes(child))
+    return found
+
+
+def main():
+    all_cases = [case for case in cases() if case[1] in env]
+    after = {label: explain(model_name, domain) for label, model_name, domain in all_cases}
+
+    indexes = trigram_indexes()
+    with env.cr.savepoint(flush=False) as savepoint:
+        for schema, name in indexes:
+            env.cr.execute(SQL("DROP INDEX %s", SQL.identifier(schema, name)))
+        before = {label: explain(model_name, domain) for label, model_name, domain in all_cases}
+        savepoint.rollback()
+
+    print("term=%r, index trigram: %s" % (TERM, ', '.join(name for _, name in indexes) or '-'))
+    print("%-32s %12s %12s" % ('filter', 'sebelum ms', 'sesudah ms'))
+    for label, _model, _domain in all_cases:
+        print("%-32s %12.2f %12.2f" % (label, before[label][0], after[label][0]))
+        print("    sebelum: %s" % ' > '.join(before[label][1]))
+        print("    sesudah: %s" % ' > '.join(after[label][1]))
+
+
+main()
@@ -0,0 +1,343 @@
+"""
+Load generator untuk semua route custom_rest_api.
+
+Hanya memakai pustaka standar Python; dijalankan dari mesin yang sama
+dengan server Odoo (database hasil seed_data.py, mode prefork):
+
+    python addons/custom_rest_api/benchmarks/loadgen.py --db bench \\
+        --concurrency 1,8,32 --duration 20 --output hasil/run.json \\
+        [--baseline hasil/baseline.json] [--routes employees,products] [--writes]
+
+Setiap skenario dijalankan selama --duration detik per tingkat
+konkurensi. Per skenario dilaporkan throughput (req/s), latensi
+p50/p95/p99, rata-rata jumlah query SQL (dari header Server-Timing,
+instrumentasi harus aktif) dan puncak RSS total proses server Odoo
+(dibaca dari /proc, jadi server harus lokal).
+
+Dengan --baseline hasil dibandingkan dengan run sebelumnya; exit code 1
+bila p95 naik atau throughput turun lebih dari --max-regression.
+"""
+import argparse
+import gzip
+import http.client
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+_QUERIES_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+# === HTTP ===
+
+class Client:
+    """Satu koneksi keep-alive per thread, memakai cookie session yang sama."""
+
+    def __init__(self, base_url, session_id):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.session_id = session_id
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=120)
+        return conn
+
+    def request(self, method, path, body=None):
+        """:return: tuple (status, body_bytes, headers)"""
+        headers = {'Cookie': 'session_id=%s' % self.session_id, 'Accept-Encoding': 'gzip'}
+        if body is not None:
+            body = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        conn = self._connection()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read(), response.headers
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.conn = None
+            raise
+
+    def json(self, method, path, body=None):
+        status, data, headers = self.request(method, path, body)
+        if status >= 400:
+            raise RuntimeError('%s %s -> %s: %s' % (method, path, status, data[:200]))
+        return _load_json(data, headers)
+
+
+def _load_json(data, headers):
+    if headers.get('Content-Encoding') == 'gzip':
+        data = gzip.decompress(data)
+    return json.loads(data) if data else None
+
+
+def login(base_url, db, login_name, password):
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+    payload = {'jsonrpc': '2.0', 'params': {'db': db, 'login': login_name, 'password': password}}
+    conn.request('POST', '/web/session/authenticate', body=json.dumps(payload),
+                 headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    result = json.loads(response.read())
+    if result.get('error'):
+        sys.exit('login gagal: %s' % result['error'].get('message'))
+    cookie = response.headers.get('Set-Cookie', '')
+    match = re.search(r'session_id=([^;]+)', cookie)
+    if not match:
+        sys.exit('login gagal: server tidak mengirim cookie session_id')
+    return match.group(1)
+
+
+# === SKENARIO ===
+
+class Context:
+    """Id contoh yang dipakai route /<id>, diambil sekali sebelum run."""
+
+    def __init__(self, client):
+        def ids(path):
+            return [row['id'] for row in client.json('GET', path)['data']]
+        self.employee_ids = ids('/api/employees?limit=50&fields=id')
+        self.department_ids = ids('/api/departments?limit=50&fields=id')
+        self.company_ids = ids('/api/companies?fields=id')
+        self.product_ids = ids('/api/products?limit=50&fields=id&count=none')
+        self.partner_ids = ids('/api/contacts?limit=50&fields=id')
+        self.created_ids = []
+        self.counter = itertools.count()
+
+    def pick(self, ids):
+        if not ids:
+            raise IndexError('tidak ada id contoh')
+        return ids[next(self.counter) % len(ids)]
+
+
+def _path(path, **params):
+    return path + ('?' + urlencode(params) if params else '')
+
+
+# (nama, grup --routes, method, path(ctx), body(ctx) atau None, menulis data?)
+SCENARIOS = [
+    ('employees.list', 'employees', 'GET', lambda c: _path('/api/employees', limit=50), None, False),
+    ('employees.cursor', 'employees', 'GET', lambda c: _path('/api/employees', cursor='', limit=50, count='none'), None, False),
+    ('employees.changes', 'employees', 'GET', lambda c: _path('/api/employees/changes', limit=500), None, False),
+    ('employees.get', 'employees', 'GET', lambda c: '/api/employees/%d' % c.pick(c.employee_ids), None, False),
+    ('employees.reports', 'employees', 'GET', lambda c: _path('/api/employees/%d/reports' % c.employee_ids[0], depth=3), None, False),
+    ('employees.aggregate', 'employees', 'GET', lambda c: _path('/api/employees/aggregate', group_by='department,company'), None, False),
+    ('companies.list', 'companies', 'GET', lambda c: '/api/companies', None, False),
+    ('companies.get', 'companies', 'GET', lambda c: '/api/companies/%d' % c.pick(c.company_ids), None, False),
+    ('departments.list', 'departments', 'GET', lambda c: _path('/api/departments', limit=50), None, False),
+    ('departments.get', 'departments', 'GET', lambda c: '/api/departments/%d' % c.pick(c.department_ids), None, False),
+    ('departments.tree', 'departments', 'GET', lambda c: _path('/api/departments/tree', depth=3), None, False),
+    ('departments.aggregate', 'departments', 'GET', lambda c: _path('/api/departments/aggregate', group_by='company'), None, False),
+    ('products.list', 'products', 'GET', lambda c: _path('/api/products', limit=50), None, False),
+    ('products.filter', 'products', 'GET', lambda c: _path('/api/products', limit=50, category='a', count='estimate'), None, False),
+    ('products.changes', 'products', 'GET', lambda c: _path('/api/products/changes', limit=500), None, False),
+    ('products.get', 'products', 'GET', lambda c: '/api/products/%d' % c.pick(c.product_ids), None, False),
+    ('products.image', 'products', 'GET', lambda c: _path('/api/products/%d/image' % c.pick(c.product_ids), size=256), None, False),
+    ('products.aggregate', 'products', 'GET', lambda c: _path('/api/products/aggregate', group_by='category', measures='count,avg:list_price'), None, False),
+    ('contacts.page', 'contacts', 'GET', lambda c: _path('/api/contacts', limit=50, offset=1000), None, False),
+    ('contacts.cursor', 'contacts', 'GET', lambda c: _path('/api/contacts', cursor='', limit=50), None, False),
+    ('contacts.stream', 'contacts', 'GET', lambda c: _path('/api/contacts', format='ndjson'), None, False),
+    ('contacts.changes', 'contacts', 'GET', lambda c: _path('/api/contacts/changes', limit=500), None, False),
+    ('contacts.get', 'contacts', 'GET', lambda c: '/api/contacts/%d' % c.pick(c.partner_ids), None, False),
+    ('search', 'search', 'GET', lambda c: _path('/api/search', q='bench ko', limit=10), None, False),
+    ('cache.stats', 'admin', 'GET', lambda c: '/api/cache/stats', None, False),
+    ('perf.stats', 'admin', 'GET', lambda c: '/api/perf/stats', None, False),
+    ('metrics', 'admin', 'GET', lambda c: '/api/metrics', None, False),
+    # Skenario tulis (--writes): kontak yang dibuat di sini dipakai ulang
+    # oleh update lalu dihapus oleh delete, data seed tidak disentuh
+    ('contacts.create', 'contacts', 'POST', lambda c: '/api/contacts',
+     lambda c: {'name': 'Loadgen %d' % next(c.counter), 'email': 'loadgen%d@bench.example.com' % next(c.counter)}, True),
+    ('contacts.update', 'contacts', 'PUT', lambda c: '/api/contacts/%d' % c.pick(c.created_ids),
+     lambda c: {'phone': '+62811%07d' % next(c.counter)}, True),
+    ('contacts.batch', 'contacts', 'POST', lambda c: '/api/contacts/batch',
+     lambda c: {'update': [{'id': c.pick(c.created_ids), 'city': 'Bandung'} for _i in range(20)]}, True),
+    ('contacts.upsert', 'contacts', 'PUT', lambda c: '/api/contacts/upsert',
+     lambda c: {'key': 'email', 'records': [
+         {'email': 'upsert%d@bench.example.com' % (next(c.counter) % 500), 'name': 'Loadgen Upsert'}
+         for _i in range(20)]}, True),
+    ('contacts.delete', 'contacts', 'DELETE', lambda c: '/api/contacts/%d' % c.created_ids.pop(), None, True),
+]
+
+
+# === PENGUKURAN ===
+
+def server_rss(pattern):
+    """Total RSS (byte) semua proses yang cmdline-nya memuat ``pattern``."""
+    total = 0
+    for pid in filter(str.isdigit, os.listdir('/proc')):
+        try:
+            with open('/proc/%s/cmdline' % pid, 'rb') as f:
+                if pattern.encode() not in f.read():
+                    continue
+            with open('/proc/%s/status' % pid) as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return total
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = max(int(round(percent / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[index]
+
+
+def run_scenario(client, ctx, scenario, concurrency, duration, rss_pattern):
+    name, _group, method, make_path, make_body, _writes = scenario
+    samples, errors, statuses = [], [0], {}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    peak_rss = [server_rss(rss_pattern) if os.path.isdir('/proc') else None]
+    stop_sampler = threading.Event()
+
+    def sampler():
+        while not stop_sampler.wait(0.2):
+            peak_rss[0] = max(peak_rss[0], server_rss(rss_pattern))
+
+    def worker():
+        while time.monotonic() < deadline:
+            try:
+                path = make_path(ctx)
+            except IndexError:
+                return  # kontak buatan loadgen belum ada / sudah habis dihapus
+            body = make_body(ctx) if make_body else None
+            t0 = time.perf_counter()
+            try:
+                status, data, headers = client.request(method, path, body)
+            except (http.client.HTTPException, OSError):
+                with lock:
+                    errors[0] += 1
+                continue
+            elapsed = time.perf_counter() - t0
+            match = _QUERIES_RE.search(headers.get('Server-Timing', ''))
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status >= 400:
+                    errors[0] += 1
+                    continue
+                samples.append((elapsed, int(match.group(1)) if match else None, len(data)))
+                if name == 'contacts.create':
+                    ctx.created_ids.append(_load_json(data, headers)['data']['id'])
+
+    if peak_rss[0] is not None:
+        threading.Thread(target=sampler, daemon=True).start()
+    threads = [threading.Thread(target=worker) for _i in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.monotonic() - started
+    stop_sampler.set()
+
+    latencies = sorted(sample[0] for sample in samples)
+    queries = [sample[1] for sample in samples if sample[1] is not None]
+    return {
+        'scenario': name,
+        'concurrency': concurrency,
+        'requests': len(samples),
+        'errors': errors[0],
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput': round(len(samples) / wall, 2) if wall else 0,
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'p99_ms': _ms(percentile(latencies, 99)),
+        'avg_queries': round(sum(queries) / len(queries), 1) if queries else None,
+        'avg_bytes': round(sum(sample[2] for sample in samples) / len(samples)) if samples else None,
+        'peak_rss_mb': round(peak_rss[0] / 2 ** 20, 1) if peak_rss[0] else None,
+    }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+# === LAPORAN & BASELINE ===
+
+def print_table(results):
+    print('%-24s %4s %8s %9s %9s %9s %8s %7s %9s' % (
+        'skenario', 'c', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'error', 'rss MB'))
+    for r in results:
+        print('%-24s %4d %8.1f %9s %9s %9s %8s %7d %9s' % (
+            r['scenario'], r['concurrency'], r['throughput'], r['p50_ms'], r['p95_ms'],
+            r['p99_ms'], r['avg_queries'], r['errors'], r['peak_rss_mb']))
+
+
+def compare(results, baseline_path, max_regression):
+    """:return: jumlah regresi terhadap baseline"""
+    with open(baseline_path) as f:
+        baseline = {(r['scenario'], r['concurrency']): r for r in json.load(f)['results']}
+    regressions = 0
+    print('\nperbandingan dengan %s (ambang %.0f%%):' % (baseline_path, max_regression * 100))
+    for r in results:
+        base = baseline.get((r['scenario'], r['concurrency']))
+        if not base or not base['p95_ms'] or not r['p95_ms'] or not base['throughput']:
+            continue
+        p95_change = r['p95_ms'] / base['p95_ms'] - 1
+        throughput_change = r['throughput'] / base['throughput'] - 1
+        regressed = p95_change > max_regression or throughput_change < -max_regression
+        regressions += regressed
+        print('%-24s %4d  p95 %+7.1f%%  req/s %+7.1f%%  queries %s -> %s%s' % (
+            r['scenario'], r['concurrency'], p95_change * 100, throughput_change * 100,
+            base['avg_queries'], r['avg_queries'], '  REGRESI' if regressed else ''))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:8069')
+    parser.add_argument('--db', required=True)
+    parser.add_argument('--login', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--concurrency', default='1,8,32', help='tingkat konkurensi dipisah koma')
+    parser.add_argument('--duration', type=float, default=20, help='detik per skenario per tingkat')
+    parser.add_argument('--routes', help='grup skenario dipisah koma (default semua)')
+    parser.add_argument('--writes', action='store_true', help='ikut jalankan skenario yang menulis data')
+    parser.add_argument('--rss-pattern', default='odoo', help='pola cmdline proses server untuk RSS')
+    parser.add_argument('--output', help='simpan hasil sebagai JSON')
+    parser.add_argument('--baseline', help='JSON hasil run sebelumnya untuk dibandingkan')
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args()
+
+    client = Client(args.url, login(args.url, args.db, args.login, args.password))
+    ctx = Context(client)
+    groups = set(args.routes.split(',')) if args.routes else None
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if (groups is None or scenario[1] in groups) and (args.writes or not scenario[5])
+    ]
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    results = []
+    for scenario in scenarios:
+        for level in levels:
+            result = run_scenario(client, ctx, scenario, level, args.duration, args.rss_pattern)
+            results.append(result)
+            print('%-24s c=%-3d %8.1f req/s  p95 %s ms' % (
+                result['scenario'], level, result['throughput'], result['p95_ms']), file=sys.stderr)
+
+    print_table(results)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {'url': args.url, 'db': args.db, 'duration': args.duration,
+                         'concurrency': levels, 'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+                'results': results,
+            }, f, indent=2)
+    if args.baseline and compare(results, args.baseline, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Isi database benchmark dengan volume data yang bisa diatur.
+
+Dijalankan di dalam odoo-bin shell (variabel ``env`` tersedia), pada
+database khusus benchmark yang sudah memasang custom_rest_api:
+
+    SEED_PARTNERS=500000 SEED_EMPLOYEES=50000 SEED_PRODUCTS=100000 \\
+        odoo-bin shell -d bench < addons/custom_rest_api/benchmarks/seed_data.py
+
+Variabel lingkungan (default dalam kurung):
+- SEED_PARTNERS (500000), SEED_EMPLOYEES (50000), SEED_PRODUCTS (100000),
+  SEED_DEPARTMENTS (200)
+- SEED_IMAGE_EVERY (1): setiap produk ke-N mendapat gambar, 0 = tanpa gambar
+- SEED_BATCH (2000): jumlah record per create() dan per commit
+
+Idempoten: record benchmark ditandai (ref/default_code 'BENCH-...', nama
+'Bench ...') dan hanya kekurangannya yang dibuat, jadi skrip bisa
+dijalankan ulang setelah terputus atau untuk menaikkan volume. Record
+dibuat lewat ORM (bukan INSERT langsung) agar index pencarian, katalog
+produk dan gambar ter-resize persis seperti data produksi.
+
+Skrip juga mematikan rate limit dan batas slot ekspor (yang diukur adalah
+kapasitas endpoint, bukan limiter) dan menyalakan instrumentasi
+(Server-Timing dipakai loadgen.py untuk jumlah query per request).
+"""
+import base64
+import io
+import os
+import random
+import time
+
+from PIL import Image
+
+from odoo.tools import SQL
+
+PARTNERS = int(os.environ.get('SEED_PARTNERS', 500000))
+EMPLOYEES = int(os.environ.get('SEED_EMPLOYEES', 50000))
+PRODUCTS = int(os.environ.get('SEED_PRODUCTS', 100000))
+DEPARTMENTS = int(os.environ.get('SEED_DEPARTMENTS', 200))
+IMAGE_EVERY = int(os.environ.get('SEED_IMAGE_EVERY', 1))
+BATCH = int(os.environ.get('SEED_BATCH', 2000))
+# Setiap karyawan melapor ke karyawan (i - 1) // FAN_OUT: pohon atasan-bawahan
+# dengan kedalaman ~log8(N) untuk /api/employees/<id>/reports
+FAN_OUT = 8
+
+CITIES = ['Jakarta', 'Bandung', 'Surabaya', 'Medan', 'Makassar', 'Semarang', 'Denpasar', 'Yogyakarta']
+WORDS = ['Kopi', 'Teh', 'Beras', 'Gula', 'Minyak', 'Sabun', 'Kertas', 'Kabel', 'Baut', 'Cat', 'Lampu', 'Kain']
+
+rng = random.Random(42)
+ctx = dict(tracking_disable=True, mail_create_nolog=True, mail_notrack=True, no_reset_password=True)
+
+
+def _seed(model_name, marker_domain, target, make_vals):
+    """Buat record ``model_name`` sampai jumlah bertanda mencapai ``target``."""
+    Model = env[model_name].sudo().with_context(ctx, active_test=False)
+    existing = Model.search_count(marker_domain)
+    t0 = time.time()
+    for start in range(existing, target, BATCH):
+        stop = min(start + BATCH, target)
+        Model.create([make_vals(i) for i in range(start, stop)])
+        env.cr.commit()
+        env.invalidate_all()
+        print("%s: %d/%d (%.0f rec/s)" % (model_name, stop, target, (stop - existing) / (time.time() - t0)))
+    return Model.search(marker_domain, order='id').ids
+
+
+def _image(i):
+    """PNG 512x512 berwarna unik per produk (checksum attachment berbeda)."""
+    buffer = io.BytesIO()
+    color = ((i * 37) % 256, (i * 91) % 256, (i * 173) % 256)
+    Image.new('RGB', (512, 512), color).save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue())
+
+
+def seed_partners():
+    def vals(i):
+        return {
+            'name': 'Bench Kontak %07d' % i,
+            'ref': 'BENCH-P%07d' % i,
+            'email': 'kontak%07d@bench.example.com' % i,
+            'phone': '+62812%07d' % i,
+            'city': CITIES[i % len(CITIES)],
+            'is_company': i % 10 == 0,
+        }
+    return _seed('res.partner', [('ref', '=like', 'BENCH-P%')], PARTNERS, vals)
+
+
+def seed_departments():
+    Department = env['hr.department'].sudo().with_context(ctx)
+    ids = Department.search([('name', '=like', 'Bench Dept %')], order='id').ids
+    # Dibuat satu per satu: parent_id menunjuk departemen yang dibuat sebelumnya
+    for i in range(len(ids), DEPARTMENTS):
+        parent_id = ids[rng.randrange(len(ids))] if ids and i % 10 else False
+        ids.append(Department.create({'name': 'Bench Dept %04d' % i, 'parent_id': parent_id}).id)
+    env.cr.commit()
+    print("hr.department: %d" % len(ids))
+    return ids
+
+
+def seed_employees(department_ids):
+    Employee = env['hr.employee'].sudo().with_context(ctx, active_test=False)
+    marker = [('name', '=like', 'Bench Karyawan %')]
+    ids = Employee.search(marker, order='id').ids
+    t0, existing = time.time(), len(ids)
+    start = existing
+    while start < EMPLOYEES:
+        # Atasan setiap karyawan di batch ini harus sudah dibuat
+        stop = min(start + BATCH, EMPLOYEES, FAN_OUT * len(ids) + 1)
+        records = Employee.create([{
+            'name': 'Bench Karyawan %06d' % i,
+            'work_email': 'karyawan%06d@bench.example.com' % i,
+            'job_title': rng.choice(['Staff', 'Supervisor', 'Analis', 'Teknisi', 'Manajer']),
+            'department_id': department_ids[i % len(department_ids)],
+            'parent_id': ids[(i - 1) // FAN_OUT] if i else False,
+        } for i in range(start, stop)])
+        ids.extend(records.ids)
+        env.cr.commit()
+        env.invalidate_all()
+        print("hr.employee: %d/%d (%.0f rec/s)" % (stop, EMPLOYEES, (stop - existing) / (time.time() - t0)))
+        start = stop
+    return ids
+
+
+def seed_products():
+    categories = env['product.category'].sudo().search([], limit=20).ids
+
+    def vals(i):
+        values = {
+            'name': 'Bench %s %s %06d' % (WORDS[i % len(WORDS)], WORDS[(i // 7) % len(WORDS)], i),
+            'default_code': 'BENCH-%07d' % i,
+            'barcode': '899%010d' % i,
+            'list_price': round(rng.uniform(1000, 5000000), 2),
+            'weight': round(rng.uniform(0.1, 50), 2),
+            'categ_id': categories[i % len(categories)],
+            'type': 'consu',
+        }
+        if IMAGE_EVERY and i % IMAGE_EVERY == 0:
+            values['image_1920'] = _image(i)
+        return values
+    return _seed('product.template', [('default_code', '=like', 'BENCH-%')], PRODUCTS, vals)
+
+
+def configure():
+    ICP = env['ir.config_parameter'].sudo()
+    ICP.set_param('custom_rest_api.rate_limit_rate', '0')
+    ICP.set_param('custom_rest_api.concurrency_export', '0')
+    ICP.set_param('custom_rest_api.instrumentation', '1')
+    env.cr.commit()
+
+
+def main():
+    configure()
+    seed_partners()
+    employee_ids = seed_employees(seed_departments())
+    seed_products()
+    # Statistik planner terbaru agar rencana query sama dengan produksi
+    env.cr.execute(SQL("ANALYZE"))
+    env.cr.commit()
+    print("selesai; karyawan akar org chart: %s" % (employee_ids[0] if employee_ids else '-'))
+
+
+main()
@@ -0,0 +1,291 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from odoo.http import request, Response
+
+from ..tools import aggregation, compression, conditional, counting, encoder, filters, instrumentation, metrics, pagination, rate_limit, serializers, sync
+
+SECURITY_HEADERS = (
+    ('X-Content-Type-Options', 'nosniff'),  # Mencegah MIME-sniffing
+    ('X-Frame-Options', 'DENY'),  # Mencegah clickjacking
+    ('X-XSS-Protection', '1; mode=block'),  # Proteksi XSS
+)
+
+PageParams = namedtuple('PageParams', 'limit offset cursor count_mode')
+
+
+@lru_cache(maxsize=None)
+def compile_headers(origin, methods):
+    """
+    Header CORS + keamanan untuk satu kombinasi origin/methods, dihitung
+    sekali per proses lalu dipakai ulang sebagai tuple immutable.
+    """
+    return (
+        ('Content-Type', 'application/json'),
+        ('Access-Control-Allow-Origin', origin),
+        ('Access-Control-Allow-Methods', methods),
+        ('Access-Control-Allow-Headers', 'Content-Type, Authorization'),
+        ('Access-Control-Allow-Credentials', 'true'),
+    ) + SECURITY_HEADERS
+
+
+class RestResource:
+    """
+    Helper bersama untuk controller REST API.
+
+    Dipakai sebagai mixin: ``class XAPI(RestResource, http.Controller)``.
+    Mixin ini sengaja tidak mewarisi ``http.Controller``; Odoo menggabungkan
+    semua turunan satu controller menjadi satu kelas, sehingga route milik
+    resource yang berbeda akan saling bertabrakan.
+    """
+
+    # Ganti dengan origin frontend Anda (misal: port React/Vue)
+    _cors_origin = 'http://localhost:5173'
+
+    def _get_cors_headers(self, methods='GET, OPTIONS'):
+        """Salinan header yang sudah dikompilasi, aman diubah per request (ETag dll)."""
+        return dict(compile_headers(self._cors_origin, methods))
+
+    def _preflight(self, methods='GET, OPTIONS'):
+        """Jawab pre-flight OPTIONS tanpa menyentuh env maupun ORM."""
+        return Response(status=200, headers=compile_headers(self._cors_origin, methods))
+
+    def _make_json_response(self, data, status=200, headers=None):
+        """
+        Helper untuk membuat response JSON (header keamanan sudah termasuk).
+        Body langsung berupa bytes dari tools/encoder.py (orjson bila ada).
+        """
+        if headers is None:
+            headers = compile_headers(self._cors_origin, 'GET, OPTIONS')
+        if isinstance(data, dict) and isinstance(data.get('data'), list):
+            instrumentation.count_rows(len(data['data']))
+        with instrumentation.phase('encode'):
+            body = encoder.dumps(data)
+        body, headers = self._compress(body, headers)
+        return Response(body, status=status, headers=headers)
+
+    def _compress(self, body, headers):
+        """
+        Kompres body (gzip/brotli sesuai Accept-Encoding) bila ukurannya di
+        atas ambang 'custom_rest_api.compression_min_size'.
+
+        :return: tuple (body, headers); headers disalin bila diubah
+        """
+        encoding = compression.negotiate(request.httprequest)
+        if not encoding:
+            return body, headers
+        threshold = compression.min_size(request.env)
+        if not threshold or len(body) < threshold:
+            return body, headers
+
+        headers = dict(headers)
+        headers['Content-Encoding'] = encoding
+        headers['Vary'] = 'Accept-Encoding'
+        compression.weaken_etag(headers)
+        with instrumentation.phase('compress'):
+            body = compression.compress(body, encoding)
+        return body, headers
+
+    # === RATE LIMIT ===
+
+    def _throttle(self, headers):
+        """
+        Token bucket per klien (user terautentikasi atau IP), lihat
+        tools/rate_limit.py.
+
+        :return: None atau response 429 dengan Retry-After
+        """
+        # env.uid sudah divalidasi auth route (session atau API key);
+        # request anonim memakai user public dan jatuh ke bucket IP
+        uid = None if request.env.user._is_public() else request.env.uid
+        key = rate_limit.client_key(request.httprequest, uid)
+        try:
+            rate_limit.check_rate(request.env, key)
+        except rate_limit.RateLimited as e:
+            return self._too_many_requests(e, headers)
+        return None
+
+    def _acquire_slot(self, group, headers):
+        """
+        Batasi request bersamaan grup route ``group`` (mis. 'export') di
+        seluruh worker; slot lepas saat transaksi request selesai.
+
+        :return: None atau response 429 dengan Retry-After
+        """
+        try:
+            rate_limit.acquire_slot(request.env, group)
+        except rate_limit.RateLimited as e:
+            return self._too_many_requests(e, headers)
+        return None
+
+    def _too_many_requests(self, error, headers):
+        metrics.store.inc('rest_api_rate_limited_total', reason=error.reason)
+        headers = dict(headers, **{'Retry-After': str(error.retry_after)})
+        message = 'Terlalu banyak request, coba lagi nanti.' if error.reason == 'rate' else \
+            'Terlalu banyak request berat yang sedang berjalan, coba lagi nanti.'
+        return self._make_json_response({'error': message}, status=429, headers=headers)
+
+    # === PARAMETER LIST ===
+
+    def _parse_page_params(self, kw, headers, default_limit=50, max_limit=100,
+                           cursor=True, count=True):
+        """
+        Baca limit/offset, cursor dan count dari query string.
+
+        :param default_limit: limit bila parameter tidak dikirim (0 = semua data)
+        :param max_limit: batas atas limit, None berarti tanpa batas
+        :param cursor: apakah endpoint mendukung mode cursor
+        :param count: apakah endpoint mendukung parameter count
+        :return: tuple (PageParams, None) atau (None, response_400)
+        """
+        try:
+            limit = max(int(kw.get('limit') or default_limit), 0)
+            if max_limit:
+                limit = min(limit, max_limit)
+            offset = max(int(kw.get('offset') or 0), 0)
+            page_cursor = pagination.parse_cursor_params(kw) if cursor else None
+            count_mode = counting.parse_count_mode(kw) if count else 'exact'
+        except pagination.CursorError:
+            message = 'Parameter cursor tidak valid.'
+        except counting.CountModeError:
+            message = 'Parameter count harus exact, estimate atau none.'
+        except ValueError:
+            message = 'Parameter limit dan offset harus berupa angka.'
+        else:
+            if page_cursor:
+                # limit=0 (semua data) tidak berlaku di mode cursor
+                limit = limit or pagination.DEFAULT_CURSOR_LIMIT
+            return PageParams(limit, offset, page_cursor, count_mode), None
+        return None, self._make_json_response({'error': message}, status=400, headers=headers)
+
+    def _parse_filters(self, kw, headers, spec):
+        """
+        Susun domain dari parameter filter (lihat tools/filters.py).
+
+        :return: tuple (domain, None) atau (None, response_400)
+        """
+        try:
+            return filters.build_domain(kw, spec), None
+        except filters.FilterError as e:
+            return None, self._make_json_response(
+                {'error': 'Parameter %s tidak valid (id dipisah koma).' % e.param},
+                status=400, headers=headers)
+
+    def _list_payload(self, Model, domain, page, headers, format_records,
+                      relations=(), depends=(), conditional_get=True, order=None):
+        """
+        Jalur baca list bersama: conditional GET, pencarian offset atau
+        cursor, serialisasi dan total sesuai mode count.
+
+        :param format_records: callable(recordset) -> list dict
+        :param relations: field Many2one yang namanya ikut di body (ETag)
+        :param depends: pasangan ``(model, domain)`` lain yang ikut
+                        menentukan body (ETag), lihat tools/conditional.py
+        :param conditional_get: False bila body memuat data yang tidak bisa
+                                dilacak validator (mis. stok computed)
+        :param order: urutan paginasi offset (default ``_order`` model)
+        :return: tuple (response_304_atau_None, response_data_atau_None)
+        """
+        # Conditional GET: pada mode count=exact, satu query agregat
+        # (max write_date, jumlah) menggantikan search_count sekaligus
+        # menjadi dasar ETag; list yang tidak berubah dijawab 304.
+        exact_count = None
+        if conditional_get and page.count_mode == 'exact':
+            not_modified, exact_count = conditional.check_list(
+                Model, domain, headers, relations, depends)
+            if not_modified:
+                return not_modified, None
+
+        if page.cursor:
+            records, next_cursor = pagination.search_after(Model, domain, page.limit, page.cursor)
+            has_more = bool(next_cursor)
+        else:
+            records, has_more = pagination.search_page(
+                Model, domain, page.limit, page.offset, page.count_mode, order)
+
+        data = format_records(records)
+
+        # Hitung total untuk paginasi (opsional, lihat parameter count)
+        if exact_count is None:
+            total_count = counting.count_records(Model, domain, page.count_mode)
+        else:
+            total_count = exact_count
+        if has_more is None:
+            has_more = page.offset + len(data) < total_count
+
+        response_data = {
+            'count': len(data),
+            'total': total_count,
+            'has_more': has_more,
+            'limit': page.limit,
+            'data': data,
+        }
+        if page.cursor:
+            response_data['next_cursor'] = next_cursor
+        else:
+            response_data['offset'] = page.offset
+        return None, response_data
+
+    def _changes_payload(self, Model, kw, headers, schema, expansions, format_records):
+        """
+        Jalur baca bersama endpoint feed sinkronisasi delta /changes.
+
+        Query parameters:
+        - since: token 'next_token' dari response sebelumnya (kosong = dari awal)
+        - limit: jumlah maksimum record per halaman
+        - fields / expand: sama seperti endpoint list
+
+        Response berisi record yang berubah sejak token, id yang dihapus atau
+        diarsipkan ('deleted'), 'has_more' dan 'next_token' untuk panggilan
+        berikutnya. Record bisa terkirim lebih dari sekali; klien cukup
+        melakukan upsert berdasarkan id.
+
+        :param Model: model sumber yang sudah di-sudo
+        :param format_records: callable(recordset, keys, expand) -> list dict
+        :return: tuple (response_data, None) atau (None, response_4xx)
+        """
+        try:
+            limit = min(int(kw.get('limit', sync.DEFAULT_SYNC_LIMIT)), sync.MAX_SYNC_LIMIT)
+            keys, expand = serializers.parse_fields_params(kw, schema, expansions)
+        except serializers.FieldSelectionError as e:
+            return None, self._make_json_response({'error': e.message}, status=400, headers=headers)
+        except ValueError:
+            return None, self._make_json_response(
+                {'error': 'Parameter limit harus berupa angka.'}, status=400, headers=headers)
+
+        try:
+            result = sync.changes_since(
+                Model, kw.get('since'), max(limit, 1),
+                lambda records: format_records(records, keys, expand),
+            )
+        except sync.SyncTokenError:
+            return None, self._make_json_response(
+                {'error': 'Token since tidak valid.'}, status=400, headers=headers)
+        except sync.SyncTokenExpired:
+            return None, self._make_json_response(
+                {'error': 'Token since sudah kedaluwarsa, lakukan sinkronisasi penuh.', 'full_resync': True},
+                status=410, headers=headers)
+        result['count'] = len(result['data'])
+        return result, None
+
+    def _aggregate_payload(self, Model, kw, headers, filter_spec, group_spec, measure_spec):
+        """
+        Statistik ``group_by``/``measures`` dengan filter list yang sama,
+        dihitung dalam satu _read_group (lihat tools/aggregation.py).
+
+        :return: tuple (response_data, None) atau (None, response_400)
+        """
+        try:
+            group_keys, measures = aggregation.parse_params(kw, group_spec, measure_spec)
+        except aggregation.AggregateError as e:
+            return None, self._make_json_response({'error': e.message}, status=400, headers=headers)
+        domain, error = self._parse_filters(kw, headers, filter_spec)
+        if error:
+            return None, error
+        data = aggregation.aggregate(Model, domain, group_spec, group_keys, measures)
+        return {
+            'group_by': group_keys,
+            'measures': [key for key, _spec in measures],
+            'count': len(data),
+            'data': data,
+        }, None
@@ -2,9 +2,44 @@ import json
 import logging
 from odoo import http
 from odoo.http import request, Response
+from odoo.tools import consteq
+
+from .base import RestResource
+from ..tools import batch, compression, conditional, encoder, filters, hierarchy, images, instrumentation, metrics, pagination, rate_limit, response_cache, serializers, streaming
+from ..tools.serializers import computed, field, name_of, relation
 
 _logger = logging.getLogger(__name__)
 
+
+def _product_image_url(product_id, size=images.DEFAULT_SIZE, checksum=None):
+    """
+    Build absolute image URL for /api/products/<id>/image. This keeps
+    payloads small by default and lets frontend fetch the binary when needed.
+    The attachment checksum is used as 'unique', so the URL only changes
+    when the image does and can be cached as immutable.
+    """
+    host_url = request.httprequest.host_url.rstrip('/') if request and request.httprequest else ''
+    if not host_url:
+        return None
+    url = f"{host_url}/api/products/{product_id}/image?size={size}"
+    return f"{url}&unique={checksum}" if checksum else url
+
+
+def _product_image_urls(products, size=images.DEFAULT_SIZE):
+    """Image URL for every product; attachment checksums are read in one query."""
+    checksums = images.checksums(products, images.IMAGE_FIELDS[size], 'product.template')
+    return {product_id: _product_image_url(product_id, size, checksums.get(product_id))
+            for product_id in products.ids}
+
+
+def _department_headcounts(departments):
+    """Active employees per department in one GROUP BY (same as member_ids)."""
+    return {
+        department.id: count
+        for department, count in departments.env['hr.employee'].sudo()._read_group(
+            [('department_id', 'in', departments.ids)], ['department_id'], ['__count'])
+    }
+
 class ContactAPI(http.Controller):
     
     # === PENGATURAN & HELPER ===
@@ -13,11 +48,12 @@ class ContactAPI(http.Controller):
     # Gunakan '*' hanya untuk pengembangan, jangan di produksi.
     _cors_origin = 'http://localhost:5173'
 
-class EmployeeAPI(http.Controller):
+class EmployeeAPI(RestResource, http.Controller):
     """API Controller untuk mengakses data karyawan dengan keamanan yang ketat."""
-    
-    _cors_origin = 'http://localhost:5173'
-    
+
+    # Model sumber data /api/employees/aggregate, untuk invalidasi response cache
+    _cache_models = ('hr.employee', 'hr.department', 'hr.job', 'res.company')
+
     # Daftar field yang aman untuk ditampilkan
     # Hindari field sensitif seperti bank_account_id, private_email, dll
     _safe_fields = [
@@ -27,62 +63,63 @@ class EmployeeAPI(http.Controller):
         'job_id', 'resource_calendar_id', 'parent_id'
     ]
     
-    def _get_cors_headers(self, methods='GET, OPTIONS'):
-        """Helper untuk menghasilkan header CORS yang aman."""
-        return {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': self._cors_origin,
-            'Access-Control-Allow-Methods': methods,
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-            'Access-Control-Allow-Credentials': 'true',
-            'X-Content-Type-Options': 'nosniff',  # Mencegah MIME-sniffing
-            'X-Frame-Options': 'DENY',  # Mencegah clickjacking
-            'X-XSS-Protection': '1; mode=block'  # Proteksi XSS
-        }
     
-    def _format_employee_data(self, employee):
+    # Skema output (allowlist untuk ?fields=); hanya memakai _safe_fields
+    _employee_schema = {
+        'id': field('id'),
+        'name': field('name'),
+        'work_email': field('work_email', or_none=True),
+        'work_phone': field('work_phone', or_none=True),
+        'job_title': field('job_title', or_none=True),
+        'department': name_of('department_id'),
+        'company': name_of('company_id'),
+        'work_location': name_of('work_location_id'),
+        'employee_type': field('employee_type', or_none=True),
+        'job_position': name_of('job_id'),
+        'work_schedule': name_of('resource_calendar_id'),
+        'manager': relation('parent_id'),
+    }
+
+    # Filter query string: department, company (nama), active, serta
+    # department_id / company_id (id, tanpa join ke tabel relasi)
+    _employee_filters = {
+        'department': filters.ilike('department_id.name'),
+        'company': filters.ilike('company_id.name'),
+        'active': filters.boolean('active'),
+        'department_id': filters.id_in('department_id'),
+        'company_id': filters.id_in('company_id'),
+    }
+
+    # Allowlist /api/employees/aggregate: group_by -> groupby _read_group,
+    # measures -> field numerik (karyawan hanya punya count)
+    _employee_group_by = {
+        'department': 'department_id',
+        'company': 'company_id',
+        'job': 'job_id',
+        'manager': 'parent_id',
+        'active': 'active',
+    }
+    _employee_measures = {}
+
+    # Relasi yang bisa di-expand lewat ?expand= beserta field nested-nya
+    _employee_expand = {
+        'manager': ('parent_id', ['name', 'work_email', 'work_phone', 'job_title', 'department_id']),
+        'department': ('department_id', ['name', 'complete_name', 'manager_id']),
+        'company': ('company_id', ['name', 'email', 'phone', 'website', 'country_id']),
+    }
+
+    def _format_employee_list(self, employees, keys=None, expand=()):
         """
-        Helper untuk memformat data karyawan ke dict dengan memperhatikan keamanan.
+        Helper untuk memformat recordset karyawan ke list dict dengan memperhatikan keamanan.
         Hanya mengembalikan field yang sudah didefinisikan sebagai aman.
+        Semua relasi dibaca secara batch (lihat tools/serializers.py).
         """
-        if not employee or not employee.exists():
-            return {}
-            
-        data = {
-            'id': employee.id,
-            'name': employee.name,
-            'work_email': employee.work_email or None,
-            'work_phone': employee.work_phone or None,
-            'job_title': employee.job_title or None,
-            'department': employee.department_id.name if employee.department_id else None,
-            'company': employee.company_id.name if employee.company_id else None,
-            'work_location': employee.work_location_id.name if employee.work_location_id else None,
-            'employee_type': employee.employee_type or None,
-            'job_position': employee.job_id.name if employee.job_id else None,
-            'work_schedule': employee.resource_calendar_id.name if employee.resource_calendar_id else None,
-            'manager': {
-                'id': employee.parent_id.id,
-                'name': employee.parent_id.name
-            } if employee.parent_id else None
-        }
-        
-        return data
-    
-    def _make_json_response(self, data, status=200, headers={}):
-        """Helper untuk membuat response JSON yang aman."""
-        # Tambahkan header keamanan default
-        security_headers = {
-            'X-Content-Type-Options': 'nosniff',
-            'X-Frame-Options': 'DENY',
-            'X-XSS-Protection': '1; mode=block'
-        }
-        headers.update(security_headers)
-        
-        return Response(
-            json.dumps(data),
-            status=status,
-            headers=headers
-        )
+        return serializers.serialize(
+            employees, self._employee_schema, keys, self._employee_expand, expand)
+
+    def _format_employee_data(self, employee, keys=None, expand=()):
+        """Helper untuk memformat satu karyawan ke dict."""
+        return self._format_employee_list(employee, keys, expand)[0] if employee else {}
 
     # === ENDPOINT EMPLOYEES ===
     
@@ -103,12 +140,18 @@ class EmployeeAPI(http.Controller):
         - department: filter berdasarkan departemen
         - company: filter berdasarkan perusahaan
         - active: filter berdasarkan status aktif
+        - cursor / after_id: aktifkan mode cursor (keyset), lihat tools/pagination.py
+        - order: urutan mode cursor, 'id' (default) atau 'write_date'
+        - count: 'exact' (default), 'estimate' (estimasi planner) atau
+          'none' (tanpa total, cukup 'has_more')
         """
-        headers = self._get_cors_headers(methods='GET, OPTIONS')
-        
         # Handle pre-flight OPTIONS request
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
             
         try:
             # Verifikasi akses pengguna
@@ -118,49 +161,31 @@ class EmployeeAPI(http.Controller):
                     status=403, headers=headers
                 )
             
-            # Persiapkan domain pencarian
-            domain = []
-            
-            # Filter berdasarkan departemen
-            if kw.get('department'):
-                domain.append(('department_id.name', 'ilike', kw.get('department')))
-            
-            # Filter berdasarkan perusahaan
-            if kw.get('company'):
-                domain.append(('company_id.name', 'ilike', kw.get('company')))
-            
-            # Filter berdasarkan status aktif
-            if 'active' in kw:
-                domain.append(('active', '=', kw.get('active').lower() == 'true'))
-            
-            # Ambil parameter paginasi
+            # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
             try:
-                limit = min(int(kw.get('limit', 50)), 100)  # Batasi maksimum 100 record
-                offset = max(int(kw.get('offset', 0)), 0)  # Pastikan offset tidak negatif
-            except ValueError:
-                return self._make_json_response(
-                    {'error': 'Parameter limit dan offset harus berupa angka.'}, 
-                    status=400, headers=headers
-                )
-            
+                keys, expand = serializers.parse_fields_params(kw, self._employee_schema, self._employee_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
+            # Persiapkan domain pencarian & parameter paginasi
+            domain, error = self._parse_filters(kw, headers, self._employee_filters)
+            if error:
+                return error
+            page, error = self._parse_page_params(kw, headers, default_limit=50, max_limit=100)
+            if error:
+                return error
+
             # Ambil data karyawan dengan sudo() terbatas
             Employee = request.env['hr.employee'].sudo().with_context(active_test=True)
-            employees = Employee.search(domain, limit=limit, offset=offset)
-            
-            # Format data karyawan
-            data = [self._format_employee_data(emp) for emp in employees]
-            
-            # Hitung total untuk paginasi
-            total_count = Employee.search_count(domain)
-            
-            response_data = {
-                'count': len(data),
-                'total': total_count,
-                'offset': offset,
-                'limit': limit,
-                'data': data
-            }
-            
+            not_modified, response_data = self._list_payload(
+                Employee, domain, page, headers,
+                lambda employees: self._format_employee_list(employees, keys, expand),
+                relations=serializers.relation_fields(
+                    Employee, self._employee_schema, keys, self._employee_expand, expand),
+            )
+            if not_modified:
+                return not_modified
+
             return self._make_json_response(response_data, status=200, headers=headers)
             
         except Exception as e:
@@ -171,6 +196,184 @@ class EmployeeAPI(http.Controller):
                 status=500, headers=headers
             )
 
+    @http.route('/api/employees/changes',
+              type='http',
+              auth='public',
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def get_employee_changes(self, **kw):
+        """Feed sinkronisasi delta karyawan (lihat RestResource._changes_payload)."""
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            # Verifikasi akses pengguna
+            if not request.env.user.has_group('hr.group_hr_user'):
+                return self._make_json_response(
+                    {'error': 'Akses ditolak. Anda tidak memiliki izin yang diperlukan.'},
+                    status=403, headers=headers
+                )
+
+            response_data, error = self._changes_payload(
+                request.env['hr.employee'].sudo(), kw, headers,
+                self._employee_schema, self._employee_expand, self._format_employee_list,
+            )
+            if error:
+                return error
+            return self._make_json_response(response_data, status=200, headers=headers)
+        except Exception as e:
+            _logger.error("Error in get_employee_changes: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Terjadi kesalahan internal server.'},
+                status=500, headers=headers
+            )
+
+    @http.route('/api/employees/<int:employee_id>/reports',
+              type='http',
+              auth='public',
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def get_employee_reports(self, employee_id, **kw):
+        """
+        Struktur bawahan (org chart) seorang karyawan, dibaca dengan satu
+        recursive CTE atas parent_id.
+
+        Query parameters:
+        - depth: jumlah tingkat bawahan yang dikirim (default 3, maksimal 10)
+        - fields / expand: sama dengan /api/employees
+
+        Setiap node berisi direct_reports, total_reports (seluruh bawahan,
+        termasuk di luar depth) dan reports.
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            if not request.env.user.has_group('hr.group_hr_user'):
+                return self._make_json_response(
+                    {'error': 'Akses ditolak. Anda tidak memiliki izin yang diperlukan.'},
+                    status=403, headers=headers
+                )
+
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'employees/%d/reports' % employee_id, kw, self._cache_models)
+            if cached:
+                data, saved_validators = cached
+                return conditional.replay(saved_validators, headers) or \
+                    self._make_json_response(data, status=200, headers=headers)
+
+            try:
+                keys, expand = serializers.parse_fields_params(kw, self._employee_schema, self._employee_expand)
+                depth = hierarchy.parse_depth(kw)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+            except hierarchy.DepthError:
+                return self._make_json_response(
+                    {'error': 'Parameter depth harus 1-%d.' % hierarchy.MAX_DEPTH}, status=400, headers=headers)
+
+            Employee = request.env['hr.employee'].sudo()
+            employee = Employee.browse(employee_id).exists()
+            if not employee:
+                return self._make_json_response(
+                    {'error': 'Karyawan tidak ditemukan.'}, status=404, headers=headers)
+
+            # Sama dengan /api/employees/<id>: data perusahaan lain hanya
+            # untuk HR manager, baik untuk karyawan akar maupun bawahannya
+            company_ids = None
+            if not request.env.user.has_group('hr.group_hr_manager'):
+                company_ids = request.env.user.company_id.ids
+                if employee.company_id and employee.company_id != request.env.user.company_id:
+                    return self._make_json_response(
+                        {'error': 'Akses ditolak. Anda tidak memiliki izin untuk melihat data karyawan dari perusahaan lain.'},
+                        status=403, headers=headers
+                    )
+
+            edges = [(employee.id, False)] + hierarchy.report_edges(request.env, employee.id, company_ids)
+            employee_ids = [node_id for node_id, _parent_id in edges]
+            employee_domain = [('id', 'in', employee_ids)]
+            not_modified = conditional.check_lists([(Employee, employee_domain)], headers, relations=[(
+                Employee, employee_domain, serializers.relation_fields(
+                    Employee, self._employee_schema, keys, self._employee_expand, expand),
+            )])
+            if not_modified:
+                return not_modified
+
+            tree = hierarchy.Tree(edges, {employee.id})
+            totals = tree.rollup(dict.fromkeys(employee_ids, 1))
+            items = {item['id']: item for item in self._format_employee_list(
+                Employee.browse(tree.visible(depth)), keys, expand)}
+            data = tree.nest(items, depth, children_key='reports', extra=lambda node_id: {
+                'direct_reports': len(tree.children[node_id]),
+                'total_reports': totals[node_id] - 1,
+            })[0]
+
+            response_data = {'depth': depth, 'data': data}
+            response_cache.store(cache_key, generation, (response_data, conditional.validators(headers)))
+            return self._make_json_response(response_data, status=200, headers=headers)
+        except Exception as e:
+            _logger.error("Error in get_employee_reports: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Terjadi kesalahan internal server.'},
+                status=500, headers=headers
+            )
+
+    @http.route('/api/employees/aggregate',
+              type='http',
+              auth='public',
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def get_employee_aggregate(self, **kw):
+        """
+        Statistik karyawan dihitung di database (GROUP BY), mis.
+        /api/employees/aggregate?group_by=department,company&measures=count
+
+        Query parameters:
+        - group_by: department, company, job, manager, active (maksimal 3)
+        - measures: count (default)
+        - filter yang sama dengan /api/employees
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            if not request.env.user.has_group('hr.group_hr_user'):
+                return self._make_json_response(
+                    {'error': 'Akses ditolak. Anda tidak memiliki izin yang diperlukan.'},
+                    status=403, headers=headers
+                )
+
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'employees/aggregate', kw, self._cache_models)
+            if cached:
+                return self._make_json_response(cached, status=200, headers=headers)
+
+            response_data, error = self._aggregate_payload(
+                request.env['hr.employee'].sudo(), kw, headers,
+                self._employee_filters, self._employee_group_by, self._employee_measures,
+            )
+            if error:
+                return error
+            response_cache.store(cache_key, generation, response_data)
+            return self._make_json_response(response_data, status=200, headers=headers)
+        except Exception as e:
+            _logger.error("Error in get_employee_aggregate: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Terjadi kesalahan internal server.'},
+                status=500, headers=headers
+            )
+
     @http.route('/api/employees/<int:employee_id>', 
               type='http', 
               auth='public',
@@ -181,11 +384,13 @@ class EmployeeAPI(http.Controller):
         Endpoint untuk mendapatkan detail satu karyawan berdasarkan ID.
         Memerlukan autentikasi dan memiliki pembatasan akses.
         """
-        headers = self._get_cors_headers(methods='GET, OPTIONS')
-
         # Handle pre-flight OPTIONS
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
 
         try:
             # Verifikasi akses pengguna
@@ -195,6 +400,12 @@ class EmployeeAPI(http.Controller):
                     status=403, headers=headers
                 )
 
+            # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
+            try:
+                keys, expand = serializers.parse_fields_params(kw, self._employee_schema, self._employee_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
             employee = request.env['hr.employee'].sudo().browse(employee_id)
             if not employee.exists():
                 return self._make_json_response(
@@ -210,7 +421,12 @@ class EmployeeAPI(http.Controller):
                         status=403, headers=headers
                     )
 
-            formatted_data = self._format_employee_data(employee)
+            not_modified = conditional.check_record(employee, headers, relations=serializers.relation_fields(
+                employee, self._employee_schema, keys, self._employee_expand, expand))
+            if not_modified:
+                return not_modified
+
+            formatted_data = self._format_employee_data(employee, keys, expand)
             return self._make_json_response(
                 {'data': formatted_data}, 
                 status=200, headers=headers
@@ -224,7 +440,7 @@ class EmployeeAPI(http.Controller):
                 status=500, headers=headers
             )
 
-class CompanyAPI(http.Controller):
+class CompanyAPI(RestResource, http.Controller):
     """API Controller untuk mengambil data perusahaan (GET only).
 
     Endpoints:
@@ -235,45 +451,41 @@ class CompanyAPI(http.Controller):
     and CORS/security headers. Pagination and simple filters supported.
     """
 
-    _cors_origin = 'http://localhost:5173'
-
-    def _get_cors_headers(self, methods='GET, OPTIONS'):
-        return {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': self._cors_origin,
-            'Access-Control-Allow-Methods': methods,
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-            'Access-Control-Allow-Credentials': 'true',
-            'X-Content-Type-Options': 'nosniff',
-            'X-Frame-Options': 'DENY',
-            'X-XSS-Protection': '1; mode=block',
-        }
-
-    def _format_company_data(self, company):
-        if not company or not company.exists():
-            return {}
-        return {
-            'id': company.id,
-            'name': company.name,
-            'street': getattr(company, 'street', None),
-            'city': getattr(company, 'city', None),
-            'zip': getattr(company, 'zip', None),
-            'phone': getattr(company, 'phone', None),
-            'email': getattr(company, 'email', None),
-            'website': getattr(company, 'website', None),
-            'country': company.country_id.name if getattr(company, 'country_id', None) else None,
-            'currency': company.currency_id.name if getattr(company, 'currency_id', None) else None,
-            'active': getattr(company, 'active', True),
-        }
-
-    def _make_json_response(self, data, status=200, headers={}):
-        security_headers = {
-            'X-Content-Type-Options': 'nosniff',
-            'X-Frame-Options': 'DENY',
-            'X-XSS-Protection': '1; mode=block'
-        }
-        headers.update(security_headers)
-        return Response(json.dumps(data), status=status, headers=headers)
+    # Model sumber data endpoint ini, untuk invalidasi response cache
+    _cache_models = ('res.company', 'res.partner')
+
+    # Output schema, doubles as the ?fields= allowlist
+    _company_schema = {
+        'id': field('id'),
+        'name': field('name'),
+        'street': field('street'),
+        'city': field('city'),
+        'zip': field('zip'),
+        'phone': field('phone'),
+        'email': field('email'),
+        'website': field('website'),
+        'country': name_of('country_id'),
+        'currency': name_of('currency_id'),
+        'active': field('active'),
+    }
+
+    _company_filters = {
+        'name': filters.ilike('name'),
+        'active': filters.boolean('active'),
+    }
+
+    _company_expand = {
+        'country': ('country_id', ['name', 'code']),
+        'currency': ('currency_id', ['name', 'symbol']),
+    }
+
+    def _format_company_list(self, companies, keys=None, expand=()):
+        """Format a company recordset with batched relation lookups."""
+        return serializers.serialize(
+            companies, self._company_schema, keys, self._company_expand, expand)
+
+    def _format_company_data(self, company, keys=None, expand=()):
+        return self._format_company_list(company, keys, expand)[0] if company else {}
 
     @http.route('/api/companies',
               type='http',
@@ -281,42 +493,50 @@ class CompanyAPI(http.Controller):
               methods=['GET', 'OPTIONS'],
               csrf=False)
     def get_companies(self, **kw):
-        """Return list of companies. Query params: limit, offset, name, active."""
-        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        """Return list of companies. Query params: limit, offset, name, active,
+        count (exact|estimate|none)."""
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
 
         try:
-            # basic domain
-            domain = []
-            if kw.get('name'):
-                domain.append(('name', 'ilike', kw.get('name')))
-            if 'active' in kw:
-                domain.append(('active', '=', kw.get('active').lower() == 'true'))
-
-            # pagination
+            # Response cache per worker; kedaluwarsa otomatis saat model sumber
+            # berubah (lihat tools/response_cache.py)
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'companies', kw, self._cache_models)
+            if cached:
+                data, saved_validators = cached
+                return conditional.replay(saved_validators, headers) or \
+                    self._make_json_response(data, status=200, headers=headers)
+
+            # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
             try:
-                limit = int(kw.get('limit', 0)) if kw.get('limit') else 0
-            except Exception:
-                limit = 0
-            try:
-                offset = max(int(kw.get('offset', 0)), 0)
-            except Exception:
-                offset = 0
+                keys, expand = serializers.parse_fields_params(kw, self._company_schema, self._company_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
+            # basic domain and pagination (no cursor mode for companies)
+            domain, error = self._parse_filters(kw, headers, self._company_filters)
+            if error:
+                return error
+            page, error = self._parse_page_params(kw, headers, default_limit=0, max_limit=None, cursor=False)
+            if error:
+                return error
 
             Company = request.env['res.company'].sudo()
-            companies = Company.search(domain, limit=(limit or 0), offset=offset)
-
-            data = [self._format_company_data(c) for c in companies]
-            total_count = Company.search_count(domain)
+            not_modified, response_data = self._list_payload(
+                Company, domain, page, headers,
+                lambda companies: self._format_company_list(companies, keys, expand),
+                relations=serializers.relation_fields(
+                    Company, self._company_schema, keys, self._company_expand, expand),
+            )
+            if not_modified:
+                return not_modified
 
-            response_data = {
-                'count': len(data),
-                'total': total_count,
-                'offset': offset,
-                'limit': limit,
-                'data': data,
-            }
+            response_cache.store(cache_key, generation, (response_data, conditional.validators(headers)))
             return self._make_json_response(response_data, status=200, headers=headers)
         except Exception as e:
             _logger.error('Error in get_companies: %s', e)
@@ -328,71 +548,96 @@ class CompanyAPI(http.Controller):
               methods=['GET', 'OPTIONS'],
               csrf=False)
     def get_company_by_id(self, company_id, **kw):
-        headers = self._get_cors_headers(methods='GET, OPTIONS')
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
         try:
+            # Response cache per worker; kedaluwarsa otomatis saat model sumber
+            # berubah (lihat tools/response_cache.py)
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'companies/%d' % company_id, kw, self._cache_models)
+            if cached:
+                data, saved_validators = cached
+                return conditional.replay(saved_validators, headers) or \
+                    self._make_json_response(data, status=200, headers=headers)
+
+            # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
+            try:
+                keys, expand = serializers.parse_fields_params(kw, self._company_schema, self._company_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
             company = request.env['res.company'].sudo().browse(company_id)
             if not company.exists():
                 return self._make_json_response({'error': 'Company not found.'}, status=404, headers=headers)
-            return self._make_json_response({'data': self._format_company_data(company)}, status=200, headers=headers)
+            not_modified = conditional.check_record(company, headers, relations=serializers.relation_fields(
+                company, self._company_schema, keys, self._company_expand, expand))
+            if not_modified:
+                return not_modified
+            data = {'data': self._format_company_data(company, keys, expand)}
+            response_cache.store(cache_key, generation, (data, conditional.validators(headers)))
+            return self._make_json_response(data, status=200, headers=headers)
         except Exception as e:
             _logger.error('Error in get_company_by_id: %s', e)
             return self._make_json_response({'error': 'Internal server error.'}, status=500, headers=headers)
 
-class DepartmentAPI(http.Controller):
+class DepartmentAPI(RestResource, http.Controller):
     """API Controller untuk mengakses data departemen."""
-    
-    _cors_origin = 'http://localhost:5173'
 
-    def _get_cors_headers(self, methods='GET, OPTIONS'):
-        """Helper untuk menghasilkan header CORS."""
-        return {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': self._cors_origin,
-            'Access-Control-Allow-Methods': methods,
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-            'Access-Control-Allow-Credentials': 'true',
-            'X-Content-Type-Options': 'nosniff',
-            'X-Frame-Options': 'DENY',
-            'X-XSS-Protection': '1; mode=block'
-        }
-
-    def _format_department_data(self, department):
+    # Model sumber data endpoint ini, untuk invalidasi response cache
+    _cache_models = ('hr.department', 'hr.employee', 'res.company')
+
+    # Skema output (allowlist untuk ?fields=)
+    _department_schema = {
+        'id': field('id'),
+        'name': field('name'),
+        'complete_name': field('complete_name'),
+        'active': field('active'),
+        'company': relation('company_id'),
+        'parent_department': relation('parent_id'),
+        'manager': relation('manager_id'),
+        'note': field('note', or_none=True),
+        # Satu query grouped untuk seluruh halaman, tanpa memuat member_ids
+        # setiap departemen
+        'total_employees': computed(_department_headcounts, default=0),
+    }
+
+    # Filter query string: name, company (id atau nama), active, serta
+    # company_id / parent_id (id, dipisah koma)
+    _department_filters = {
+        'name': filters.ilike('name'),
+        'company': filters.id_or_name('company_id'),
+        'active': filters.boolean('active'),
+        'company_id': filters.id_in('company_id'),
+        'parent_id': filters.id_in('parent_id'),
+    }
+
+    # Allowlist /api/departments/aggregate
+    _department_group_by = {
+        'company': 'company_id',
+        'parent': 'parent_id',
+        'manager': 'manager_id',
+        'active': 'active',
+    }
+    _department_measures = {}
+
+    _department_expand = {
+        'company': ('company_id', ['name', 'email', 'phone', 'country_id']),
+        'parent_department': ('parent_id', ['name', 'complete_name', 'manager_id']),
+        'manager': ('manager_id', ['name', 'work_email', 'work_phone', 'job_title']),
+    }
+
+    def _format_department_list(self, departments, keys=None, expand=()):
+        """Helper untuk memformat recordset departemen (relasi dibaca secara batch)."""
+        return serializers.serialize(
+            departments, self._department_schema, keys, self._department_expand, expand)
+
+    def _format_department_data(self, department, keys=None, expand=()):
         """Helper untuk memformat data departemen."""
-        if not department or not department.exists():
-            return {}
-            
-        return {
-            'id': department.id,
-            'name': department.name,
-            'complete_name': department.complete_name,
-            'active': department.active,
-            'company': {
-                'id': department.company_id.id,
-                'name': department.company_id.name
-            } if department.company_id else None,
-            'parent_department': {
-                'id': department.parent_id.id,
-                'name': department.parent_id.name
-            } if department.parent_id else None,
-            'manager': {
-                'id': department.manager_id.id,
-                'name': department.manager_id.name
-            } if department.manager_id else None,
-            'note': department.note or None,
-            'total_employees': len(department.member_ids) if department.member_ids else 0
-        }
-
-    def _make_json_response(self, data, status=200, headers={}):
-        """Helper untuk membuat response JSON."""
-        security_headers = {
-            'X-Content-Type-Options': 'nosniff',
-            'X-Frame-Options': 'DENY',
-            'X-XSS-Protection': '1; mode=block'
-        }
-        headers.update(security_headers)
-        return Response(json.dumps(data), status=status, headers=headers)
+        return self._format_department_list(department, keys, expand)[0] if department else {}
 
     @http.route('/api/departments',
               type='http',
@@ -408,62 +653,205 @@ class DepartmentAPI(http.Controller):
         - company: filter berdasarkan company (id atau nama)
         - name: filter berdasarkan nama departemen
         - active: filter berdasarkan status aktif
+        - cursor / after_id / order: mode cursor (keyset)
+        - count: exact (default) | estimate | none
         """
-        headers = self._get_cors_headers(methods='GET, OPTIONS')
-        
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
 
         try:
-            domain = []
-            
-            # Filter berdasarkan nama
-            if kw.get('name'):
-                domain.append(('name', 'ilike', kw.get('name')))
+            # Response cache per worker; kedaluwarsa otomatis saat model sumber
+            # berubah (lihat tools/response_cache.py)
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'departments', kw, self._cache_models)
+            if cached:
+                data, saved_validators = cached
+                return conditional.replay(saved_validators, headers) or \
+                    self._make_json_response(data, status=200, headers=headers)
+
+            # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
+            try:
+                keys, expand = serializers.parse_fields_params(kw, self._department_schema, self._department_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
+            # Filter & paginasi
+            domain, error = self._parse_filters(kw, headers, self._department_filters)
+            if error:
+                return error
+            page, error = self._parse_page_params(kw, headers, default_limit=50, max_limit=100)
+            if error:
+                return error
 
-            # Filter berdasarkan company
-            if kw.get('company'):
-                company_param = kw.get('company')
-                try:
-                    comp_id = int(company_param)
-                    domain.append(('company_id', '=', comp_id))
-                except ValueError:
-                    domain.append(('company_id.name', 'ilike', company_param))
+            # Ambil data departemen
+            Department = request.env['hr.department'].sudo()
+            # total_employees ikut berubah bila karyawan pindah/dibuat/diarsipkan
+            depends = []
+            if keys is None or 'total_employees' in keys:
+                depends.append((request.env['hr.employee'].sudo(),
+                                [('department_id', 'in', Department._search(domain))]))
+            not_modified, response_data = self._list_payload(
+                Department, domain, page, headers,
+                lambda departments: self._format_department_list(departments, keys, expand),
+                relations=serializers.relation_fields(
+                    Department, self._department_schema, keys, self._department_expand, expand),
+                depends=depends,
+            )
+            if not_modified:
+                return not_modified
+
+            response_cache.store(cache_key, generation, (response_data, conditional.validators(headers)))
+            return self._make_json_response(response_data, status=200, headers=headers)
 
-            # Filter berdasarkan status aktif
-            if 'active' in kw:
-                domain.append(('active', '=', kw.get('active').lower() == 'true'))
+        except Exception as e:
+            _logger.error("Error in get_departments: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Terjadi kesalahan internal server.'},
+                status=500, headers=headers
+            )
+
+    @http.route('/api/departments/tree',
+              type='http',
+              auth='public',
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def get_department_tree(self, **kw):
+        """
+        Pohon departemen bersarang untuk org chart, dibaca dengan satu query
+        parent_path ditambah satu query headcount (GROUP BY).
+
+        Query parameters:
+        - root: id departemen akar (default: semua departemen teratas)
+        - depth: jumlah tingkat di bawah akar (default 3, maksimal 10)
+        - fields / expand dan filter yang sama dengan /api/departments
+
+        Setiap node berisi headcount (karyawan aktif di departemen itu),
+        total_headcount (termasuk seluruh sub-departemen) dan children;
+        node di batas depth berisi has_more_children.
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'departments/tree', kw, self._cache_models)
+            if cached:
+                data, saved_validators = cached
+                return conditional.replay(saved_validators, headers) or \
+                    self._make_json_response(data, status=200, headers=headers)
 
-            # Paginasi
             try:
-                limit = min(int(kw.get('limit', 50)), 100)
-                offset = max(int(kw.get('offset', 0)), 0)
+                keys, expand = serializers.parse_fields_params(kw, self._department_schema, self._department_expand)
+                depth = hierarchy.parse_depth(kw)
+                root_id = int(kw['root']) if kw.get('root') else None
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
             except ValueError:
                 return self._make_json_response(
-                    {'error': 'Parameter limit dan offset harus berupa angka.'},
-                    status=400, headers=headers
-                )
+                    {'error': 'Parameter depth harus 1-%d dan root berupa id.' % hierarchy.MAX_DEPTH},
+                    status=400, headers=headers)
+            domain, error = self._parse_filters(kw, headers, self._department_filters)
+            if error:
+                return error
 
-            # Ambil data departemen
             Department = request.env['hr.department'].sudo()
-            departments = Department.search(domain, limit=limit, offset=offset)
-            
-            # Format data
-            data = [self._format_department_data(dept) for dept in departments]
-            total_count = Department.search_count(domain)
-
-            response_data = {
-                'count': len(data),
-                'total': total_count,
-                'offset': offset,
-                'limit': limit,
-                'data': data
+            root = None
+            if root_id:
+                root = Department.browse(root_id).exists()
+                if not root:
+                    return self._make_json_response(
+                        {'error': 'Departemen tidak ditemukan.'}, status=404, headers=headers)
+
+            edges = hierarchy.department_edges(Department, domain, root)
+            department_ids = [department_id for department_id, _parent_id in edges]
+            Employee = request.env['hr.employee'].sudo()
+            employee_domain = [('department_id', 'in', department_ids)]
+
+            # total_employees sama dengan headcount, tidak perlu dihitung ulang
+            if keys is None:
+                keys = [key for key in self._department_schema if key != 'total_employees']
+            else:
+                keys = [key for key in keys if key != 'total_employees']
+
+            # ETag dari departemen, karyawannya dan relasi yang namanya tampil
+            department_domain = [('id', 'in', department_ids)]
+            not_modified = conditional.check_lists(
+                [(Department, department_domain), (Employee, employee_domain)], headers,
+                relations=[(Department, department_domain, serializers.relation_fields(
+                    Department, self._department_schema, keys, self._department_expand, expand))])
+            if not_modified:
+                return not_modified
+
+            headcounts = {
+                department.id: count
+                for department, count in Employee._read_group(employee_domain, ['department_id'], ['__count'])
             }
-            
+            tree = hierarchy.Tree(edges, root and {root.id})
+            totals = tree.rollup(headcounts)
+
+            visible = Department.browse(tree.visible(depth))
+            items = {item['id']: item for item in self._format_department_list(visible, keys, expand)}
+            data = tree.nest(items, depth, extra=lambda department_id: {
+                'headcount': headcounts.get(department_id, 0),
+                'total_headcount': totals[department_id],
+            })
+
+            response_data = {'depth': depth, 'count': len(department_ids), 'data': data}
+            response_cache.store(cache_key, generation, (response_data, conditional.validators(headers)))
             return self._make_json_response(response_data, status=200, headers=headers)
+        except Exception as e:
+            _logger.error("Error in get_department_tree: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Terjadi kesalahan internal server.'},
+                status=500, headers=headers
+            )
 
+    @http.route('/api/departments/aggregate',
+              type='http',
+              auth='public',
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def get_department_aggregate(self, **kw):
+        """
+        Statistik departemen dihitung di database (GROUP BY), mis.
+        /api/departments/aggregate?group_by=company
+
+        Query parameters:
+        - group_by: company, parent, manager, active (maksimal 3)
+        - measures: count (default)
+        - filter yang sama dengan /api/departments
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'departments/aggregate', kw, self._cache_models)
+            if cached:
+                return self._make_json_response(cached, status=200, headers=headers)
+
+            response_data, error = self._aggregate_payload(
+                request.env['hr.department'].sudo(), kw, headers,
+                self._department_filters, self._department_group_by, self._department_measures,
+            )
+            if error:
+                return error
+            response_cache.store(cache_key, generation, response_data)
+            return self._make_json_response(response_data, status=200, headers=headers)
         except Exception as e:
-            _logger.error("Error in get_departments: %s", str(e))
+            _logger.error("Error in get_department_aggregate: %s", str(e))
             return self._make_json_response(
                 {'error': 'Terjadi kesalahan internal server.'},
                 status=500, headers=headers
@@ -476,12 +864,29 @@ class DepartmentAPI(http.Controller):
               csrf=False)
     def get_department_by_id(self, department_id, **kw):
         """Endpoint untuk mendapatkan detail satu departemen."""
-        headers = self._get_cors_headers(methods='GET, OPTIONS')
-        
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
 
         try:
+            # Response cache per worker; kedaluwarsa otomatis saat model sumber
+            # berubah (lihat tools/response_cache.py)
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'departments/%d' % department_id, kw, self._cache_models)
+            if cached:
+                data, saved_validators = cached
+                return conditional.replay(saved_validators, headers) or \
+                    self._make_json_response(data, status=200, headers=headers)
+
+            # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
+            try:
+                keys, expand = serializers.parse_fields_params(kw, self._department_schema, self._department_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
             department = request.env['hr.department'].sudo().browse(department_id)
             if not department.exists():
                 return self._make_json_response(
@@ -489,10 +894,18 @@ class DepartmentAPI(http.Controller):
                     status=404, headers=headers
                 )
 
-            return self._make_json_response(
-                {'data': self._format_department_data(department)},
-                status=200, headers=headers
-            )
+            depends = []
+            if keys is None or 'total_employees' in keys:
+                depends.append((request.env['hr.employee'].sudo(), [('department_id', '=', department.id)]))
+            not_modified = conditional.check_record(
+                department, headers, depends=depends, relations=serializers.relation_fields(
+                    department, self._department_schema, keys, self._department_expand, expand))
+            if not_modified:
+                return not_modified
+
+            data = {'data': self._format_department_data(department, keys, expand)}
+            response_cache.store(cache_key, generation, (data, conditional.validators(headers)))
+            return self._make_json_response(data, status=200, headers=headers)
 
         except Exception as e:
             _logger.error("Error in get_department_by_id: %s", str(e))
@@ -501,95 +914,197 @@ class DepartmentAPI(http.Controller):
                 status=500, headers=headers
             )
 
-class ProductAPI(http.Controller):
+class ProductAPI(RestResource, http.Controller):
     """API Controller untuk mengakses data produk inventory."""
-    
-    _cors_origin = 'http://localhost:5173'
 
-    def _get_cors_headers(self, methods='GET, OPTIONS'):
-        """Helper untuk menghasilkan header CORS."""
-        return {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': self._cors_origin,
-            'Access-Control-Allow-Methods': methods,
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-            'Access-Control-Allow-Credentials': 'true',
-        }
+    # Model sumber data /api/products/aggregate, untuk invalidasi response cache
+    _cache_models = ('product.template', 'product.category', 'uom.uom', 'res.company')
+
+    # Skema output (allowlist untuk ?fields=). qty_available/virtual_available
+    # adalah field computed yang mahal: hanya dihitung bila ikut diminta.
+    _product_schema = {
+        'id': field('id'),
+        'name': field('name'),
+        'default_code': field('default_code'),
+        'barcode': field('barcode'),
+        'list_price': field('list_price'),
+        'standard_price': field('standard_price'),
+        'qty_available': field('qty_available'),
+        'virtual_available': field('virtual_available'),
+        'uom': name_of('uom_id'),
+        'category': name_of('categ_id'),
+        'company': name_of('company_id'),
+        'type': field('type'),
+        'description': field('description', or_none=True),
+        'weight': field('weight'),
+        'volume': field('volume'),
+        'active': field('active'),
+        # Checksum gambar dibaca per batch; size= diterapkan _format_product_list
+        'image_url': computed(_product_image_urls),
+        # NOTE: image (base64) is expensive; only included when requested
+        # via include_image=true or fields=image. size= memilih image_<size>.
+        'image': field('image_1920', or_none=True),
+    }
+
+    # Filter query string: category (nama), company (id atau nama), active,
+    # serta categ_id / company_id (id, tanpa join ke tabel relasi)
+    _product_filters = {
+        'category': filters.ilike('categ_id.name'),
+        'company': filters.id_or_name('company_id'),
+        'active': filters.boolean('active'),
+        'categ_id': filters.id_in('categ_id'),
+        'company_id': filters.id_in('company_id'),
+    }
+
+    # Allowlist /api/products/aggregate; stok (qty_available) dan
+    # standard_price (per perusahaan) tidak bisa di-aggregate di SQL
+    _product_group_by = {
+        'category': 'categ_id',
+        'company': 'company_id',
+        'type': 'type',
+        'uom': 'uom_id',
+        'active': 'active',
+    }
+    _product_measures = {
+        'list_price': 'list_price',
+        'weight': 'weight',
+        'volume': 'volume',
+    }
+
+    # Skema & filter yang sama untuk katalog produk (rest.product.catalog):
+    # nama relasi dan stok sudah tersimpan di satu tabel, tanpa join
+    # maupun perhitungan stok per request. Gambar tidak ada di katalog.
+    _catalog_schema = dict(
+        _product_schema,
+        uom=field('uom_name', or_none=True),
+        category=field('categ_name', or_none=True),
+        company=field('company_name', or_none=True),
+    )
+    _catalog_filters = dict(
+        _product_filters,
+        category=filters.ilike('categ_name'),
+        company=filters.id_or_name('company_id', 'company_name'),
+    )
+
+    _product_expand = {
+        'category': ('categ_id', ['name', 'complete_name']),
+        'uom': ('uom_id', ['name']),
+        'company': ('company_id', ['name', 'email', 'phone']),
+    }
+
+    # Field stok computed: berubah lewat stock.quant/stock.move tanpa
+    # menyentuh write_date produk (lihat validator conditional GET)
+    _stock_keys = ('qty_available', 'virtual_available')
+
+    def _selects_stock(self, keys):
+        return keys is None or any(key in keys for key in self._stock_keys)
+
+    def _stock_depends(self, template_ids):
+        """Pasangan (model, domain) quant & move yang menentukan stok produk."""
+        domain = [('product_id.product_tmpl_id', 'in', template_ids)]
+        return [(request.env['stock.quant'].sudo(), domain), (request.env['stock.move'].sudo(), domain)]
+
+    def _format_product_list(self, products, include_image=False, keys=None, expand=(),
+                             size=images.DEFAULT_SIZE):
+        """
+        Helper untuk memformat recordset produk ke list dict.
+        Field stok (computed) dan relasi dihitung sekali untuk seluruh recordset.
+
+        :param size: ukuran gambar (lihat tools/images.py) untuk 'image'
+                     dan 'image_url'
+        """
+        if keys is None:
+            keys = [key for key in self._product_schema if key != 'image']
+        if include_image and 'image' not in keys:
+            keys = keys + ['image']
+
+        schema = self._product_schema
+        if products._name == 'rest.product.catalog':
+            schema = self._catalog_schema
+        image_field = images.IMAGE_FIELDS[size]
+        if size != images.DEFAULT_SIZE:
+            schema = dict(
+                schema,
+                image=field(image_field, or_none=True),
+                image_url=computed(lambda records: _product_image_urls(records, size)),
+            )
+        return serializers.serialize(products, schema, keys, self._product_expand, expand)
 
-    def _format_product_data(self, product):
+    def _format_product_data(self, product, include_image=False, keys=None, expand=(),
+                             size=images.DEFAULT_SIZE):
         """Helper untuk memformat data produk ke dict."""
-        if not product or not product.exists():
-            return {}
-        # Build absolute image URL using Odoo's /web/image route. This keeps
-        # payloads small by default and lets frontend fetch the binary when needed.
-        host_url = request.httprequest.host_url.rstrip('/') if request and request.httprequest else ''
-        image_url = None
-        if host_url:
-            # Use product.template model image_1920 field
-            image_url = f"{host_url}/web/image?model=product.template&field=image_1920&id={product.id}&unique=1"
-
-        return {
-            'id': product.id,
-            'name': product.name,
-            'default_code': product.default_code,
-            'barcode': product.barcode,
-            'list_price': product.list_price,
-            'standard_price': product.standard_price,
-            'qty_available': product.qty_available,
-            'virtual_available': product.virtual_available,
-            'uom': product.uom_id.name if product.uom_id else None,
-            'category': product.categ_id.name if product.categ_id else None,
-            'company': product.company_id.name if getattr(product, 'company_id', None) else None,
-            'type': product.type,
-            'description': product.description or None,
-            'weight': product.weight,
-            'volume': product.volume,
-            'active': product.active,
-            'image_url': image_url,
-            # NOTE: image (base64) is expensive; include only when requested via query param
-            # The controller methods will optionally populate 'image' when include_image=true
-            # to avoid sending large payloads by default.
-            # 'image' key will not be present here by default.
-        }
+        return self._format_product_list(product, include_image, keys, expand, size)[0] if product else {}
 
-    def _make_json_response(self, data, status=200, headers={}):
-        """Helper untuk membuat response JSON terstandardisasi."""
-        return Response(
-            json.dumps(data),
-            status=status,
-            headers=headers
-        )
     
     # Daftar field yang diizinkan untuk dibuat (Create) atau diubah (Update)
     # Ini adalah "best practice" keamanan untuk mencegah mass-assignment.
     # Jangan izinkan field sensitif seperti 'is_admin', dll.
     _allowed_fields = ['name', 'email', 'phone', 'street', 'city', 'zip', 'country_id', 'company_id']
 
-    def _get_cors_headers(self, methods='GET, OPTIONS'):
-        """Helper untuk menghasilkan header CORS."""
-        return {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': self._cors_origin,
-            'Access-Control-Allow-Methods': methods,
-            'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-            'Access-Control-Allow-Credentials': 'true', # Jika Anda menggunakan auth='user'
-        }
-
-    def _format_partner_data(self, partner):
+    # Skema output kontak (allowlist untuk ?fields=)
+    _partner_schema = {
+        'id': field('id'),
+        'name': field('name'),
+        'email': field('email'),
+        'phone': field('phone'),
+        'company_name': name_of('company_id'),
+        'street': field('street'),
+        'city': field('city'),
+        'zip': field('zip'),
+        'country': name_of('country_id'),
+    }
+
+    _partner_expand = {
+        'company': ('company_id', ['name', 'email', 'phone']),
+        'country': ('country_id', ['name', 'code']),
+    }
+
+    def _format_partner_list(self, partners, keys=None, expand=()):
+        """Helper untuk memformat recordset partner (relasi dibaca secara batch)."""
+        return serializers.serialize(
+            partners, self._partner_schema, keys, self._partner_expand, expand)
+
+    def _format_partner_data(self, partner, keys=None, expand=()):
         """Helper untuk memformat data partner ke dict."""
-        if not partner or not partner.exists():
-            return {}
-        return {
-            'id': partner.id,
-            'name': partner.name,
-            'email': partner.email,
-            'phone': partner.phone,
-            'company_name': partner.company_id.name if partner.company_id else None,
-            'street': partner.street,
-            'city': partner.city,
-            'zip': partner.zip,
-            'country': partner.country_id.name if partner.country_id else None,
-        }
+        return self._format_partner_list(partner, keys, expand)[0] if partner else {}
+
+    def _stream_partners_ndjson(self, domain, headers, keys=None, expand=()):
+        """
+        Kirim kontak sebagai NDJSON (satu objek JSON per baris) dengan
+        chunked transfer encoding. Record dibaca per batch dan langsung
+        di-encode, jadi tidak ada list besar maupun string JSON raksasa
+        di memori worker.
+
+        Bila klien menerima gzip/br, setiap batch dikompres dan di-flush
+        tersendiri sehingga baris tetap bisa diproses sambil diterima.
+
+        Slot konkurensi 'export' diambil di cursor stream dan ditahan
+        sampai stream selesai; bila penuh, dijawab 429.
+        """
+        try:
+            batches = streaming.iter_batches(request.env, 'res.partner', domain, slot_group='export')
+        except rate_limit.RateLimited as e:
+            return self._too_many_requests(e, headers)
+
+        def generate():
+            try:
+                for partners in batches:
+                    yield b''.join(
+                        encoder.dumps(item) + b'\n'
+                        for item in self._format_partner_list(partners, keys, expand)
+                    )
+            except Exception:
+                # Header sudah terkirim, jadi error hanya bisa dicatat di log
+                _logger.exception("Error saat streaming kontak")
+
+        stream_headers = dict(headers, **{'Content-Type': 'application/x-ndjson'})
+        body = generate()
+        encoding = compression.negotiate(request.httprequest)
+        if encoding and compression.min_size(request.env):
+            stream_headers['Content-Encoding'] = encoding
+            stream_headers['Vary'] = 'Accept-Encoding'
+            body = compression.iter_compressed(body, encoding)
+        return Response(body, status=200, headers=stream_headers, direct_passthrough=True)
 
     def _validate_and_sanitize_data(self, data):
         """
@@ -606,14 +1121,6 @@ class ProductAPI(http.Controller):
         
         return clean_data
 
-    def _make_json_response(self, data, status=200, headers={}):
-        """Helper untuk membuat response JSON terstandardisasi."""
-        return Response(
-            json.dumps(data),
-            status=status,
-            headers=headers
-        )
-
     # === ENDPOINT PRODUCTS ===
     
     @http.route('/api/products', 
@@ -626,70 +1133,78 @@ class ProductAPI(http.Controller):
         Endpoint untuk mendapatkan semua produk.
         Optional query parameters:
         - limit: jumlah maksimum produk yang dikembalikan
-        - offset: mulai dari index berapa
+        - offset: mulai dari index berapa (urut id)
         - category: filter berdasarkan kategori
         - active: filter berdasarkan status aktif/tidak
+        - cursor / after_id / order: mode cursor (keyset), limit default 50
+        - count: exact (default) | estimate | none
         """
-        headers = self._get_cors_headers(methods='GET, OPTIONS')
-        
         # Handle pre-flight OPTIONS request
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
             
         try:
-            # Persiapkan domain pencarian
-            domain = []
-            
-            # Filter berdasarkan kategori jika ada
-            if kw.get('category'):
-                domain.append(('categ_id.name', 'ilike', kw.get('category')))
-            # Filter berdasarkan company (boleh id atau nama)
-            if kw.get('company'):
-                company_param = kw.get('company')
-                # jika numeric, cocokkan berdasarkan id, jika tidak gunakan ilike pada nama
-                try:
-                    comp_id = int(company_param)
-                    domain.append(('company_id', '=', comp_id))
-                except Exception:
-                    domain.append(('company_id.name', 'ilike', company_param))
-                
-            # Filter berdasarkan status aktif
-            if 'active' in kw:
-                domain.append(('active', '=', kw.get('active').lower() == 'true'))
-                
-            # Ambil parameter paginasi
-            limit = int(kw.get('limit', 0))
-            offset = int(kw.get('offset', 0))
-            
+            # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
+            try:
+                keys, expand = serializers.parse_fields_params(kw, self._product_schema, self._product_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
+            # Paginasi (limit 0 = semua)
+            page, error = self._parse_page_params(kw, headers, default_limit=0, max_limit=None)
+            if error:
+                return error
+            if not page.limit:
+                error = self._acquire_slot('export', headers)
+                if error:
+                    return error
+
             # Check if caller wants base64 image in responses (off by default)
             include_image = str(kw.get('include_image', 'false')).lower() == 'true'
+            try:
+                size = images.parse_size(kw)
+            except images.ImageSizeError:
+                return self._make_json_response(
+                    {'error': 'Parameter size harus salah satu dari %s.' % ', '.join(images.IMAGE_FIELDS)},
+                    status=400, headers=headers
+                )
+
+            # Ambil data produk; bila katalog produk aktif dan gambar base64
+            # tidak diminta, baca dari read-model (satu query ber-index)
+            Catalog = request.env['rest.product.catalog']
+            if Catalog._is_enabled() and not include_image and 'image' not in (keys or ()):
+                Product = Catalog.sudo()
+                schema = self._catalog_schema
+                domain, error = self._parse_filters(kw, headers, self._catalog_filters)
+                if error:
+                    return error
+                # Stok katalog tersimpan dan diperbarui bersama baris-nya
+                conditional_get = True
+            else:
+                Product = request.env['product.template'].sudo()
+                schema = self._product_schema
+                domain, error = self._parse_filters(kw, headers, self._product_filters)
+                if error:
+                    return error
+                # Stok dihitung dari quant/move seluruh list: terlalu mahal
+                # untuk dijadikan ETag, jadi conditional GET dilewati
+                conditional_get = not self._selects_stock(keys)
+
+            # Urutan eksplisit (id) di kedua jalur: offset yang sama menunjuk
+            # produk yang sama, baik katalog aktif maupun tidak
+            not_modified, response_data = self._list_payload(
+                Product, domain, page, headers,
+                lambda products: self._format_product_list(products, include_image, keys, expand, size),
+                relations=serializers.relation_fields(Product, schema, keys, self._product_expand, expand),
+                conditional_get=conditional_get, order='id',
+            )
+            if not_modified:
+                return not_modified
 
-            # Ambil data produk
-            Product = request.env['product.template'].sudo()
-            products = Product.search(domain, limit=limit, offset=offset)
-
-            # Format data produk
-            data = []
-            for p in products:
-                item = self._format_product_data(p)
-                if include_image:
-                    # product.image_1920 is base64 string in Odoo; might be large
-                    try:
-                        item['image'] = p.image_1920 or None
-                    except Exception:
-                        item['image'] = None
-                data.append(item)
-            
-            # Hitung total produk untuk informasi paginasi
-            total_count = Product.search_count(domain)
-            
-            response_data = {
-                'count': len(data),
-                'total': total_count,
-                'offset': offset,
-                'data': data
-            }
-            
             return self._make_json_response(response_data, status=200, headers=headers)
             
         except Exception as e:
@@ -698,6 +1213,79 @@ class ProductAPI(http.Controller):
                 status=500, headers=headers
             )
 
+    @http.route('/api/products/changes',
+              type='http',
+              auth='public',
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def get_product_changes(self, **kw):
+        """Feed sinkronisasi delta produk (lihat RestResource._changes_payload)."""
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            response_data, error = self._changes_payload(
+                request.env['product.template'].sudo(), kw, headers,
+                self._product_schema, self._product_expand,
+                lambda products, keys, expand: self._format_product_list(products, keys=keys, expand=expand),
+            )
+            if error:
+                return error
+            return self._make_json_response(response_data, status=200, headers=headers)
+        except Exception as e:
+            _logger.error("Error in get_product_changes: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Terjadi kesalahan internal server.'},
+                status=500, headers=headers
+            )
+
+    @http.route('/api/products/aggregate',
+              type='http',
+              auth='public',
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def get_product_aggregate(self, **kw):
+        """
+        Statistik produk dihitung di database (GROUP BY), mis.
+        /api/products/aggregate?group_by=category&measures=count,sum:list_price
+
+        Query parameters:
+        - group_by: category, company, type, uom, active (maksimal 3)
+        - measures: count (default) dan <sum|avg|min|max>:<list_price|weight|volume>
+        - filter yang sama dengan /api/products
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            cache_key, generation, cached = response_cache.lookup(
+                request.env, 'products/aggregate', kw, self._cache_models)
+            if cached:
+                return self._make_json_response(cached, status=200, headers=headers)
+
+            response_data, error = self._aggregate_payload(
+                request.env['product.template'].sudo(), kw, headers,
+                self._product_filters, self._product_group_by, self._product_measures,
+            )
+            if error:
+                return error
+            response_cache.store(cache_key, generation, response_data)
+            return self._make_json_response(response_data, status=200, headers=headers)
+        except Exception as e:
+            _logger.error("Error in get_product_aggregate: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Terjadi kesalahan internal server.'},
+                status=500, headers=headers
+            )
+
     @http.route('/api/products/<int:product_id>', 
               type='http', 
               auth='public',  # Ganti ke auth="user" untuk produksi
@@ -707,13 +1295,21 @@ class ProductAPI(http.Controller):
         """
         Endpoint untuk mendapatkan detail satu produk berdasarkan ID.
         """
-        headers = self._get_cors_headers(methods='GET, OPTIONS')
-
         # Handle pre-flight OPTIONS
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
 
         try:
+            # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
+            try:
+                keys, expand = serializers.parse_fields_params(kw, self._product_schema, self._product_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
             product = request.env['product.template'].sudo().browse(product_id)
             if not product.exists():
                 return self._make_json_response(
@@ -721,15 +1317,26 @@ class ProductAPI(http.Controller):
                     status=404, headers=headers
                 )
 
-            # include_image optional query param
+            # include_image & size optional query param
             include_image = str(kw.get('include_image', 'false')).lower() == 'true'
+            try:
+                size = images.parse_size(kw)
+            except images.ImageSizeError:
+                return self._make_json_response(
+                    {'error': 'Parameter size harus salah satu dari %s.' % ', '.join(images.IMAGE_FIELDS)},
+                    status=400, headers=headers
+                )
 
-            formatted_data = self._format_product_data(product)
-            if include_image:
-                try:
-                    formatted_data['image'] = product.image_1920 or None
-                except Exception:
-                    formatted_data['image'] = None
+            not_modified = conditional.check_record(
+                product, headers,
+                relations=serializers.relation_fields(
+                    product, self._product_schema, keys, self._product_expand, expand),
+                depends=self._stock_depends(product.ids) if self._selects_stock(keys) else (),
+            )
+            if not_modified:
+                return not_modified
+
+            formatted_data = self._format_product_data(product, include_image, keys, expand, size)
 
             return self._make_json_response(
                 {'data': formatted_data}, 
@@ -742,6 +1349,56 @@ class ProductAPI(http.Controller):
                 status=500, headers=headers
             )
 
+    @http.route('/api/products/<int:product_id>/image',
+              type='http',
+              auth='public',  # Ganti ke auth="user" untuk produksi
+              methods=['GET'],
+              csrf=False)
+    def get_product_image(self, product_id, unique=None, **kw):
+        """
+        Kirim gambar produk sebagai bytes mentah (bukan base64 di JSON).
+
+        Query parameters:
+        - size: 128 | 256 | 512 | 1024 | 1920 (default), memakai field
+          image_<size> yang sudah di-resize oleh Odoo
+        - unique: checksum gambar (lihat image_url); bila cocok dengan
+          gambar saat ini response diberi Cache-Control immutable
+
+        File dibaca langsung dari filestore lewat ir.binary (send_file /
+        X-Sendfile bila dikonfigurasi). Produk tanpa gambar mendapat
+        placeholder.
+        """
+        headers = self._get_cors_headers(methods='GET')
+        try:
+            try:
+                size = images.parse_size(kw)
+            except images.ImageSizeError:
+                return self._make_json_response(
+                    {'error': 'Parameter size harus salah satu dari %s.' % ', '.join(images.IMAGE_FIELDS)},
+                    status=400, headers=headers
+                )
+
+            product = request.env['product.template'].sudo().browse(product_id).exists()
+            if not product:
+                return self._make_json_response(
+                    {'error': 'Produk tidak ditemukan.'},
+                    status=404, headers=headers
+                )
+
+            stream = request.env['ir.binary']._get_image_stream_from(product, images.IMAGE_FIELDS[size])
+            # Immutable hanya untuk URL yang memuat checksum terbaru; tanpa
+            # itu klien tetap bisa revalidasi lewat ETag (= checksum)
+            response = stream.get_response(immutable=bool(unique) and unique == stream.etag)
+            response.headers['Access-Control-Allow-Origin'] = self._cors_origin
+            return response
+
+        except Exception as e:
+            _logger.error("Error in get_product_image: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Gagal mengambil gambar produk.'},
+                status=500, headers=headers
+            )
+
     # === ENDPOINT CRUD ===
     
     # 1. CREATE (POST) & READ ALL (GET)
@@ -756,14 +1413,25 @@ class ProductAPI(http.Controller):
     def handle_contacts(self, **kw):
         """
         Endpoint untuk GET (semua kontak) dan POST (buat kontak baru).
+
+        GET tanpa parameter mengembalikan semua kontak (kompatibel dengan
+        versi lama). Kirim 'limit'/'offset' untuk paginasi offset, atau
+        'cursor' (kosong untuk halaman pertama) / 'after_id' beserta 'order'
+        untuk mode cursor yang biayanya konstan di halaman sedalam apa pun.
+
+        'format=ndjson' atau 'stream=1' mengekspor semua kontak sebagai
+        NDJSON yang di-stream per batch (memori worker tetap datar).
         """
         # Tentukan metode apa saja yang diizinkan di endpoint ini
         methods_allowed = 'GET, POST, OPTIONS'
-        headers = self._get_cors_headers(methods=methods_allowed)
-        
+
         # Handle pre-flight OPTIONS request dari browser
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight(methods_allowed)
+        headers = self._get_cors_headers(methods=methods_allowed)
+        error = self._throttle(headers)
+        if error:
+            return error
         
         # === CREATE (POST) ===
         if request.httprequest.method == 'POST':
@@ -809,15 +1477,50 @@ class ProductAPI(http.Controller):
         # === READ ALL (GET) ===
         if request.httprequest.method == 'GET':
             try:
+                # Sparse fieldset (?fields=) & relasi yang di-expand (?expand=)
+                try:
+                    keys, expand = serializers.parse_fields_params(kw, self._partner_schema, self._partner_expand)
+                except serializers.FieldSelectionError as e:
+                    return self._make_json_response({'error': e.message}, status=400, headers=headers)
+
                 # Cari semua partner, Anda bisa menambahkan domain filter di sini
                 # contoh: domain = [('is_company', '=', True)]
                 domain = []
-                partners = request.env['res.partner'].sudo().search(domain)
+
+                # Mode ekspor streaming untuk data kontak berukuran besar
+                if kw.get('format') == 'ndjson' or kw.get('stream') in ('1', 'true'):
+                    return self._stream_partners_ndjson(domain, headers, keys, expand)
+
+                Partner = request.env['res.partner'].sudo()
+                page, error = self._parse_page_params(kw, headers, default_limit=0, max_limit=None, count=False)
+                if error:
+                    return error
+                # Tanpa limit = seluruh tabel: dibatasi sebagai ekspor
+                if not page.limit:
+                    error = self._acquire_slot('export', headers)
+                    if error:
+                        return error
+                limit, offset, cursor = page.limit, page.offset, page.cursor
+
+                # Conditional GET (ETag lemah) untuk list kontak
+                not_modified = conditional.check_list(
+                    Partner, domain, headers, relations=serializers.relation_fields(
+                        Partner, self._partner_schema, keys, self._partner_expand, expand))[0]
+                if not_modified:
+                    return not_modified
+
+                if cursor:
+                    partners, next_cursor = pagination.search_after(Partner, domain, limit, cursor)
+                else:
+                    partners = Partner.search(domain, limit=limit or None, offset=offset)
                 
                 # Format data menggunakan list comprehension
-                data = [self._format_partner_data(p) for p in partners]
+                data = self._format_partner_list(partners, keys, expand)
                 
                 response_data = {'count': len(data), 'data': data}
+                if cursor:
+                    response_data['limit'] = limit
+                    response_data['next_cursor'] = next_cursor
                 return self._make_json_response(response_data, status=200, headers=headers)
                 
             except Exception as e:
@@ -826,6 +1529,381 @@ class ProductAPI(http.Controller):
                     status=500, headers=headers
                 )
 
+    # 1a. DELTA SYNC
+    @http.route('/api/contacts/changes',
+              type='http',
+              auth='public', # PENTING: Ganti ke auth="user" untuk produksi
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def get_contact_changes(self, **kw):
+        """Feed sinkronisasi delta kontak (lihat RestResource._changes_payload)."""
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            response_data, error = self._changes_payload(
+                request.env['res.partner'].sudo(), kw, headers,
+                self._partner_schema, self._partner_expand, self._format_partner_list,
+            )
+            if error:
+                return error
+            return self._make_json_response(response_data, status=200, headers=headers)
+        except Exception as e:
+            _logger.error("Error in get_contact_changes: %s", str(e))
+            return self._make_json_response(
+                {'error': 'Terjadi kesalahan internal server.'},
+                status=500, headers=headers
+            )
+
+    # 1b. BATCH CREATE / UPDATE / DELETE
+    @http.route('/api/contacts/batch',
+              type='http',
+              auth='public', # PENTING: Ganti ke auth="user" untuk produksi
+              methods=['POST', 'OPTIONS'],
+              csrf=False)
+    def batch_contacts(self, **kw):
+        """
+        Endpoint untuk sinkronisasi massal kontak dalam satu request.
+
+        Body JSON:
+        {
+            "create": [{"name": ..., "email": ...}, ...],
+            "update": [{"id": 7, "phone": ...}, ...],
+            "delete": [12, 13],
+            "chunk_size": 500,   (opsional)
+            "atomic": false      (opsional)
+        }
+
+        Create memakai create(vals_list) per potongan, update dengan nilai
+        yang sama digabung menjadi satu write(), delete satu unlink() per
+        potongan. Setiap potongan berjalan di savepoint sendiri sehingga satu
+        baris yang gagal tidak membatalkan seluruh batch; dengan "atomic":
+        true semua operasi dibatalkan bila ada satu yang gagal.
+        Response berisi hasil per item sesuai index di request.
+
+        "delete" hanya diterima dari user yang login (401 untuk anonim).
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('POST, OPTIONS')
+        headers = self._get_cors_headers(methods='POST, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+        # Operasi massal memakai slot konkurensi yang sama dengan ekspor
+        error = self._acquire_slot('export', headers)
+        if error:
+            return error
+
+        try:
+            payload = json.loads(request.httprequest.data.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return self._make_json_response(
+                {'error': 'Format JSON tidak valid.'},
+                status=400, headers=headers
+            )
+        if not isinstance(payload, dict) or not all(
+                isinstance(payload.get(op, []), list) for op in ('create', 'update', 'delete')):
+            return self._make_json_response(
+                {'error': 'Body harus berupa objek dengan list "create", "update" dan/atau "delete".'},
+                status=400, headers=headers
+            )
+        # Route ini public (sudo); hapus massal hanya untuk user yang login
+        if payload.get('delete') and request.env.user._is_public():
+            return self._make_json_response(
+                {'error': 'Operasi "delete" memerlukan login.'},
+                status=401, headers=headers
+            )
+
+        ICP = request.env['ir.config_parameter'].sudo()
+        try:
+            chunk_size = int(payload.get('chunk_size') or ICP.get_param(
+                'custom_rest_api.batch_chunk_size', batch.DEFAULT_CHUNK_SIZE))
+        except (TypeError, ValueError):
+            return self._make_json_response(
+                {'error': 'chunk_size harus berupa angka.'},
+                status=400, headers=headers
+            )
+        chunk_size = max(1, min(chunk_size, batch.MAX_CHUNK_SIZE))
+        isolate = not payload.get('atomic', False)
+
+        Partner = request.env['res.partner'].sudo()
+        cr = request.env.cr
+        results = {'create': [], 'update': [], 'delete': []}
+
+        # Validasi dulu per item; item yang tidak valid tidak ikut diproses
+        to_create = []
+        for index, item in enumerate(payload.get('create', [])):
+            clean_data = self._validate_and_sanitize_data(item) if isinstance(item, dict) else {}
+            if not clean_data.get('name'):
+                results['create'].append(batch.error_result(index, 'Field "name" wajib diisi.'))
+            else:
+                to_create.append((index, clean_data))
+
+        to_update = []
+        for index, item in enumerate(payload.get('update', [])):
+            partner_id = item.get('id') if isinstance(item, dict) else None
+            clean_data = self._validate_and_sanitize_data(item) if isinstance(item, dict) else {}
+            # type() dan bukan isinstance(): bool adalah subclass int, {"id": true} bukan id 1
+            if type(partner_id) is not int or not clean_data:
+                results['update'].append(batch.error_result(index, 'Item update wajib berisi "id" dan data valid.'))
+            else:
+                to_update.append((index, partner_id, clean_data))
+
+        to_delete = []
+        for index, partner_id in enumerate(payload.get('delete', [])):
+            if type(partner_id) is not int:
+                results['delete'].append(batch.error_result(index, 'ID kontak harus berupa angka.'))
+            else:
+                to_delete.append((index, partner_id))
+
+        if not isolate and any(results.values()):
+            return self._make_json_response(
+                {'results': results, 'message': 'Batch atomik dibatalkan karena ada item yang tidak valid.'},
+                status=400, headers=headers
+            )
+
+        def create_chunk(chunk):
+            partners = Partner.create([vals for _index, vals in chunk])
+            return [
+                {'index': index, 'status': 'created', 'id': partner.id}
+                for (index, _vals), partner in zip(chunk, partners)
+            ]
+
+        def update_chunk(chunk):
+            existing = set(Partner.browse([item[1] for item in chunk]).exists().ids)
+            # Gabungkan item dengan nilai yang sama menjadi satu write()
+            groups = {}
+            for _index, partner_id, vals in chunk:
+                if partner_id in existing:
+                    key = json.dumps(vals, sort_keys=True, default=str)
+                    groups.setdefault(key, (vals, []))[1].append(partner_id)
+            for vals, partner_ids in groups.values():
+                Partner.browse(partner_ids).write(vals)
+            return [
+                {'index': index, 'status': 'updated', 'id': partner_id}
+                if partner_id in existing else
+                batch.error_result(index, 'Kontak tidak ditemukan.')
+                for index, partner_id, _vals in chunk
+            ]
+
+        def delete_chunk(chunk):
+            partners = Partner.browse([partner_id for _index, partner_id in chunk]).exists()
+            existing = set(partners.ids)
+            partners.unlink()
+            return [
+                {'index': index, 'status': 'deleted', 'id': partner_id}
+                if partner_id in existing else
+                batch.error_result(index, 'Kontak tidak ditemukan.')
+                for index, partner_id in chunk
+            ]
+
+        try:
+            results['create'] += batch.apply_in_chunks(cr, to_create, chunk_size, create_chunk, isolate)
+            results['update'] += batch.apply_in_chunks(cr, to_update, chunk_size, update_chunk, isolate)
+            results['delete'] += batch.apply_in_chunks(cr, to_delete, chunk_size, delete_chunk, isolate)
+        except Exception as e:
+            # Hanya terjadi pada mode atomik: batalkan semua perubahan
+            cr.rollback()
+            return self._make_json_response(
+                {'error': str(e), 'message': 'Batch dibatalkan, tidak ada perubahan yang disimpan.'},
+                status=400, headers=headers
+            )
+
+        summary = {}
+        for op, op_results in results.items():
+            op_results.sort(key=lambda result: result['index'])
+            failed = sum(1 for result in op_results if result['status'] == 'error')
+            summary[op] = {'success': len(op_results) - failed, 'failed': failed}
+
+        return self._make_json_response(
+            {'results': results, 'summary': summary},
+            status=200, headers=headers
+        )
+
+    # 1c. UPSERT BERDASARKAN KUNCI EKSTERNAL
+    # Kunci pencocokan yang didukung: field partner atau external id (ir.model.data)
+    _upsert_keys = ('email', 'ref', 'external_id')
+    _upsert_default_namespace = '__rest_api__'
+
+    def _find_partners_by_key(self, key, namespace, values):
+        """
+        Satu query untuk mencari semua kunci yang masuk.
+
+        :return: dict nilai_kunci -> id partner (id terkecil bila ada duplikat)
+        """
+        if key == 'external_id':
+            rows = request.env['ir.model.data'].sudo().search_read(
+                [('module', '=', namespace), ('model', '=', 'res.partner'), ('name', 'in', values)],
+                ['name', 'res_id'],
+            )
+            # xml id bisa tertinggal setelah partner dihapus
+            alive = set(request.env['res.partner'].sudo().browse([r['res_id'] for r in rows]).exists().ids)
+            return {r['name']: r['res_id'] for r in rows if r['res_id'] in alive}
+
+        found = {}
+        rows = request.env['res.partner'].sudo().search_read(
+            [(key, 'in', values)], [key], order='id asc',
+        )
+        for row in rows:
+            found.setdefault(row[key], row['id'])
+        return found
+
+    def _upsert_partner_chunk(self, key, namespace, chunk):
+        """Proses satu potongan upsert: lookup batch, create massal, write tergrup."""
+        Partner = request.env['res.partner'].sudo()
+        found = self._find_partners_by_key(key, namespace, [item[1] for item in chunk])
+
+        # Bandingkan dengan nilai saat ini agar write hanya untuk field yang berubah
+        fnames = sorted({fname for _index, _value, vals in chunk for fname in vals})
+        current = {
+            row['id']: row
+            for row in Partner.browse(list(found.values())).read(fnames, load=None)
+        } if found else {}
+
+        results = {}
+        to_create = []
+        groups = {}
+        for index, value, vals in chunk:
+            partner_id = found.get(value)
+            if not partner_id:
+                to_create.append((index, value, vals))
+                continue
+            changes = {
+                fname: new_value for fname, new_value in vals.items()
+                if (current[partner_id][fname] or False) != (new_value or False)
+            }
+            if not changes:
+                results[index] = {'index': index, 'status': 'unchanged', 'id': partner_id}
+                continue
+            group_key = json.dumps(changes, sort_keys=True, default=str)
+            groups.setdefault(group_key, (changes, []))[1].append(partner_id)
+            results[index] = {'index': index, 'status': 'updated', 'id': partner_id}
+
+        for changes, partner_ids in groups.values():
+            Partner.browse(partner_ids).write(changes)
+
+        if to_create:
+            partners = Partner.create([vals for _index, _value, vals in to_create])
+            if key == 'external_id':
+                request.env['ir.model.data'].sudo().create([{
+                    'module': namespace,
+                    'name': value,
+                    'model': 'res.partner',
+                    'res_id': partner.id,
+                    'noupdate': True,
+                } for (_index, value, _vals), partner in zip(to_create, partners)])
+            for (index, _value, _vals), partner in zip(to_create, partners):
+                results[index] = {'index': index, 'status': 'created', 'id': partner.id}
+
+        return [results[index] for index, _value, _vals in chunk]
+
+    @http.route('/api/contacts/upsert',
+              type='http',
+              auth='public', # PENTING: Ganti ke auth="user" untuk produksi
+              methods=['PUT', 'OPTIONS'],
+              csrf=False)
+    def upsert_contacts(self, **kw):
+        """
+        Buat atau perbarui kontak berdasarkan kunci eksternal (idempoten).
+
+        Body JSON:
+        {
+            "key": "email" | "ref" | "external_id",   (default: system parameter
+                                                      custom_rest_api.upsert_key atau "email")
+            "namespace": "crm",                      (modul xml id untuk key=external_id)
+            "records": [{"email": ..., "name": ..., ...}, ...]
+        }
+
+        Untuk key=external_id setiap record membawa "external_id" yang disimpan
+        di ir.model.data. Semua kunci dicari dengan satu query per potongan,
+        kontak baru dibuat dengan create(vals_list), dan kontak yang ada hanya
+        di-write bila memang ada field yang berbeda.
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('PUT, OPTIONS')
+        headers = self._get_cors_headers(methods='PUT, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+        # Operasi massal memakai slot konkurensi yang sama dengan ekspor
+        error = self._acquire_slot('export', headers)
+        if error:
+            return error
+
+        try:
+            payload = json.loads(request.httprequest.data.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return self._make_json_response(
+                {'error': 'Format JSON tidak valid.'},
+                status=400, headers=headers
+            )
+        if not isinstance(payload, dict) or not isinstance(payload.get('records'), list):
+            return self._make_json_response(
+                {'error': 'Body harus berupa objek dengan list "records".'},
+                status=400, headers=headers
+            )
+
+        ICP = request.env['ir.config_parameter'].sudo()
+        key = payload.get('key') or ICP.get_param('custom_rest_api.upsert_key', 'email')
+        namespace = payload.get('namespace') or self._upsert_default_namespace
+        if key not in self._upsert_keys:
+            return self._make_json_response(
+                {'error': 'key harus salah satu dari: %s.' % ', '.join(self._upsert_keys)},
+                status=400, headers=headers
+            )
+        if not isinstance(namespace, str) or '.' in namespace:
+            return self._make_json_response(
+                {'error': 'namespace tidak boleh mengandung titik.'},
+                status=400, headers=headers
+            )
+
+        # Validasi per item; kunci duplikat dalam satu request hanya diproses sekali
+        results = []
+        items = {}
+        for index, record in enumerate(payload['records']):
+            if not isinstance(record, dict):
+                results.append(batch.error_result(index, 'Item harus berupa objek.'))
+                continue
+            value = record.get(key)
+            vals = self._validate_and_sanitize_data(record)
+            if key == 'ref':
+                vals['ref'] = value
+            if not value or not isinstance(value, str):
+                results.append(batch.error_result(index, 'Nilai kunci "%s" wajib diisi.' % key))
+            elif value in items:
+                results.append(batch.error_result(index, 'Kunci duplikat dalam request.'))
+            else:
+                items[value] = (index, value, vals)
+
+        # Kontak baru wajib memiliki nama, tapi itu baru diketahui setelah lookup;
+        # constraint Odoo akan menolaknya dan hanya item tersebut yang gagal.
+        try:
+            chunk_size = int(ICP.get_param('custom_rest_api.batch_chunk_size', batch.DEFAULT_CHUNK_SIZE))
+            results += batch.apply_in_chunks(
+                request.env.cr, list(items.values()), max(1, chunk_size),
+                lambda chunk: self._upsert_partner_chunk(key, namespace, chunk),
+            )
+        except Exception as e:
+            _logger.error("Error in upsert_contacts: %s", e)
+            return self._make_json_response(
+                {'error': str(e), 'message': 'Gagal melakukan upsert kontak.'},
+                status=500, headers=headers
+            )
+
+        results.sort(key=lambda result: result['index'])
+        summary = {}
+        for result in results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+
+        return self._make_json_response(
+            {'results': results, 'summary': summary},
+            status=200, headers=headers
+        )
+
     # 2. READ (by ID), UPDATE, DELETE
     @http.route('/api/contacts/<int:partner_id>', 
               type='http', 
@@ -838,11 +1916,14 @@ class ProductAPI(http.Controller):
         berdasarkan ID.
         """
         methods_allowed = 'GET, PUT, DELETE, OPTIONS'
-        headers = self._get_cors_headers(methods=methods_allowed)
 
         # Handle pre-flight OPTIONS
         if request.httprequest.method == 'OPTIONS':
-            return Response(status=200, headers=headers)
+            return self._preflight(methods_allowed)
+        headers = self._get_cors_headers(methods=methods_allowed)
+        error = self._throttle(headers)
+        if error:
+            return error
 
         # Cek apakah partner ada
         try:
@@ -861,7 +1942,15 @@ class ProductAPI(http.Controller):
 
         # === READ BY ID (GET) ===
         if request.httprequest.method == 'GET':
-            formatted_data = self._format_partner_data(partner)
+            try:
+                keys, expand = serializers.parse_fields_params(kw, self._partner_schema, self._partner_expand)
+            except serializers.FieldSelectionError as e:
+                return self._make_json_response({'error': e.message}, status=400, headers=headers)
+            not_modified = conditional.check_record(partner, headers, relations=serializers.relation_fields(
+                partner, self._partner_schema, keys, self._partner_expand, expand))
+            if not_modified:
+                return not_modified
+            formatted_data = self._format_partner_data(partner, keys, expand)
             return self._make_json_response({'data': formatted_data}, status=200, headers=headers)
 
         # === UPDATE (PUT) ===
@@ -904,3 +1993,167 @@ class ProductAPI(http.Controller):
                     {'error': str(e), 'message': 'Gagal menghapus kontak.'}, 
                     status=500, headers=headers
                 )
+
+
+class SearchAPI(RestResource, http.Controller):
+    """
+    Pencarian full-text lintas resource untuk typeahead frontend.
+
+    Endpoint:
+    - GET /api/search?q=<teks>&types=contact,employee&limit=<n>
+
+    Membaca index bersama rest.api.search.document (tsvector + GIN) yang
+    diperbarui oleh write hook model sumber, sehingga semua tipe diranking
+    dalam satu query.
+    """
+
+    # Tipe hit di response -> model sumber
+    _search_types = {
+        'contact': 'res.partner',
+        'employee': 'hr.employee',
+        'product': 'product.template',
+        'client_company': 'client.company',
+    }
+
+    @http.route('/api/search',
+              type='http',
+              auth='user',
+              methods=['GET', 'OPTIONS'],
+              csrf=False)
+    def search(self, **kw):
+        """
+        Query parameters:
+        - q: teks yang dicari; setiap kata dicocokkan sebagai prefix
+        - types: tipe dipisah koma (default semua): contact, employee,
+          product, client_company
+        - limit: jumlah hit (default 10, maksimum 50)
+        - offset: jumlah hit teratas yang dilewati
+
+        Hit berisi type, id, title, rank dan highlight (HTML yang sudah
+        di-escape, kata yang cocok dibungkus <mark>). truncated bernilai
+        true bila batas kandidat ranking (system parameter
+        custom_rest_api.search_rank_candidates) memotong hasil.
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return self._preflight('GET, OPTIONS')
+        headers = self._get_cors_headers(methods='GET, OPTIONS')
+        error = self._throttle(headers)
+        if error:
+            return error
+
+        try:
+            types = [t for t in (kw.get('types') or '').split(',') if t] or list(self._search_types)
+            unknown = [t for t in types if t not in self._search_types]
+            if unknown:
+                return self._make_json_response(
+                    {'error': "Tipe tidak dikenal: %s." % ', '.join(unknown)}, status=400, headers=headers)
+            page, error = self._parse_page_params(
+                kw, headers, default_limit=10, max_limit=50, cursor=False, count=False)
+            if error:
+                return error
+
+            # Index dibaca dengan sudo; tipe yang model sumbernya tidak boleh
+            # dibaca user ini tidak ikut dicari, dan hit disaring record
+            # rule user lewat model sumber di env request
+            model_to_type = {
+                self._search_types[t]: t for t in types
+                if request.env[self._search_types[t]].has_access('read')
+            }
+            hits, truncated = request.env['rest.api.search.document'].sudo()._search_documents(
+                kw.get('q', ''), [request.env[name] for name in model_to_type],
+                limit=page.limit or 10, offset=page.offset)
+            data = [{
+                'type': model_to_type[hit['res_model']],
+                'id': hit['res_id'],
+                'title': hit['title'],
+                'highlight': hit['highlight'],
+                'rank': hit['rank'],
+            } for hit in hits]
+            return self._make_json_response(
+                {'count': len(data), 'truncated': truncated, 'data': data}, status=200, headers=headers)
+        except Exception as e:
+            _logger.error('Error in search: %s', e)
+            return self._make_json_response({'error': 'Internal server error.'}, status=500, headers=headers)
+
+
+class CacheAPI(http.Controller):
+    """Statistik response cache untuk menentukan ukuran cache yang tepat."""
+
+    @http.route('/api/cache/stats',
+              type='http',
+              auth='user',
+              methods=['GET'],
+              csrf=False)
+    def get_cache_stats(self, **kw):
+        """
+        Kembalikan counter hit/miss/eviction response cache.
+        Nilainya per proses worker yang menjawab request ini.
+        """
+        if not request.env.user.has_group('base.group_system'):
+            return Response(
+                encoder.dumps({'error': 'Akses ditolak.'}), status=403,
+                headers={'Content-Type': 'application/json'},
+            )
+        return Response(
+            encoder.dumps({'data': response_cache.cache.stats()}), status=200,
+            headers={'Content-Type': 'application/json'},
+        )
+
+
+class PerfAPI(http.Controller):
+    """Persentil latensi per route dari instrumentasi REST API."""
+
+    @http.route('/api/perf/stats',
+              type='http',
+              auth='user',
+              methods=['GET'],
+              csrf=False)
+    def get_perf_stats(self, **kw):
+        """
+        Kembalikan p50/p95/p99 (ms) per route dari jendela sampel terakhir.
+        Nilainya per proses worker yang menjawab request ini dan hanya terisi
+        bila 'custom_rest_api.instrumentation' bernilai '1'.
+        """
+        if not request.env.user.has_group('base.group_system'):
+            return Response(
+                encoder.dumps({'error': 'Akses ditolak.'}), status=403,
+                headers={'Content-Type': 'application/json'},
+            )
+        return Response(
+            encoder.dumps({
+                'enabled': instrumentation.enabled(request.env),
+                'data': instrumentation.histograms.stats(),
+            }), status=200,
+            headers={'Content-Type': 'application/json'},
+        )
+
+
+class MetricsAPI(http.Controller):
+    """Metrik Prometheus REST API, dijumlahkan dari semua worker di host ini."""
+
+    @http.route('/api/metrics',
+              type='http',
+              auth='public',
+              methods=['GET'],
+              csrf=False)
+    def get_metrics(self, **kw):
+        """
+        Exposition format teks Prometheus (lihat tools/metrics.py).
+
+        Scraper mengirim 'Authorization: Bearer <token>' sesuai system
+        parameter 'custom_rest_api.metrics_token'; tanpa token hanya
+        administrator yang sedang login yang bisa membaca.
+        """
+        token = request.env['ir.config_parameter'].sudo().get_param('custom_rest_api.metrics_token')
+        authorization = request.httprequest.headers.get('Authorization', '')
+        allowed = (token and consteq(authorization, 'Bearer %s' % token)) or \
+            (request.session.uid and request.env.user.has_group('base.group_system'))
+        if not allowed:
+            return Response(
+                encoder.dumps({'error': 'Akses ditolak.'}), status=403,
+                headers={'Content-Type': 'application/json'},
+            )
+        return Response(
+            metrics.render(metrics.collect()), status=200,
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'},
+        )
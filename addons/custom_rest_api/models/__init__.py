@@ -0,0 +1,21 @@
+# Model tambahan REST API: invalidasi cache, tombstone, katalog produk,
+# index pencarian, bucket rate limit & instrumentasi route /api/*
+from . import rest_api_cache
+from . import rest_api_tombstone
+from . import rest_product_catalog
+from . import rest_api_search
+from . import rest_api_rate_limit
+from . import client_company
+from . import hr_department
+from . import hr_employee
+from . import hr_job
+from . import ir_config_parameter
+from . import ir_http
+from . import product_category
+from . import product_product
+from . import product_template
+from . import res_company
+from . import res_partner
+from . import stock_move
+from . import stock_quant
+from . import uom_uom
@@ -0,0 +1,8 @@
+from odoo import models
+
+
+class ClientCompany(models.Model):
+    _name = 'client.company'
+    _inherit = ['client.company', 'rest.api.search.mixin']
+
+    _rest_search_fields = ('name', 'email', 'phone')
@@ -0,0 +1,9 @@
+from odoo import fields, models
+
+
+class HrDepartment(models.Model):
+    _name = 'hr.department'
+    _inherit = ['hr.department', 'rest.api.cache.mixin']
+
+    # Filter name / department=<nama> (ilike) di endpoint REST API
+    name = fields.Char(index='trigram')
@@ -0,0 +1,9 @@
+from odoo import models
+
+
+class HrEmployee(models.Model):
+    _name = 'hr.employee'
+    _inherit = ['hr.employee', 'rest.api.cache.mixin', 'rest.api.tombstone.mixin',
+                'rest.api.search.mixin']
+
+    _rest_search_fields = ('name', 'work_email', 'job_title', 'work_phone')
@@ -0,0 +1,8 @@
+from odoo import models
+
+
+class HrJob(models.Model):
+    _name = 'hr.job'
+    _inherit = ['hr.job', 'rest.api.cache.mixin']
+
+    # Nama jabatan ikut di response cache /api/employees/aggregate (group_by=job)
@@ -0,0 +1,26 @@
+from odoo import api, models
+
+from .rest_product_catalog import ENABLED_PARAM
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    # Katalog produk hanya dipelihara selama aktif; saat diaktifkan
+    # (pertama kali atau setelah dimatikan) isinya bisa kosong atau basi,
+    # jadi dibangun ulang dalam transaksi yang sama dengan perubahan flag
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        params = super().create(vals_list)
+        if any(vals.get('key') == ENABLED_PARAM and str(vals.get('value')) == '1' for vals in vals_list):
+            self.env['rest.product.catalog'].sudo()._rebuild()
+        return params
+
+    def write(self, vals):
+        enabling = 'value' in vals and str(vals['value']) == '1' and any(
+            param.key == ENABLED_PARAM and param.value != '1' for param in self)
+        res = super().write(vals)
+        if enabling:
+            self.env['rest.product.catalog'].sudo()._rebuild()
+        return res
@@ -0,0 +1,26 @@
+from odoo import models
+from odoo.http import request
+
+from ..tools import instrumentation, metrics
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = 'ir.http'
+
+    # Instrumentasi & metrik semua route /api/* (lihat tools/instrumentation.py);
+    # response 304 dan 429 yang dijawab sebelum serializer ikut terukur
+
+    @classmethod
+    def _pre_dispatch(cls, rule, args):
+        instrumentation.reset()
+        super()._pre_dispatch(rule, args)
+        if rule.rule.startswith('/api/'):
+            timing = instrumentation.enabled(request.env)
+            record_metrics = metrics.enabled(request.env)
+            if timing or record_metrics:
+                instrumentation.start(rule.rule, request.httprequest.method, timing, record_metrics)
+
+    @classmethod
+    def _post_dispatch(cls, response):
+        super()._post_dispatch(response)
+        instrumentation.finish(response)
@@ -0,0 +1,9 @@
+from odoo import fields, models
+
+
+class ProductCategory(models.Model):
+    _name = 'product.category'
+    _inherit = ['product.category', 'rest.api.cache.mixin']
+
+    # Filter category=<nama> (ilike) di endpoint produk REST API
+    name = fields.Char(index='trigram')
@@ -0,0 +1,22 @@
+from odoo import api, models
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    # Varian mengubah kode/barcode & stok template; perbarui katalog produk
+    # dan index pencarian template
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        products = super().create(vals_list)
+        self.env['rest.product.catalog']._mark_dirty(products.product_tmpl_id.ids)
+        self.env['rest.api.search.document']._mark_dirty('product.template', products.product_tmpl_id.ids)
+        return products
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env['rest.product.catalog']._mark_dirty(self.product_tmpl_id.ids)
+        if 'default_code' in vals or 'barcode' in vals:
+            self.env['rest.api.search.document']._mark_dirty('product.template', self.product_tmpl_id.ids)
+        return res
@@ -0,0 +1,20 @@
+from odoo import api, models
+
+
+class ProductTemplate(models.Model):
+    _name = 'product.template'
+    _inherit = ['product.template', 'rest.api.cache.mixin', 'rest.api.tombstone.mixin',
+                'rest.api.search.mixin']
+
+    _rest_search_fields = ('name', 'default_code', 'barcode')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        templates = super().create(vals_list)
+        self.env['rest.product.catalog']._mark_dirty(templates.ids)
+        return templates
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env['rest.product.catalog']._mark_dirty(self.ids)
+        return res
@@ -0,0 +1,9 @@
+from odoo import fields, models
+
+
+class ResCompany(models.Model):
+    _name = 'res.company'
+    _inherit = ['res.company', 'rest.api.cache.mixin']
+
+    # Filter company=<nama> (ilike) di endpoint REST API
+    name = fields.Char(index='trigram')
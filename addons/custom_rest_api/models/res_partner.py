@@ -0,0 +1,9 @@
+from odoo import models
+
+
+class ResPartner(models.Model):
+    _name = 'res.partner'
+    _inherit = ['res.partner', 'rest.api.cache.mixin', 'rest.api.tombstone.mixin',
+                'rest.api.search.mixin']
+
+    _rest_search_fields = ('name', 'email', 'phone', 'city')
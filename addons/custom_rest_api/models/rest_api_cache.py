@@ -0,0 +1,56 @@
+from odoo import api, models
+from odoo.tools import SQL
+
+from ..tools.response_cache import sequence_name
+
+
+class RestApiCacheMixin(models.AbstractModel):
+    """
+    Mixin yang menandai cache response REST API kedaluwarsa setiap kali
+    record model sumbernya dibuat, diubah atau dihapus.
+    """
+    _name = 'rest.api.cache.mixin'
+    _description = 'Invalidasi Cache REST API'
+
+    def init(self):
+        super().init()
+        if not self._abstract:
+            self.env.cr.execute(SQL(
+                "CREATE SEQUENCE IF NOT EXISTS %s", SQL.identifier(sequence_name(self)),
+            ))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._rest_api_cache_invalidate()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._rest_api_cache_invalidate()
+        return res
+
+    def unlink(self):
+        self._rest_api_cache_invalidate()
+        return super().unlink()
+
+    def _rest_api_cache_invalidate(self):
+        """
+        Naikkan sequence signaling model ini setelah transaksi di-commit.
+
+        Dijalankan di postcommit agar worker lain tidak sempat mengisi cache
+        dengan data lama di bawah generation yang baru. Sequence bersifat
+        non-transaksional, jadi semua worker langsung melihat nilai baru.
+        Beberapa perubahan dalam satu transaksi cukup satu callback.
+        """
+        cr = self.env.cr
+        pending = cr.postcommit.data.setdefault('rest_api_cache.sequences', set())
+        if not pending:
+            registry = self.env.registry
+
+            @cr.postcommit.add
+            def signal_changes():
+                with registry.cursor() as signal_cr:
+                    for name in sorted(pending):
+                        signal_cr.execute(SQL("SELECT nextval(%s)", name))
+        pending.add(sequence_name(self))
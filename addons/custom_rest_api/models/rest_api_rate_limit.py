@@ -0,0 +1,35 @@
+from odoo import api, models
+from odoo.tools import SQL
+
+from ..tools import rate_limit
+
+
+class RestApiRateLimit(models.Model):
+    """
+    Token bucket bersama untuk backend rate limit 'postgres' (lihat
+    tools/rate_limit.py). Tabel UNLOGGED: tidak ditulis ke WAL, jadi
+    UPSERT per request murah; isinya boleh hilang saat crash karena
+    bucket yang hilang sama dengan bucket penuh.
+    """
+    _name = 'rest.api.rate.limit'
+    _description = 'Bucket Rate Limit REST API'
+    _auto = False
+    _log_access = False
+
+    def init(self):
+        self.env.cr.execute(SQL("""
+            CREATE UNLOGGED TABLE IF NOT EXISTS %s (
+                key varchar PRIMARY KEY,
+                tokens double precision NOT NULL,
+                allowed boolean NOT NULL,
+                updated_at timestamp NOT NULL
+            )
+        """, SQL.identifier(rate_limit.TABLE)))
+
+    @api.autovacuum
+    def _gc_idle_buckets(self):
+        """Hapus bucket yang tidak dipakai lebih dari satu jam (sudah penuh kembali)."""
+        self.env.cr.execute(SQL(
+            "DELETE FROM %s WHERE updated_at < clock_timestamp() - interval '1 hour'",
+            SQL.identifier(rate_limit.TABLE),
+        ))
@@ -0,0 +1,248 @@
+import logging
+import re
+from collections import defaultdict
+
+from markupsafe import escape, Markup
+
+from odoo import api, fields, models
+from odoo.tools import SQL, split_every
+
+_logger = logging.getLogger(__name__)
+
+REFRESH_BATCH_SIZE = 1000
+# System parameter: batas jumlah dokumen cocok yang diberi ranking (0 =
+# tanpa batas, default). Prefix pendek ("a") bisa cocok dengan ratusan
+# ribu dokumen; batas ini menjaga latensi typeahead di tabel besar dengan
+# risiko hit terbaik terlewat, jadi hasilnya ditandai 'truncated'.
+RANK_CANDIDATES_PARAM = 'custom_rest_api.search_rank_candidates'
+MAX_TERMS = 8
+
+# Penanda highlight dari ts_headline; diganti <mark> setelah teks di-escape
+_START, _STOP = '\x02', '\x03'
+
+
+def build_tsquery(text):
+    """
+    Ubah input pengguna menjadi tsquery prefix: 'budi sant' -> 'budi:* & sant:*'.
+    Hanya karakter kata yang dipakai, jadi operator tsquery dari klien
+    tidak bisa menyebabkan syntax error.
+    """
+    terms = re.findall(r'\w+', text or '')[:MAX_TERMS]
+    return ' & '.join('%s:*' % term.lower() for term in terms)
+
+
+class RestApiSearchDocument(models.Model):
+    """
+    Index full-text bersama untuk /api/search: satu dokumen per record
+    yang bisa dicari, dengan kolom tsvector (generated) ber-index GIN.
+    Dipelihara oleh rest.api.search.mixin di model sumber.
+    """
+    _name = 'rest.api.search.document'
+    _description = 'Dokumen Pencarian REST API'
+    _log_access = False
+
+    res_model = fields.Char(required=True, index=True)
+    res_id = fields.Integer(required=True)
+    title = fields.Char()
+    body = fields.Char()
+
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        # Konfigurasi 'simple': tanpa stemming, cocok untuk nama, email dan
+        # kode yang sebagian besar bukan kata bahasa tertentu
+        cr.execute(SQL("""
+            ALTER TABLE %(table)s ADD COLUMN IF NOT EXISTS document tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+                ) STORED;
+            CREATE INDEX IF NOT EXISTS rest_api_search_document_document_idx
+                ON %(table)s USING gin (document);
+            CREATE UNIQUE INDEX IF NOT EXISTS rest_api_search_document_res_idx
+                ON %(table)s (res_model, res_id);
+        """, table=SQL.identifier(self._table)))
+
+    # === PEMELIHARAAN ===
+
+    @api.model
+    def _mark_dirty(self, model_name, ids):
+        """Catat record yang berubah; dokumennya diperbarui saat precommit."""
+        if not ids:
+            return
+        data = self.env.cr.precommit.data
+        dirty = data.get('rest.api.search.dirty')
+        if dirty is None:
+            dirty = data['rest.api.search.dirty'] = defaultdict(set)
+            self.env.cr.precommit.add(self.sudo()._refresh_dirty)
+        dirty[model_name].update(ids)
+
+    def _refresh_dirty(self):
+        dirty = self.env.cr.precommit.data.pop('rest.api.search.dirty', {})
+        for model_name, ids in dirty.items():
+            self._refresh(model_name, sorted(ids))
+
+    @api.model
+    def _refresh(self, model_name, ids):
+        """
+        Tulis ulang dokumen untuk record ``ids`` dengan satu UPSERT per
+        batch. Record yang sudah dihapus atau diarsipkan dikeluarkan dari index.
+        """
+        # Teks disimpan dalam bahasa perusahaan utama, seperti katalog produk
+        lang = self.env.ref('base.main_company').partner_id.lang or 'en_US'
+        Model = self.env[model_name].sudo().with_context(active_test=False, lang=lang)
+        fnames = list(Model._rest_search_fields)
+        for batch_ids in split_every(REFRESH_BATCH_SIZE, ids):
+            records = Model.browse(batch_ids).exists()
+            if 'active' in Model._fields:
+                records = records.filtered('active')
+            removed = set(batch_ids) - set(records.ids)
+            if removed:
+                self.env.cr.execute(SQL(
+                    "DELETE FROM %s WHERE res_model = %s AND res_id IN %s",
+                    SQL.identifier(self._table), model_name, tuple(removed),
+                ))
+            if records:
+                values = SQL(", ").join(
+                    SQL("(%s, %s, %s, %s)", model_name, row['id'], row[fnames[0]] or '',
+                        ' '.join(str(row[fname]) for fname in fnames[1:] if row[fname]))
+                    for row in records.read(fnames, load=None)
+                )
+                self.env.cr.execute(SQL("""
+                    INSERT INTO %s (res_model, res_id, title, body) VALUES %s
+                    ON CONFLICT (res_model, res_id)
+                    DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body
+                """, SQL.identifier(self._table), values))
+            self.env.invalidate_all()
+
+    @api.model
+    def _rebuild(self):
+        """
+        Isi ulang index untuk semua model yang memakai rest.api.search.mixin::
+
+            odoo-bin shell -d <db> <<< "env['rest.api.search.document']._rebuild(); env.cr.commit()"
+        """
+        for model_name in self.env.registry['rest.api.search.mixin']._inherit_children:
+            Model = self.env[model_name]
+            if Model._abstract:
+                continue
+            self.env.cr.execute(SQL("SELECT id FROM %s ORDER BY id", SQL.identifier(Model._table)))
+            ids = [row[0] for row in self.env.cr.fetchall()]
+            # Dokumen record yang sudah tidak ada ikut terhapus
+            self.env.cr.execute(SQL(
+                "DELETE FROM %s WHERE res_model = %s AND res_id <> ALL(%s)",
+                SQL.identifier(self._table), model_name, ids,
+            ))
+            self._refresh(model_name, ids)
+            _logger.info("Index pencarian REST API dibangun ulang: %s %s", len(ids), model_name)
+
+    # === PENCARIAN ===
+
+    @api.model
+    def _search_documents(self, text, sources, limit=20, offset=0):
+        """
+        Cari dan ranking dokumen lintas model dalam satu query.
+
+        Index dibaca dengan sudo, tetapi hanya dokumen yang record sumbernya
+        terlihat oleh pemanggil (ACL, record rule, arsip) yang diberi
+        ranking: setiap model disaring dengan subquery ``_search([])``
+        milik env pemanggil, sehingga ``limit`` tetap terisi penuh. Seluruh
+        dokumen yang cocok (hasil index GIN) diurutkan per ts_rank_cd dan
+        hanya ``offset + limit`` teratas yang diambil, kecuali batas
+        RANK_CANDIDATES_PARAM diisi.
+
+        :param sources: list model sumber pada env pemanggil (bukan sudo)
+        :return: tuple (hits, truncated); hits berupa list dict (res_model,
+                 res_id, title, highlight, rank), highlight berupa HTML aman
+                 dengan <mark> pada kata yang cocok; truncated True bila
+                 batas kandidat memotong dokumen yang cocok
+        """
+        tsquery = build_tsquery(text)
+        if not tsquery or not sources:
+            return [], False
+        cap = int(self.env['ir.config_parameter'].sudo().get_param(RANK_CANDIDATES_PARAM) or 0)
+        visible = SQL(" OR ").join(
+            SQL("(doc.res_model = %s AND doc.res_id IN %s)", model._name, model._search([]).subselect())
+            for model in sources
+        )
+        if cap > 0:
+            # Satu kandidat ekstra hanya untuk mengetahui apakah batas
+            # terlampaui; yang diberi ranking tetap 'cap' dokumen
+            candidates_limit = SQL("LIMIT %s", cap + 1)
+            ranked_from = SQL("(SELECT * FROM candidates LIMIT %s)", cap)
+            truncated = SQL("(SELECT count(*) FROM candidates) > %s", cap)
+        else:
+            candidates_limit = SQL("")
+            ranked_from = SQL("candidates")
+            truncated = SQL("FALSE")
+        self.env.cr.execute(SQL("""
+            WITH query AS (SELECT to_tsquery('simple', %(tsquery)s) AS q),
+            candidates AS (
+                SELECT doc.res_model, doc.res_id, doc.title, doc.body, doc.document
+                  FROM %(table)s doc, query
+                 WHERE doc.document @@ query.q AND (%(visible)s)
+                 %(candidates_limit)s
+            ),
+            ranked AS (
+                SELECT c.*, ts_rank_cd(c.document, query.q) AS rank
+                  FROM %(ranked_from)s c, query
+                 ORDER BY rank DESC, c.res_id
+                 LIMIT %(end)s
+            )
+            -- ts_headline mahal, jadi hanya dihitung untuk hasil akhir
+            SELECT r.res_model, r.res_id, r.title, r.rank,
+                   ts_headline('simple', r.title || ' ' || coalesce(r.body, ''), query.q,
+                               %(options)s),
+                   %(truncated)s
+              FROM ranked r, query
+             ORDER BY r.rank DESC, r.res_id
+            OFFSET %(offset)s
+        """,
+            tsquery=tsquery,
+            table=SQL.identifier(self._table),
+            visible=visible,
+            candidates_limit=candidates_limit,
+            ranked_from=ranked_from,
+            truncated=truncated,
+            end=offset + limit,
+            offset=offset,
+            options='StartSel=%s, StopSel=%s, MaxWords=20, MinWords=5' % (_START, _STOP),
+        ))
+        rows = self.env.cr.fetchall()
+        hits = [{
+            'res_model': res_model,
+            'res_id': res_id,
+            'title': title,
+            'rank': round(rank, 6),
+            'highlight': str(escape(headline).replace(_START, Markup('<mark>')).replace(_STOP, Markup('</mark>'))),
+        } for res_model, res_id, title, rank, headline, _truncated in rows]
+        return hits, bool(rows and rows[0][-1])
+
+
+class RestApiSearchMixin(models.AbstractModel):
+    """
+    Mixin untuk model yang ikut di /api/search. ``_rest_search_fields``:
+    field pertama menjadi judul hit, sisanya isi yang ikut dicari.
+    """
+    _name = 'rest.api.search.mixin'
+    _description = 'Sumber Index Pencarian REST API'
+
+    _rest_search_fields = ('name',)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['rest.api.search.document']._mark_dirty(self._name, records.ids)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'active' in vals or set(self._rest_search_fields).intersection(vals):
+            self.env['rest.api.search.document']._mark_dirty(self._name, self.ids)
+        return res
+
+    def unlink(self):
+        ids = self.ids
+        res = super().unlink()
+        self.env['rest.api.search.document']._mark_dirty(self._name, ids)
+        return res
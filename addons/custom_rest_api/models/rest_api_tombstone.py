@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from odoo import fields, models
+from odoo.tools import SQL
+
+
+class RestApiTombstone(models.Model):
+    """
+    Jejak record yang dihapus, dibaca oleh endpoint /api/<resource>/changes
+    agar klien sinkronisasi bisa ikut menghapus salinannya.
+    """
+    _name = 'rest.api.tombstone'
+    _description = 'Tombstone Record REST API'
+    _log_access = False
+    _order = 'id'
+
+    res_model = fields.Char(string="Model", required=True, index=True)
+    res_id = fields.Integer(string="ID Record", required=True)
+    # Waktu mulai transaksi yang menghapus (sama seperti write_date record),
+    # supaya bisa dibandingkan langsung dengan token sinkronisasi.
+    deleted_at = fields.Datetime(
+        string="Dihapus Pada", required=True, index=True,
+        default=lambda self: self.env.cr.now(),
+    )
+
+    def init(self):
+        super().init()
+        # Keyset feed /changes: (res_model, deleted_at, res_id) dipaging
+        # berurutan tanpa memindai semua tombstone sejak token
+        self.env.cr.execute(SQL(
+            "CREATE INDEX IF NOT EXISTS rest_api_tombstone_keyset_idx ON %s (res_model, deleted_at, res_id)",
+            SQL.identifier(self._table),
+        ))
+
+    def _purge_expired(self):
+        """Hapus tombstone yang lebih tua dari masa retensi (dipanggil cron)."""
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'custom_rest_api.tombstone_retention_days', 30))
+        self.search([('deleted_at', '<', self.env.cr.now() - timedelta(days=days))]).unlink()
+
+
+class RestApiTombstoneMixin(models.AbstractModel):
+    """Mixin yang mencatat tombstone setiap kali record dihapus."""
+    _name = 'rest.api.tombstone.mixin'
+    _description = 'Pencatat Tombstone REST API'
+
+    def unlink(self):
+        if self.ids:
+            self.env['rest.api.tombstone'].sudo().create([
+                {'res_model': self._name, 'res_id': record_id} for record_id in self.ids
+            ])
+        return super().unlink()
@@ -0,0 +1,179 @@
+import logging
+
+from odoo import api, fields, models
+from odoo.tools import SQL, split_every
+from odoo.tools.sql import add_constraint, constraint_definition
+
+from ..tools.serializers import read_records
+
+_logger = logging.getLogger(__name__)
+
+REFRESH_BATCH_SIZE = 500
+
+# System parameter yang mengaktifkan katalog ('1')
+ENABLED_PARAM = 'custom_rest_api.product_catalog'
+
+# Field product.template yang disalin apa adanya ke katalog
+_COPIED_FIELDS = [
+    'name', 'default_code', 'barcode', 'list_price', 'standard_price',
+    'qty_available', 'virtual_available', 'type', 'description',
+    'weight', 'volume', 'active',
+]
+# Relasi Many2one: id dan namanya disimpan (kolom <relasi>_id dan <relasi>_name)
+_RELATIONS = {'uom_id': 'uom_name', 'categ_id': 'categ_name', 'company_id': 'company_name'}
+
+
+def _column_value(fname, value):
+    """Nilai hasil read() -> nilai kolom (False pada field kosong menjadi NULL)."""
+    if fname == 'active':
+        return value
+    if value is False:
+        return None
+    if fname == 'description':
+        return str(value)  # Markup
+    return value
+
+
+class RestProductCatalog(models.Model):
+    """
+    Read-model katalog produk: satu baris per product.template dengan nama
+    relasi dan stok yang sudah dihitung, sehingga /api/products dan snippet
+    tabel produk cukup membaca satu tabel ber-index tanpa join maupun
+    perhitungan stok per request.
+
+    id baris sama dengan id product.template (FK ON DELETE CASCADE).
+
+    Aktif bila system parameter 'custom_rest_api.product_catalog' bernilai
+    '1'. Selama aktif, perubahan product.template, product.product,
+    stock.quant dan stock.move (state/jumlah) menandai produk terkait sebagai
+    'dirty' dan barisnya diperbarui sekali saat transaksi commit (precommit).
+    Stok dihitung atas seluruh perusahaan, apa pun perusahaan user yang
+    memicu refresh (lihat _refresh).
+    Saat parameter diaktifkan, katalog dibangun ulang penuh (lihat
+    ir_config_parameter.py) karena perubahan selama nonaktif tidak dilacak. Perubahan nama
+    kategori, UoM atau perusahaan tidak dilacak; jalankan rebuild::
+
+        odoo-bin shell -d <db> <<< "env['rest.product.catalog']._rebuild(); env.cr.commit()"
+
+    atau server action "REST API: Rebuild Katalog Produk".
+    """
+    _name = 'rest.product.catalog'
+    _description = 'Katalog Produk REST API (read-model)'
+    _order = 'id'
+
+    name = fields.Char(readonly=True, index='trigram')
+    default_code = fields.Char(readonly=True)
+    barcode = fields.Char(readonly=True)
+    list_price = fields.Float(readonly=True)
+    standard_price = fields.Float(readonly=True)
+    qty_available = fields.Float(readonly=True)
+    virtual_available = fields.Float(readonly=True)
+    type = fields.Char(readonly=True)
+    description = fields.Html(readonly=True, sanitize=False)
+    weight = fields.Float(readonly=True)
+    volume = fields.Float(readonly=True)
+    active = fields.Boolean(readonly=True, index=True)
+    uom_id = fields.Many2one('uom.uom', readonly=True)
+    uom_name = fields.Char(readonly=True)
+    categ_id = fields.Many2one('product.category', readonly=True, index=True)
+    categ_name = fields.Char(readonly=True, index='trigram')
+    company_id = fields.Many2one('res.company', readonly=True, index=True)
+    company_name = fields.Char(readonly=True, index='trigram')
+    # write_date produk sumber; write_date baris ini = waktu refresh terakhir
+    source_write_date = fields.Datetime(readonly=True)
+
+    def init(self):
+        super().init()
+        if not constraint_definition(self.env.cr, self._table, 'rest_product_catalog_id_fkey'):
+            add_constraint(
+                self.env.cr, self._table, 'rest_product_catalog_id_fkey',
+                'FOREIGN KEY (id) REFERENCES product_template(id) ON DELETE CASCADE',
+            )
+
+    @api.model
+    def _is_enabled(self):
+        return self.env['ir.config_parameter'].sudo().get_param(ENABLED_PARAM) == '1'
+
+    # === PEMELIHARAAN INKREMENTAL ===
+
+    @api.model
+    def _mark_dirty(self, template_ids):
+        """Catat produk yang berubah; barisnya di-refresh saat precommit."""
+        if not template_ids or not self._is_enabled():
+            return
+        data = self.env.cr.precommit.data
+        dirty = data.get('rest.product.catalog.dirty')
+        if dirty is None:
+            dirty = data['rest.product.catalog.dirty'] = set()
+            self.env.cr.precommit.add(self.sudo()._refresh_dirty)
+        dirty.update(template_ids)
+
+    def _refresh_dirty(self):
+        dirty = self.env.cr.precommit.data.pop('rest.product.catalog.dirty', set())
+        self._refresh(sorted(dirty))
+
+    # === REFRESH & REBUILD ===
+
+    @api.model
+    def _refresh(self, template_ids):
+        """
+        Hitung ulang baris katalog untuk product.template yang diberikan
+        (termasuk yang diarsipkan) dan simpan dengan satu UPSERT per batch.
+        """
+        # Nilai tidak boleh bergantung pada user yang kebetulan memicu
+        # refresh: nama dalam bahasa perusahaan utama, stok dijumlah atas
+        # seluruh perusahaan (sama dengan jalur live untuk user yang boleh
+        # mengakses semua perusahaan) dan field per perusahaan
+        # (standard_price) milik perusahaan utama (perusahaan aktif pertama)
+        main_company = self.env.ref('base.main_company')
+        company_ids = main_company.ids + self.env['res.company'].sudo().search([('id', '!=', main_company.id)]).ids
+        Template = self.env['product.template'].sudo().with_context(
+            active_test=False, lang=main_company.partner_id.lang or 'en_US', allowed_company_ids=company_ids)
+        fnames = _COPIED_FIELDS + list(_RELATIONS) + ['write_date']
+        for batch_ids in split_every(REFRESH_BATCH_SIZE, template_ids):
+            templates = Template.browse(batch_ids).exists()
+            if templates:
+                self._upsert(read_records(templates, fnames))
+            # Bebaskan cache ORM (stok dihitung per batch)
+            self.env.invalidate_all()
+
+    def _upsert(self, rows):
+        columns = ['id'] + _COPIED_FIELDS + list(_RELATIONS) + list(_RELATIONS.values()) + [
+            'source_write_date', 'create_date', 'write_date',
+        ]
+        values = []
+        for row in rows:
+            row_values = [row['id']] + [_column_value(fname, row[fname]) for fname in _COPIED_FIELDS]
+            row_values += [row[rel]['id'] if row[rel] else None for rel in _RELATIONS]
+            row_values += [row[rel]['name'] if row[rel] else None for rel in _RELATIONS]
+            row_values.append(row['write_date'])
+            values.append(SQL(
+                "(%s, now() AT TIME ZONE 'UTC', now() AT TIME ZONE 'UTC')",
+                SQL(", ").join(SQL("%s", value) for value in row_values),
+            ))
+
+        updated = [column for column in columns if column not in ('id', 'create_date')]
+        self.env.cr.execute(SQL(
+            "INSERT INTO %s (%s) VALUES %s ON CONFLICT (id) DO UPDATE SET %s",
+            SQL.identifier(self._table),
+            SQL(", ").join(SQL.identifier(column) for column in columns),
+            SQL(", ").join(values),
+            SQL(", ").join(
+                SQL("%s = EXCLUDED.%s", SQL.identifier(column), SQL.identifier(column))
+                for column in updated
+            ),
+        ))
+
+    @api.model
+    def _rebuild(self):
+        """
+        Isi ulang seluruh katalog dari product.template. Baris di-upsert
+        (bukan TRUNCATE) agar pembaca tetap dilayani selama rebuild; baris
+        produk yang sudah dihapus ikut terhapus lewat FK cascade.
+        """
+        self.env.cr.execute(SQL("SELECT id FROM product_template ORDER BY id"))
+        template_ids = [row[0] for row in self.env.cr.fetchall()]
+        self._refresh(template_ids)
+        self.env.invalidate_all()
+        _logger.info("Katalog produk REST API dibangun ulang: %s produk", len(template_ids))
+        return len(template_ids)
@@ -0,0 +1,30 @@
+from odoo import api, models
+
+
+class StockMove(models.Model):
+    _inherit = 'stock.move'
+
+    # Stok masuk/keluar yang direncanakan mengubah virtual_available di
+    # katalog produk tanpa menyentuh stock.quant
+    _catalog_fields = {'state', 'product_uom_qty', 'product_id', 'location_id', 'location_dest_id'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        moves = super().create(vals_list)
+        self.env['rest.product.catalog']._mark_dirty(moves.product_id.product_tmpl_id.ids)
+        return moves
+
+    def write(self, vals):
+        if not self._catalog_fields.intersection(vals):
+            return super().write(vals)
+        template_ids = set(self.product_id.product_tmpl_id.ids)
+        res = super().write(vals)
+        template_ids.update(self.product_id.product_tmpl_id.ids)
+        self.env['rest.product.catalog']._mark_dirty(list(template_ids))
+        return res
+
+    def unlink(self):
+        template_ids = self.product_id.product_tmpl_id.ids
+        res = super().unlink()
+        self.env['rest.product.catalog']._mark_dirty(template_ids)
+        return res
@@ -0,0 +1,24 @@
+from odoo import api, models
+
+
+class StockQuant(models.Model):
+    _inherit = 'stock.quant'
+
+    # Perubahan stok memperbarui qty_available/virtual_available di katalog produk
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        quants = super().create(vals_list)
+        self.env['rest.product.catalog']._mark_dirty(quants.product_id.product_tmpl_id.ids)
+        return quants
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env['rest.product.catalog']._mark_dirty(self.product_id.product_tmpl_id.ids)
+        return res
+
+    def unlink(self):
+        template_ids = self.product_id.product_tmpl_id.ids
+        res = super().unlink()
+        self.env['rest.product.catalog']._mark_dirty(template_ids)
+        return res
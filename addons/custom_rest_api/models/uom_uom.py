@@ -0,0 +1,8 @@
+from odoo import models
+
+
+class UomUom(models.Model):
+    _name = 'uom.uom'
+    _inherit = ['uom.uom', 'rest.api.cache.mixin']
+
+    # Nama UoM ikut di response cache /api/products/aggregate (group_by=uom)
@@ -0,0 +1,17 @@
+from . import test_aggregate
+from . import test_batch
+from . import test_compression
+from . import test_conditional
+from . import test_fields
+from . import test_filters
+from . import test_hierarchy
+from . import test_images
+from . import test_instrumentation
+from . import test_metrics
+from . import test_pagination
+from . import test_product_catalog
+from . import test_rate_limit
+from . import test_response_cache
+from . import test_search
+from . import test_sync
+from . import test_upsert
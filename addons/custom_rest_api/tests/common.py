@@ -0,0 +1,37 @@
+import json
+
+from odoo.tests import HttpCase
+
+from ..tools import rate_limit, response_cache
+
+
+class RestApiCase(HttpCase):
+    """
+    Dasar test endpoint REST API. Rate limit dimatikan (bucket memori
+    dipakai bersama semua test di proses ini) dan response cache per worker
+    dikosongkan setiap test: invalidasinya berjalan di postcommit, yang
+    tidak pernah terjadi di transaksi test.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env['ir.config_parameter'].sudo().set_param('custom_rest_api.rate_limit_rate', '0')
+
+    def setUp(self):
+        super().setUp()
+        response_cache.cache.clear()
+        rate_limit.memory_buckets._buckets.clear()
+
+    def _request(self, method, path, payload=None, headers=None):
+        headers = dict(headers or {})
+        data = None
+        if payload is not None:
+            data = json.dumps(payload)
+            headers['Content-Type'] = 'application/json'
+        return self.opener.request(method, self.base_url() + path, data=data, headers=headers, timeout=30)
+
+    def _get_json(self, path, status=200, headers=None):
+        response = self._request('GET', path, headers=headers)
+        self.assertEqual(response.status_code, status, response.text)
+        return response.json()
@@ -0,0 +1,71 @@
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestAggregate(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env['res.company'].create({'name': 'Agregat Company'})
+        Department = cls.env['hr.department'].with_company(cls.company)
+        cls.sales = Department.create({'name': 'Agregat Sales', 'company_id': cls.company.id})
+        cls.support = Department.create({
+            'name': 'Agregat Support', 'company_id': cls.company.id, 'parent_id': cls.sales.id,
+        })
+        cls.job = cls.env['hr.job'].create({'name': 'Agregat Analis', 'company_id': cls.company.id})
+        cls.env['hr.employee'].with_company(cls.company).create([
+            {'name': 'Agregat %d' % i, 'company_id': cls.company.id,
+             'department_id': (cls.sales if i < 2 else cls.support).id,
+             'job_id': cls.job.id if i % 2 else False}
+            for i in range(5)
+        ])
+
+    def test_department_group_by_parent(self):
+        result = self._get_json(
+            '/api/departments/aggregate?group_by=parent&company_id=%d' % self.company.id)
+        self.assertEqual(result['group_by'], ['parent'])
+        self.assertEqual(result['measures'], ['count'])
+        counts = {(row['parent'] or {}).get('id'): row['count'] for row in result['data']}
+        self.assertEqual(counts, {None: 1, self.sales.id: 1})
+        parent = next(row['parent'] for row in result['data'] if row['parent'])
+        self.assertEqual(parent['name'], self.sales.display_name)
+
+    def test_boolean_group_by_keeps_false(self):
+        self.env['hr.department'].create({
+            'name': 'Agregat Arsip', 'company_id': self.company.id, 'active': False,
+        })
+        result = self._get_json(
+            '/api/departments/aggregate?group_by=active&active=false&company_id=%d' % self.company.id)
+        self.assertEqual(result['data'], [{'active': False, 'count': 1}])
+
+    def test_employee_group_by_department_and_job(self):
+        self.authenticate('admin', 'admin')
+        result = self._get_json(
+            '/api/employees/aggregate?group_by=department,job&company_id=%d' % self.company.id)
+        counts = {
+            (row['department']['id'], row['job'] and row['job']['id']): row['count']
+            for row in result['data']
+        }
+        self.assertEqual(counts, {
+            (self.sales.id, None): 1, (self.sales.id, self.job.id): 1,
+            (self.support.id, None): 2, (self.support.id, self.job.id): 1,
+        })
+
+    def test_department_total_employees(self):
+        result = self._get_json(
+            '/api/departments?fields=name,total_employees&company_id=%d' % self.company.id)
+        headcounts = {row['id']: row['total_employees'] for row in result['data']}
+        self.assertEqual(headcounts, {self.sales.id: 2, self.support.id: 3})
+
+    def test_invalid_params_return_400(self):
+        for path in (
+            '/api/departments/aggregate?group_by=nama',
+            '/api/departments/aggregate?group_by=company,parent,manager,active',
+            '/api/products/aggregate?measures=median:list_price',
+            '/api/products/aggregate?measures=sum:standard_price',
+        ):
+            with self.subTest(path=path):
+                self._get_json(path, status=400)
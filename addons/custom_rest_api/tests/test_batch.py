@@ -0,0 +1,64 @@
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestBatchContacts(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Batch Lama'})
+
+    def _batch(self, payload, status=200):
+        response = self._request('POST', '/api/contacts/batch', payload)
+        self.assertEqual(response.status_code, status, response.text)
+        return response.json()
+
+    def test_partial_failure(self):
+        result = self._batch({
+            'create': [
+                {'name': 'Batch Baru', 'email': 'batch.baru@example.com'},
+                {'email': 'tanpa.nama@example.com'},
+                # country_id tidak ada: foreign key gagal, hanya item ini yang ditolak
+                {'name': 'Batch Negara', 'country_id': 999999999},
+            ],
+            'update': [
+                {'id': self.partner.id, 'city': 'Bandung'},
+                {'id': True, 'city': 'Bukan id'},
+                {'id': 999999999, 'city': 'Tidak ada'},
+            ],
+        })
+        create, update = result['results']['create'], result['results']['update']
+        self.assertEqual([item['status'] for item in create], ['created', 'error', 'error'])
+        self.assertEqual([item['status'] for item in update], ['updated', 'error', 'error'])
+        self.assertEqual(result['summary']['create'], {'success': 1, 'failed': 2})
+        self.assertEqual(result['summary']['update'], {'success': 1, 'failed': 2})
+
+        # Request berjalan di cursor test yang sama; buang cache ORM test
+        self.env.invalidate_all()
+        created = self.env['res.partner'].browse(create[0]['id'])
+        self.assertEqual(created.email, 'batch.baru@example.com')
+        self.assertFalse(self.env['res.partner'].search([('name', '=', 'Batch Negara')]))
+        self.assertEqual(self.partner.city, 'Bandung')
+
+    def test_atomic_rejects_whole_batch(self):
+        result = self._batch({
+            'atomic': True,
+            'create': [{'name': 'Atomik Satu'}, {'email': 'tanpa.nama@example.com'}],
+        }, status=400)
+        self.assertEqual(result['results']['create'][0]['index'], 1)
+        self.assertFalse(self.env['res.partner'].search([('name', '=', 'Atomik Satu')]))
+
+    def test_delete_requires_login(self):
+        self._batch({'delete': [self.partner.id]}, status=401)
+        self.assertTrue(self.partner.exists())
+
+        self.authenticate('admin', 'admin')
+        result = self._batch({'delete': [self.partner.id, False]})
+        self.assertEqual([item['status'] for item in result['results']['delete']], ['deleted', 'error'])
+        self.assertFalse(self.partner.exists())
+
+    def test_invalid_body(self):
+        self._batch({'create': 'bukan list'}, status=400)
@@ -0,0 +1,63 @@
+import gzip
+import unittest
+
+from odoo.tests import TransactionCase, tagged
+
+from ..tools import compression
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestCompressionStream(TransactionCase):
+
+    def test_gzip_stream_round_trip(self):
+        chunks = [b'{"id": %d}\n' % i for i in range(50)]
+        body = b''.join(compression.iter_compressed(iter(chunks), 'gzip'))
+        self.assertEqual(gzip.decompress(body), b''.join(chunks))
+
+    @unittest.skipIf(compression.brotli is None, "brotli tidak terpasang")
+    def test_brotli_stream_round_trip(self):
+        chunks = [b'{"id": %d}\n' % i for i in range(50)]
+        body = b''.join(compression.iter_compressed(iter(chunks), 'br'))
+        self.assertEqual(compression.brotli.decompress(body), b''.join(chunks))
+
+
+@tagged('post_install', '-at_install')
+class TestCompressionNegotiation(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env['hr.department'].create({'name': 'Kompresi Test'})
+        cls.path = '/api/departments?name=Kompresi Test'
+
+    def _set_min_size(self, value):
+        self.env['ir.config_parameter'].sudo().set_param('custom_rest_api.compression_min_size', value)
+
+    def test_gzip_when_accepted(self):
+        self._set_min_size('1')
+        response = self._request('GET', self.path, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(response.json()['data'][0]['name'], 'Kompresi Test')
+        # Representasi terkompresi memakai ETag lemah; 304 tetap berlaku
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        response = self._request('GET', self.path, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    @unittest.skipIf(compression.brotli is None, "brotli tidak terpasang")
+    def test_brotli_preferred(self):
+        self._set_min_size('1')
+        response = self._request('GET', self.path, headers={'Accept-Encoding': 'gzip, br'})
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+
+    def test_identity_and_small_bodies_uncompressed(self):
+        self._set_min_size('1')
+        response = self._request('GET', self.path, headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self._set_min_size('1000000')
+        response = self._request('GET', self.path, headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.json()['data'][0]['name'], 'Kompresi Test')
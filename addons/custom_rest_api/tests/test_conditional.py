@@ -0,0 +1,71 @@
+from odoo.tests import tagged
+
+from ..tools import response_cache
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestConditionalGet(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Perusahaan utama dibuat saat instalasi: write_date-nya lebih lama
+        # dari transaksi test, jadi perubahan di test menggeser validator
+        cls.company = cls.env.ref('base.main_company')
+        cls.department = cls.env['hr.department'].create({
+            'name': 'ETag Test', 'company_id': cls.company.id,
+        })
+        cls.list_path = '/api/departments?name=ETag Test'
+
+    def _revalidate(self, path, etag):
+        # Invalidasi response cache berjalan di postcommit (tidak terjadi di test)
+        response_cache.cache.clear()
+        return self._request('GET', path, headers={'If-None-Match': etag})
+
+    def test_list_not_modified(self):
+        response = self._request('GET', self.list_path)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        response = self._request('GET', self.list_path, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.content)
+        self.assertEqual(self._revalidate(self.list_path, etag).status_code, 304)
+
+    def test_list_stale_after_relation_rename(self):
+        etag = self._request('GET', self.list_path).headers['ETag']
+        self.company.name = self.company.name + ' (baru)'
+        response = self._revalidate(self.list_path, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.json()['data'][0]['company']['name'], self.company.name)
+
+    def test_list_stale_after_headcount_change(self):
+        etag = self._request('GET', self.list_path).headers['ETag']
+        self.env['hr.employee'].create({'name': 'ETag Karyawan', 'department_id': self.department.id})
+        response = self._revalidate(self.list_path, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['total_employees'], 1)
+
+    def test_list_without_relation_ignores_rename(self):
+        path = self.list_path + '&fields=name'
+        etag = self._request('GET', path).headers['ETag']
+        self.company.name = self.company.name + ' (baru)'
+        self.assertEqual(self._revalidate(path, etag).status_code, 304)
+
+    def test_detail_stale_after_relation_rename(self):
+        path = '/api/departments/%d' % self.department.id
+        response = self._request('GET', path)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertEqual(self._revalidate(path, etag).status_code, 304)
+        self.company.name = self.company.name + ' (baru)'
+        self.assertEqual(self._revalidate(path, etag).status_code, 200)
+
+    def test_product_stock_skips_validators(self):
+        self.env['ir.config_parameter'].sudo().set_param('custom_rest_api.product_catalog', '0')
+        response = self._request('GET', '/api/products?limit=5&fields=name,qty_available')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response.headers)
+        response = self._request('GET', '/api/products?limit=5&fields=name')
+        self.assertIn('ETag', response.headers)
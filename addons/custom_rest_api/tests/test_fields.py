@@ -0,0 +1,35 @@
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestFieldsExpand(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env['res.company'].create({'name': 'Fields Company', 'email': 'fields@example.com'})
+        cls.department = cls.env['hr.department'].create({
+            'name': 'Fields Test', 'company_id': cls.company.id,
+        })
+        cls.path = '/api/departments?name=Fields Test&company_id=%d' % cls.company.id
+
+    def test_sparse_fieldset(self):
+        result = self._get_json(self.path + '&fields=name')
+        self.assertEqual(result['data'], [{'id': self.department.id, 'name': 'Fields Test'}])
+
+    def test_expand_relation(self):
+        [row] = self._get_json(self.path + '&fields=name&expand=company')['data']
+        self.assertEqual(set(row), {'id', 'name', 'company'})
+        self.assertEqual(row['company']['id'], self.company.id)
+        self.assertEqual(row['company']['email'], 'fields@example.com')
+        self.assertEqual(set(row['company']), {'id', 'name', 'email', 'phone', 'country_id'})
+
+    def test_default_payload_keeps_relation_names(self):
+        [row] = self._get_json(self.path)['data']
+        self.assertEqual(row['company'], {'id': self.company.id, 'name': 'Fields Company'})
+
+    def test_unknown_names_return_400(self):
+        self._get_json(self.path + '&fields=nama', status=400)
+        self._get_json(self.path + '&expand=job', status=400)
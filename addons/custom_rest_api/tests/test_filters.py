@@ -0,0 +1,51 @@
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestListFilters(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env['res.company'].create({'name': 'Filter Test Company'})
+        cls.parent = cls.env['hr.department'].create({
+            'name': 'Filter Induk', 'company_id': cls.company.id,
+        })
+        cls.child = cls.env['hr.department'].create({
+            'name': 'Filter Anak', 'company_id': cls.company.id, 'parent_id': cls.parent.id,
+        })
+        cls.archived = cls.env['hr.department'].create({
+            'name': 'Filter Arsip', 'company_id': cls.company.id, 'active': False,
+        })
+
+    def _ids(self, path):
+        return sorted(item['id'] for item in self._get_json(path)['data'])
+
+    def test_id_filters(self):
+        self.assertEqual(
+            self._ids('/api/departments?fields=id&company_id=%d' % self.company.id),
+            sorted((self.parent | self.child).ids))
+        self.assertEqual(
+            self._ids('/api/departments?fields=id&parent_id=%d,%d' % (self.parent.id, self.child.id)),
+            self.child.ids)
+
+    def test_name_and_boolean_filters(self):
+        self.assertEqual(
+            self._ids('/api/departments?fields=id&company=Filter Test Company&name=Anak'), self.child.ids)
+        self.assertEqual(
+            self._ids('/api/departments?fields=id&company=%d&active=false' % self.company.id),
+            self.archived.ids)
+
+    def test_invalid_filters_return_400(self):
+        for path in (
+            '/api/departments?company_id=abc',
+            '/api/departments?parent_id=1,dua',
+            '/api/departments/aggregate?group_by=company&company_id=abc',
+            '/api/departments/tree?parent_id=abc',
+            '/api/products?categ_id=abc',
+        ):
+            with self.subTest(path=path):
+                response = self._get_json(path, status=400)
+                self.assertIn('tidak valid', response['error'])
@@ -0,0 +1,73 @@
+from odoo.tests import new_test_user, tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestHierarchy(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Department = cls.env['hr.department']
+        cls.root = Department.create({'name': 'Pohon Akar'})
+        cls.middle = Department.create({'name': 'Pohon Tengah', 'parent_id': cls.root.id})
+        cls.leaf = Department.create({'name': 'Pohon Daun', 'parent_id': cls.middle.id})
+        Employee = cls.env['hr.employee']
+        cls.boss = Employee.create({'name': 'Pohon Direktur', 'department_id': cls.root.id})
+        cls.manager = Employee.create({
+            'name': 'Pohon Manajer', 'department_id': cls.middle.id, 'parent_id': cls.boss.id,
+        })
+        Employee.create([
+            {'name': 'Pohon Staf %d' % i, 'department_id': cls.leaf.id, 'parent_id': cls.manager.id}
+            for i in range(2)
+        ] + [{'name': 'Pohon Staf Tengah', 'department_id': cls.middle.id, 'parent_id': cls.manager.id}])
+
+    def test_department_tree(self):
+        result = self._get_json('/api/departments/tree?root=%d&depth=1&fields=name' % self.root.id)
+        self.assertEqual(result['depth'], 1)
+        self.assertEqual(result['count'], 3)
+        [root] = result['data']
+        self.assertEqual((root['id'], root['headcount'], root['total_headcount']), (self.root.id, 1, 5))
+        [middle] = root['children']
+        self.assertEqual(
+            (middle['id'], middle['headcount'], middle['total_headcount']), (self.middle.id, 2, 4))
+        # Tingkat di luar depth tidak dikirim
+        self.assertNotIn('children', middle)
+        self.assertTrue(middle['has_more_children'])
+        self.assertNotIn('total_employees', middle)
+
+    def test_department_tree_errors(self):
+        self._get_json('/api/departments/tree?depth=0', status=400)
+        self._get_json('/api/departments/tree?root=abc', status=400)
+        self._get_json('/api/departments/tree?root=999999999', status=404)
+
+    def test_employee_reports(self):
+        self.authenticate('admin', 'admin')
+        result = self._get_json('/api/employees/%d/reports?depth=1&fields=name' % self.boss.id)
+        data = result['data']
+        self.assertEqual((data['id'], data['direct_reports'], data['total_reports']), (self.boss.id, 1, 4))
+        [manager] = data['reports']
+        self.assertEqual((manager['id'], manager['direct_reports'], manager['total_reports']),
+                         (self.manager.id, 3, 3))
+        self.assertTrue(manager['has_more_children'])
+        self._get_json('/api/employees/%d/reports?depth=11' % self.boss.id, status=400)
+
+    def test_employee_reports_other_company(self):
+        other = self.env['res.company'].create({'name': 'Pohon Company Lain'})
+        foreign = self.env['hr.employee'].create({'name': 'Pohon Asing', 'company_id': other.id})
+        self.env['hr.employee'].create({
+            'name': 'Pohon Asing Staf', 'company_id': other.id, 'parent_id': foreign.id,
+        })
+        new_test_user(
+            self.env, 'pohon_hr', groups='base.group_user,hr.group_hr_user',
+            company_id=self.env.company.id, company_ids=[self.env.company.id, other.id],
+        )
+        self.authenticate('pohon_hr', 'pohon_hr')
+        self._get_json('/api/employees/%d/reports' % foreign.id, status=403)
+        result = self._get_json('/api/employees/%d/reports?depth=1&fields=name' % self.boss.id)
+        self.assertEqual(result['data']['total_reports'], 4)
+
+        self.authenticate('admin', 'admin')
+        result = self._get_json('/api/employees/%d/reports?depth=1&fields=name' % foreign.id)
+        self.assertEqual(result['data']['total_reports'], 1)
@@ -0,0 +1,61 @@
+import base64
+import io
+
+from PIL import Image
+
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+
+def _png(size=(300, 200)):
+    data = io.BytesIO()
+    Image.new('RGB', size, 'red').save(data, 'PNG')
+    return base64.b64encode(data.getvalue())
+
+
+@tagged('post_install', '-at_install')
+class TestProductImage(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.category = cls.env['product.category'].create({'name': 'Gambar Test'})
+        cls.product = cls.env['product.template'].create({
+            'name': 'Gambar Produk', 'categ_id': cls.category.id, 'image_1920': _png(),
+        })
+
+    def _image_url(self, size):
+        [row] = self._get_json('/api/products?categ_id=%d&fields=image_url&size=%s' % (self.category.id, size))['data']
+        return row['image_url']
+
+    def test_thumbnail_variant(self):
+        response = self._request('GET', '/api/products/%d/image?size=128' % self.product.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'image/png')
+        self.assertEqual(max(Image.open(io.BytesIO(response.content)).size), 128)
+
+    def test_unique_url_is_immutable(self):
+        url = self._image_url('256')
+        self.assertIn('size=256', url)
+        self.assertIn('unique=', url)
+        response = self.opener.get(url, timeout=30)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response.headers['Cache-Control'])
+
+        # Tanpa unique: klien revalidasi dengan ETag
+        path = '/api/products/%d/image?size=256' % self.product.id
+        response = self._request('GET', path)
+        self.assertNotIn('immutable', response.headers.get('Cache-Control', ''))
+        response = self._request('GET', path, headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_image_changes_url(self):
+        url = self._image_url('128')
+        self.product.image_1920 = _png((400, 400))
+        self.env.cr.postcommit.run()
+        self.assertNotEqual(self._image_url('128'), url)
+
+    def test_errors(self):
+        self._get_json('/api/products/%d/image?size=64' % self.product.id, status=400)
+        self._get_json('/api/products/999999999/image', status=404)
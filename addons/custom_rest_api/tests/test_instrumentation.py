@@ -0,0 +1,41 @@
+from odoo.tests import TransactionCase, tagged
+
+from ..tools import instrumentation
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestLatencyHistograms(TransactionCase):
+
+    def test_percentiles_over_window(self):
+        histograms = instrumentation.LatencyHistograms(window_size=100)
+        for ms in range(1, 201):
+            histograms.record('/api/x', ms / 1000)
+        [stats] = histograms.stats()
+        # Hanya 100 sampel terakhir (101..200 ms) yang dihitung
+        self.assertEqual((stats['count'], stats['window']), (200, 100))
+        self.assertAlmostEqual(stats['p50_ms'], 150)
+        self.assertAlmostEqual(stats['p95_ms'], 195)
+        self.assertAlmostEqual(stats['p99_ms'], 199)
+
+
+@tagged('post_install', '-at_install')
+class TestServerTiming(RestApiCase):
+
+    def _set_enabled(self, value):
+        self.env['ir.config_parameter'].sudo().set_param('custom_rest_api.instrumentation', value)
+
+    def test_server_timing_header(self):
+        self._set_enabled('1')
+        response = self._request('GET', '/api/departments?limit=1')
+        self.assertEqual(response.status_code, 200)
+        timing = response.headers['Server-Timing']
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('serialize;dur=', timing)
+        self.assertIn('encode;dur=', timing)
+        self.assertRegex(timing, r'total;dur=[\d.]+$')
+
+    def test_disabled_by_default(self):
+        self._set_enabled('0')
+        response = self._request('GET', '/api/departments?limit=1')
+        self.assertNotIn('Server-Timing', response.headers)
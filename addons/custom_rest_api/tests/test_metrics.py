@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+from collections import defaultdict
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+from ..tools import metrics
+from .common import RestApiCase
+
+# Di atas pid_max maksimum Linux (2**22): pasti bukan proses yang hidup
+DEAD_PID = 2 ** 22 + 1
+
+
+@tagged('post_install', '-at_install')
+class TestMetricsStore(TransactionCase):
+
+    def test_render_counter_and_histogram(self):
+        store = metrics.MetricStore()
+        store.inc('rest_api_requests_total', route='/api/x', method='GET', status=200)
+        store.inc('rest_api_requests_total', route='/api/x', method='GET', status=200)
+        store.observe('rest_api_request_duration_seconds', 0.02, route='/api/x')
+        total = {'counters': defaultdict(float), 'histograms': {}}
+        metrics._merge(total, store.snapshot())
+        lines = metrics.render(total).splitlines()
+        self.assertIn('# TYPE rest_api_requests_total counter', lines)
+        self.assertIn('rest_api_requests_total{method="GET",route="/api/x",status="200"} 2', lines)
+        self.assertIn('rest_api_request_duration_seconds_bucket{route="/api/x",le="0.01"} 0', lines)
+        self.assertIn('rest_api_request_duration_seconds_bucket{route="/api/x",le="0.025"} 1', lines)
+        self.assertIn('rest_api_request_duration_seconds_bucket{route="/api/x",le="+Inf"} 1', lines)
+        self.assertIn('rest_api_request_duration_seconds_count{route="/api/x"} 1', lines)
+
+    def test_dead_worker_archived_and_counted_once(self):
+        key = ('rest_api_requests_total', (('route', '/api/arsip'),))
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(metrics, 'metrics_dir', return_value=directory):
+            with open(os.path.join(directory, '%s-1.json' % DEAD_PID), 'w') as f:
+                json.dump({
+                    'pid': DEAD_PID, 'start': 1, 'histograms': [],
+                    'counters': [['rest_api_requests_total', [['route', '/api/arsip']], 3]],
+                }, f)
+            self.assertEqual(metrics.collect()['counters'][key], 3)
+            self.assertFalse(os.path.exists(os.path.join(directory, '%s-1.json' % DEAD_PID)))
+            self.assertTrue(os.path.exists(os.path.join(directory, metrics.ARCHIVE)))
+            # Scrape berikutnya membaca archive, bukan menjumlah dua kali
+            self.assertEqual(metrics.collect()['counters'][key], 3)
+
+
+@tagged('post_install', '-at_install')
+class TestMetricsEndpoint(RestApiCase):
+
+    def test_requires_token_or_admin(self):
+        self.env['ir.config_parameter'].sudo().set_param('custom_rest_api.metrics_token', 'rahasia')
+        self.assertEqual(self._request('GET', '/api/metrics').status_code, 403)
+        response = self._request('GET', '/api/metrics', headers={'Authorization': 'Bearer salah'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_scrape_includes_api_requests(self):
+        self.env['ir.config_parameter'].sudo().set_param('custom_rest_api.metrics_token', 'rahasia')
+        self._get_json('/api/departments?limit=1')
+        response = self._request('GET', '/api/metrics', headers={'Authorization': 'Bearer rahasia'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers['Content-Type'].startswith('text/plain'))
+        self.assertIn('# TYPE rest_api_requests_total counter', response.text)
+        self.assertIn('route="/api/departments"', response.text)
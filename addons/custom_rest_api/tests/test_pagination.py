@@ -0,0 +1,70 @@
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestPagination(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.departments = cls.env['hr.department'].create([
+            {'name': 'Paging Test %02d' % i} for i in range(7)
+        ])
+
+    def _walk_cursor(self, path):
+        """Ikuti next_cursor sampai habis; kembalikan id semua halaman."""
+        ids = []
+        response = self._get_json(path + '&cursor=')
+        while True:
+            self.assertLessEqual(response['count'], 3)
+            ids += [item['id'] for item in response['data']]
+            if not response['has_more']:
+                self.assertIsNone(response['next_cursor'])
+                return ids
+            response = self._get_json(path + '&cursor=' + response['next_cursor'])
+
+    def test_cursor_visits_every_record_once(self):
+        ids = self._walk_cursor('/api/departments?name=Paging Test&fields=id&limit=3')
+        self.assertEqual(ids, sorted(self.departments.ids))
+
+    def test_cursor_order_write_date(self):
+        self.departments[0].write({'note': 'diubah'})
+        ids = self._walk_cursor('/api/departments?name=Paging Test&fields=id&limit=3&order=write_date')
+        self.assertCountEqual(ids, self.departments.ids)
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_after_id(self):
+        response = self._get_json(
+            '/api/departments?name=Paging Test&fields=id&limit=2&after_id=%d' % self.departments[4].id)
+        self.assertEqual([item['id'] for item in response['data']], self.departments[5:].ids)
+        self.assertFalse(response['has_more'])
+
+    def test_invalid_cursor(self):
+        self._get_json('/api/departments?cursor=bukan-token', status=400)
+        self._get_json('/api/departments?after_id=1&order=write_date', status=400)
+
+    def test_count_exact(self):
+        response = self._get_json('/api/departments?name=Paging Test&fields=id&limit=3&offset=3')
+        self.assertEqual(response['total'], 7)
+        self.assertEqual(response['offset'], 3)
+        self.assertEqual(response['count'], 3)
+        self.assertTrue(response['has_more'])
+
+    def test_count_estimate(self):
+        # Hasil kecil dihitung ulang secara eksak (lihat tools/counting.py)
+        response = self._get_json('/api/departments?name=Paging Test&fields=id&limit=3&count=estimate')
+        self.assertEqual(response['total'], 7)
+        self.assertTrue(response['has_more'])
+
+    def test_count_none(self):
+        response = self._get_json('/api/departments?name=Paging Test&fields=id&limit=3&offset=6&count=none')
+        self.assertIsNone(response['total'])
+        self.assertEqual(response['count'], 1)
+        self.assertFalse(response['has_more'])
+        response = self._get_json('/api/departments?name=Paging Test&fields=id&limit=3&count=none')
+        self.assertTrue(response['has_more'])
+
+    def test_invalid_count_mode(self):
+        self._get_json('/api/departments?count=semua', status=400)
@@ -0,0 +1,37 @@
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+STOCK_FIELDS = 'name,qty_available,virtual_available'
+
+
+@tagged('post_install', '-at_install')
+class TestProductCatalog(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.category = cls.env['product.category'].create({'name': 'Katalog Stok'})
+        cls.product = cls.env['product.template'].create({
+            'name': 'Katalog Produk', 'type': 'consu', 'is_storable': True, 'categ_id': cls.category.id,
+        })
+        # Stok hanya ada di gudang perusahaan utama
+        cls.env['stock.quant']._update_available_quantity(
+            cls.product.product_variant_id, cls.env.ref('stock.stock_location_stock'), 7.0)
+        cls.other_company = cls.env['res.company'].create({'name': 'Katalog Company Lain'})
+
+    def _products(self):
+        return self._get_json('/api/products?categ_id=%d&fields=%s' % (self.category.id, STOCK_FIELDS))['data']
+
+    def test_stock_independent_of_refreshing_user_company(self):
+        self.authenticate('admin', 'admin')
+        Param = self.env['ir.config_parameter'].sudo()
+        Param.set_param('custom_rest_api.product_catalog', '0')
+        live = self._products()
+        self.assertEqual(live[0]['qty_available'], 7.0)
+
+        Param.set_param('custom_rest_api.product_catalog', '1')
+        # Refresh yang dipicu commit user perusahaan lain
+        self.env['rest.product.catalog'].with_company(self.other_company).with_context(
+            allowed_company_ids=self.other_company.ids)._refresh(self.product.ids)
+        self.assertEqual(self._products(), live)
@@ -0,0 +1,57 @@
+import zlib
+
+from odoo.sql_db import db_connect
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestRateLimit(RestApiCase):
+
+    def _set_params(self, **params):
+        ICP = self.env['ir.config_parameter'].sudo()
+        for name, value in params.items():
+            ICP.set_param('custom_rest_api.%s' % name, value)
+
+    def test_bucket_returns_429(self):
+        self._set_params(rate_limit_rate='0.01', rate_limit_burst='2', rate_limit_backend='memory')
+        for _i in range(2):
+            self.assertEqual(self._request('GET', '/api/departments?limit=1').status_code, 200)
+        response = self._request('GET', '/api/departments?limit=1')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response.headers['Retry-After']), 1)
+
+    def test_unverified_authorization_shares_ip_bucket(self):
+        self._set_params(rate_limit_rate='0.01', rate_limit_burst='2', rate_limit_backend='memory')
+        statuses = [
+            self._request('GET', '/api/departments?limit=1', headers={'Authorization': 'Bearer acak-%d' % i}).status_code
+            for i in range(3)
+        ]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    def _hold_export_slots(self, slots):
+        """Kunci semua slot 'export' dari koneksi lain (seperti ekspor yang sedang berjalan)."""
+        self._set_params(concurrency_export=str(slots))
+        cr = db_connect(self.env.cr.dbname).cursor()
+        self.addCleanup(cr.close)
+        self.addCleanup(cr.rollback)
+        lock_key = zlib.crc32(b'custom_rest_api.export') - 2 ** 31
+        for slot in range(slots):
+            cr.execute("SELECT pg_advisory_xact_lock(%s, %s)", [lock_key, slot])
+        return cr
+
+    def test_concurrency_cap_on_exports(self):
+        cr = self._hold_export_slots(1)
+        for path in ('/api/contacts?format=ndjson', '/api/products?fields=id'):
+            with self.subTest(path=path):
+                response = self._request('GET', path)
+                self.assertEqual(response.status_code, 429)
+                self.assertIn('Retry-After', response.headers)
+        # Request interaktif (dengan limit) tidak memakai slot ekspor
+        self.assertEqual(self._request('GET', '/api/products?fields=id&limit=5').status_code, 200)
+
+        cr.rollback()
+        response = self._request('GET', '/api/contacts?format=ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'application/x-ndjson')
@@ -0,0 +1,52 @@
+from odoo.tests import TransactionCase, tagged
+
+from ..tools import response_cache
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestResponseCacheStore(TransactionCase):
+
+    def test_lru_eviction(self):
+        cache = response_cache.ResponseCache(max_size=2, ttl=60)
+        cache.set('a', 1, 'A')
+        cache.set('b', 1, 'B')
+        self.assertEqual(cache.get('a', 1), 'A')
+        # 'b' paling lama tidak dipakai
+        cache.set('c', 1, 'C')
+        self.assertIsNone(cache.get('b', 1))
+        self.assertEqual((cache.get('a', 1), cache.get('c', 1)), ('A', 'C'))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_generation_and_ttl(self):
+        cache = response_cache.ResponseCache(max_size=2, ttl=60)
+        cache.set('a', 1, 'A')
+        self.assertIsNone(cache.get('a', 2))
+        # Entry dengan generation lama langsung dibuang
+        self.assertIsNone(cache.get('a', 1))
+        cache.ttl = -1
+        cache.set('b', 1, 'B')
+        self.assertIsNone(cache.get('b', 1))
+
+
+@tagged('post_install', '-at_install')
+class TestResponseCacheEndpoint(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.department = cls.env['hr.department'].create({'name': 'Cache Test'})
+        cls.path = '/api/departments?name=Cache Test&fields=name'
+
+    def test_hit_then_invalidated_after_commit(self):
+        first = self._get_json(self.path)
+        hits = response_cache.cache.hits
+        self.assertEqual(self._get_json(self.path), first)
+        self.assertEqual(response_cache.cache.hits, hits + 1)
+
+        self.department.name = 'Cache Test Baru'
+        # Sequence signaling baru dinaikkan setelah commit
+        self.assertEqual(self._get_json(self.path), first)
+        self.env.cr.postcommit.run()
+        result = self._get_json(self.path)
+        self.assertEqual(result['data'], [{'id': self.department.id, 'name': 'Cache Test Baru'}])
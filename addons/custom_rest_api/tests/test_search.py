@@ -0,0 +1,54 @@
+from odoo.tests import new_test_user, tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestSearch(RestApiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Partner = cls.env['res.partner']
+        cls.title_hit = Partner.create({'name': 'Zebrafinch Utama'})
+        cls.body_hit = Partner.create({'name': 'Kontak Surel', 'email': 'zebrafinch@example.com'})
+        cls.hidden = Partner.create({'name': 'Zebrafinch Tersembunyi'})
+        cls.env['ir.rule'].create({
+            'name': 'Sembunyikan kontak test pencarian',
+            'model_id': cls.env.ref('base.model_res_partner').id,
+            'domain_force': "[('name', 'not ilike', 'Tersembunyi')]",
+        })
+        new_test_user(cls.env, 'pencari', groups='base.group_user')
+        # Index diperbarui saat precommit, yang tidak terjadi di transaksi test
+        cls.env.cr.precommit.run()
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate('pencari', 'pencari')
+
+    def _search(self, query):
+        return self._get_json('/api/search?types=contact&q=%s' % query)
+
+    def test_hidden_records_excluded(self):
+        Document = self.env['rest.api.search.document']
+        self.assertTrue(Document.search_count([('res_model', '=', 'res.partner'), ('res_id', '=', self.hidden.id)]))
+        result = self._search('zebrafinch')
+        # Judul (bobot A) di atas isi (bobot B)
+        self.assertEqual([hit['id'] for hit in result['data']], [self.title_hit.id, self.body_hit.id])
+        self.assertEqual(result['count'], 2)
+        self.assertFalse(result['truncated'])
+        self.assertIn('<mark>Zebrafinch</mark> Utama', result['data'][0]['highlight'])
+
+    def test_offset(self):
+        result = self._search('zebrafinch&offset=1')
+        self.assertEqual([hit['id'] for hit in result['data']], [self.body_hit.id])
+
+    def test_candidate_cap_marks_truncated(self):
+        self.env['ir.config_parameter'].sudo().set_param('custom_rest_api.search_rank_candidates', '1')
+        result = self._search('zebrafinch')
+        self.assertEqual(result['count'], 1)
+        self.assertTrue(result['truncated'])
+
+    def test_errors(self):
+        self._get_json('/api/search?q=zebrafinch&types=faktur', status=400)
+        self.assertEqual(self._search('')['data'], [])
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from odoo.tests import TransactionCase, tagged
+
+from ..tools import sync
+from .common import RestApiCase
+
+
+def _token_before(cr):
+    """Token tepat sebelum transaksi test: hanya data test yang terbaca."""
+    return sync.encode_token(cr.now() - timedelta(microseconds=1))
+
+
+@tagged('post_install', '-at_install')
+class TestChangesSince(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Partner = cls.env['res.partner']
+        cls.kept = Partner.create([{'name': 'Sync %d' % i} for i in range(2)])
+        cls.archived = Partner.create({'name': 'Sync Arsip'})
+        cls.archived.active = False
+        removed = Partner.create([{'name': 'Sync Hapus %d' % i} for i in range(3)])
+        cls.removed_ids = removed.ids
+        removed.unlink()
+
+    def _drain(self, token, limit):
+        """Ikuti next_token sampai has_more False; kembalikan (data, deleted, halaman)."""
+        data, deleted, pages = [], [], 0
+        while True:
+            result = sync.changes_since(self.env['res.partner'].sudo(), token, limit, lambda records: records.ids)
+            pages += 1
+            self.assertLessEqual(len(result['data']) + len(result['deleted']), limit)
+            data += result['data']
+            deleted += result['deleted']
+            token = result['next_token']
+            if not result['has_more']:
+                return data, deleted, pages
+
+    def test_round_trip_pages_tombstones(self):
+        data, deleted, pages = self._drain(_token_before(self.env.cr), limit=2)
+        self.assertEqual(sorted(data), self.kept.ids)
+        self.assertEqual(sorted(deleted), sorted(self.archived.ids + self.removed_ids))
+        # 6 event (2 aktif, 1 arsip, 3 tombstone) dengan limit 2
+        self.assertEqual(pages, 3)
+
+    def test_tombstones_not_repeated_on_every_page(self):
+        _data, deleted, _pages = self._drain(_token_before(self.env.cr), limit=1)
+        self.assertEqual(len(deleted), len(set(deleted)))
+
+    def _set_write_date(self, records, write_date):
+        records.flush_recordset()
+        self.env.cr.execute(
+            "UPDATE res_partner SET write_date = %s WHERE id IN %s", [write_date, tuple(records.ids)])
+        records.invalidate_recordset(['write_date'])
+
+    def test_initial_sync_over_records_older_than_retention(self):
+        # Record ini menjadi event paling awal dari token kosong; token
+        # has_more-nya membawa posisi 1971 tapi tidak boleh dianggap kedaluwarsa
+        self.env['ir.config_parameter'].sudo().set_param('custom_rest_api.tombstone_retention_days', '30')
+        self._set_write_date(self.kept, '1971-01-01 00:00:00')
+        token, data = '', []
+        for _page in range(2):
+            result = sync.changes_since(self.env['res.partner'].sudo(), token, 1, lambda records: records.ids)
+            self.assertTrue(result['has_more'])
+            data += result['data']
+            token = result['next_token']
+        self.assertEqual(sorted(data), self.kept.ids)
+
+    def test_window_bounded_by_high_water(self):
+        later = self.env['res.partner'].create({'name': 'Sync Nanti'})
+        self._set_write_date(later, self.env.cr.now() + timedelta(hours=1))
+        result = sync.changes_since(self.env['res.partner'].sudo(), _token_before(self.env.cr), 1, lambda records: records.ids)
+        _since, _last_id, high_water = sync.decode_token(result['next_token'])
+        self.assertTrue(high_water)
+        data, _deleted, _pages = self._drain(result['next_token'], limit=1)
+        self.assertNotIn(later.id, result['data'] + data)
+
+    def test_invalid_token(self):
+        with self.assertRaises(sync.SyncTokenError):
+            sync.changes_since(self.env['res.partner'].sudo(), 'bukan-token', 10, lambda records: records.ids)
+
+    def test_expired_token(self):
+        self.env['ir.config_parameter'].sudo().set_param('custom_rest_api.tombstone_retention_days', '30')
+        token = sync.encode_token(self.env.cr.now() - timedelta(days=31))
+        with self.assertRaises(sync.SyncTokenExpired):
+            sync.changes_since(self.env['res.partner'].sudo(), token, 10, lambda records: records.ids)
+
+
+@tagged('post_install', '-at_install')
+class TestChangesEndpoint(RestApiCase):
+
+    def test_round_trip(self):
+        partner = self.env['res.partner'].create({'name': 'Sync HTTP', 'email': 'sync.http@example.com'})
+        removed = self.env['res.partner'].create({'name': 'Sync HTTP Hapus'})
+        removed_id = removed.id
+        removed.unlink()
+
+        result = self._get_json('/api/contacts/changes?limit=1&fields=name&since=%s' % _token_before(self.env.cr))
+        self.assertEqual(result['data'], [{'id': partner.id, 'name': 'Sync HTTP'}])
+        self.assertEqual(result['deleted'], [])
+        self.assertTrue(result['has_more'])
+
+        result = self._get_json('/api/contacts/changes?limit=1&since=%s' % result['next_token'])
+        self.assertEqual(result['data'], [])
+        self.assertEqual(result['deleted'], [removed_id])
+        self.assertFalse(result['has_more'])
+
+    def test_bad_tokens(self):
+        self._get_json('/api/contacts/changes?since=bukan-token', status=400)
+        expired = sync.encode_token(self.env.cr.now() - timedelta(days=3650))
+        result = self._get_json('/api/contacts/changes?since=%s' % expired, status=410)
+        self.assertTrue(result['full_resync'])
@@ -0,0 +1,52 @@
+from odoo.tests import tagged
+
+from .common import RestApiCase
+
+
+@tagged('post_install', '-at_install')
+class TestUpsertContacts(RestApiCase):
+
+    def _upsert(self, payload, status=200):
+        response = self._request('PUT', '/api/contacts/upsert', payload)
+        self.assertEqual(response.status_code, status, response.text)
+        return response.json()
+
+    def test_upsert_is_idempotent(self):
+        records = [
+            {'email': 'upsert.satu@example.com', 'name': 'Upsert Satu', 'city': 'Bogor'},
+            {'email': 'upsert.dua@example.com', 'name': 'Upsert Dua'},
+        ]
+        result = self._upsert({'key': 'email', 'records': records})
+        self.assertEqual(result['summary'], {'created': 2})
+
+        records[0]['city'] = 'Depok'
+        result = self._upsert({'key': 'email', 'records': records})
+        self.assertEqual([item['status'] for item in result['results']], ['updated', 'unchanged'])
+        partner = self.env['res.partner'].search([('email', '=', 'upsert.satu@example.com')])
+        self.assertEqual(len(partner), 1)
+        self.assertEqual(partner.city, 'Depok')
+
+    def test_partial_failure(self):
+        result = self._upsert({'key': 'email', 'records': [
+            {'email': 'upsert.valid@example.com', 'name': 'Upsert Valid'},
+            {'email': 'upsert.valid@example.com', 'name': 'Duplikat'},
+            {'name': 'Tanpa Email'},
+            # Kontak baru tanpa nama ditolak constraint, hanya item ini yang gagal
+            {'email': 'upsert.tanpa.nama@example.com'},
+        ]})
+        self.assertEqual(
+            [item['status'] for item in result['results']], ['created', 'error', 'error', 'error'])
+        self.assertEqual(result['summary'], {'created': 1, 'error': 3})
+
+    def test_external_id_key(self):
+        payload = {'key': 'external_id', 'namespace': 'tes_upsert', 'records': [
+            {'external_id': 'pelanggan_1', 'name': 'Pelanggan Satu'},
+        ]}
+        created = self._upsert(payload)['results'][0]
+        self.assertEqual(created['status'], 'created')
+        self.assertEqual(self.env.ref('tes_upsert.pelanggan_1').id, created['id'])
+        self.assertEqual(self._upsert(payload)['results'][0]['status'], 'unchanged')
+
+    def test_invalid_key(self):
+        self._upsert({'key': 'phone', 'records': []}, status=400)
+        self._upsert({'key': 'external_id', 'namespace': 'a.b', 'records': []}, status=400)
@@ -0,0 +1,17 @@
+# Helper bersama untuk controller REST API
+from . import aggregation
+from . import batch
+from . import compression
+from . import counting
+from . import encoder
+from . import filters
+from . import hierarchy
+from . import images
+from . import instrumentation
+from . import metrics
+from . import pagination
+from . import rate_limit
+from . import response_cache
+from . import serializers
+from . import streaming
+from . import sync
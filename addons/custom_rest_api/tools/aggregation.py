@@ -0,0 +1,79 @@
+# Endpoint /api/<resource>/aggregate menghitung statistik dengan
+# _read_group (GROUP BY di SQL), bukan dengan memuat seluruh list lalu
+# menghitung di klien. Setiap resource mendeklarasikan allowlist:
+#   group spec   ``parameter -> spesifikasi groupby _read_group``
+#                (mis. 'department' -> 'department_id', 'month' -> 'create_date:month')
+#   measure spec ``parameter -> nama field numerik tersimpan``
+
+AGGREGATORS = ('sum', 'avg', 'min', 'max')
+MAX_GROUP_BY = 3
+
+
+class AggregateError(ValueError):
+    """Parameter group_by/measures tidak valid."""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def _split(value):
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+def parse_params(kw, group_spec, measure_spec):
+    """
+    Baca ``group_by=department,company`` dan ``measures=count,sum:list_price``.
+
+    :return: tuple (group_keys, measures); measures berisi tuple
+             (kunci_output, spesifikasi_aggregate _read_group)
+    :raise AggregateError: bila ada nama di luar allowlist
+    """
+    group_keys = _split(kw.get('group_by'))
+    invalid = [key for key in group_keys if key not in group_spec]
+    if invalid:
+        raise AggregateError('Nilai group_by tidak dikenal: %s' % ', '.join(invalid))
+    if len(group_keys) > MAX_GROUP_BY:
+        raise AggregateError('group_by maksimal %d kolom.' % MAX_GROUP_BY)
+
+    measures = []
+    for measure in _split(kw.get('measures')) or ['count']:
+        if measure == 'count':
+            measures.append(('count', '__count'))
+            continue
+        aggregator, _sep, key = measure.partition(':')
+        if aggregator not in AGGREGATORS or key not in measure_spec:
+            raise AggregateError(
+                'Measure tidak dikenal: %s (count atau <%s>:<%s>)'
+                % (measure, '|'.join(AGGREGATORS), '|'.join(measure_spec) or '-'))
+        measures.append(('%s_%s' % (key, aggregator), '%s:%s' % (measure_spec[key], aggregator)))
+    return group_keys, measures
+
+
+def _group_value(value, field_type):
+    """Record Many2one -> {'id', 'name'}; nilai kosong -> None, kecuali Boolean."""
+    if hasattr(value, '_name'):
+        return {'id': value.id, 'name': value.display_name} if value else None
+    if value is False and field_type != 'boolean':
+        return None
+    return value
+
+
+def aggregate(Model, domain, group_spec, group_keys, measures):
+    """
+    Jalankan satu _read_group dan ubah hasilnya menjadi list dict
+    ``{<group_key>: nilai, ..., <measure>: nilai}``. Nama record Many2one
+    dibaca dengan satu query per model (prefetch _read_group).
+    """
+    groupby = [group_spec[key] for key in group_keys]
+    field_types = [Model._fields[spec.split(':')[0]].type for spec in groupby]
+    rows = Model._read_group(domain, groupby, [spec for _key, spec in measures])
+    result = []
+    for row in rows:
+        item = {
+            key: _group_value(value, field_type)
+            for key, field_type, value in zip(group_keys, field_types, row)
+        }
+        item.update((key, value) for (key, _spec), value in zip(measures, row[len(group_keys):]))
+        result.append(item)
+    return result
@@ -0,0 +1,48 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 5000
+
+
+def chunked(items, size):
+    """Potong list menjadi potongan berukuran ``size``."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def error_result(index, error):
+    return {'index': index, 'status': 'error', 'error': error}
+
+
+def apply_in_chunks(cr, items, chunk_size, process, isolate=True):
+    """
+    Jalankan ``process`` per potongan item dan kumpulkan hasil per item.
+
+    Dengan ``isolate`` setiap potongan berjalan di savepoint sendiri. Bila
+    satu potongan gagal, potongan itu diulang per item (masing-masing di
+    savepoint), sehingga hanya baris yang bermasalah yang gagal dan sisa
+    batch tetap tersimpan. Tanpa ``isolate`` error langsung diteruskan ke
+    pemanggil (mode atomik: semua atau tidak sama sekali).
+
+    :param items: list tuple yang elemen pertamanya adalah index item di request
+    :param process: callable(list item) -> list dict hasil per item
+    """
+    results = []
+    for chunk in chunked(items, chunk_size):
+        if not isolate:
+            results.extend(process(chunk))
+            continue
+        try:
+            with cr.savepoint():
+                results.extend(process(chunk))
+        except Exception:
+            for item in chunk:
+                try:
+                    with cr.savepoint():
+                        results.extend(process([item]))
+                except Exception as e:
+                    _logger.info("Item batch #%s gagal: %s", item[0], e)
+                    results.append(error_result(item[0], str(e)))
+    return results
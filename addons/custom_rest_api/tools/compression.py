@@ -0,0 +1,68 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Body di bawah ambang ini dikirim apa adanya; bisa diubah lewat
+# ir.config_parameter 'custom_rest_api.compression_min_size' (bytes, 0 = mati)
+DEFAULT_MIN_SIZE = 1024
+
+# Level sedang: rasio mendekati maksimum untuk JSON/base64 dengan biaya CPU
+# jauh lebih kecil daripada level tertinggi
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+SUPPORTED = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(httprequest):
+    """Pilih encoding terbaik dari header Accept-Encoding (atau None)."""
+    return httprequest.accept_encodings.best_match(SUPPORTED)
+
+
+def min_size(env):
+    return int(env['ir.config_parameter'].sudo().get_param(
+        'custom_rest_api.compression_min_size', DEFAULT_MIN_SIZE))
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # wbits 16+ menghasilkan format gzip (header + trailer CRC)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def iter_compressed(chunks, encoding):
+    """
+    Kompres stream per chunk. Setiap chunk di-flush (sync flush) agar klien
+    bisa mulai mem-parse baris NDJSON tanpa menunggu stream selesai.
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def weaken_etag(headers):
+    """
+    Representasi terkompresi tidak identik byte-per-byte dengan aslinya,
+    jadi ETag kuat diturunkan menjadi lemah. If-None-Match memakai
+    perbandingan lemah sehingga 304 tetap berlaku.
+    """
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        headers['ETag'] = 'W/' + etag
@@ -0,0 +1,163 @@
+import hashlib
+from datetime import timezone
+
+from werkzeug.http import http_date, parse_date, unquote_etag
+
+from odoo.http import request, Response
+from odoo.tools import SQL
+
+
+def _make_tag(*parts):
+    raw = '|'.join(str(part) for part in parts).encode()
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _evaluate(tag, weak, last_modified, headers):
+    """
+    Tambahkan header validator ke ``headers`` lalu cocokkan dengan
+    If-None-Match / If-Modified-Since dari klien.
+
+    :return: Response 304 bila salinan klien masih segar, selain itu None
+    """
+    headers['ETag'] = ('W/"%s"' if weak else '"%s"') % tag
+    # Klien boleh menyimpan response, tapi wajib revalidasi setiap kali
+    headers['Cache-Control'] = 'private, no-cache'
+    if last_modified:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        headers['Last-Modified'] = http_date(last_modified)
+
+    if _is_fresh(tag, last_modified):
+        return Response(status=304, headers=headers)
+    return None
+
+
+def _is_fresh(tag, last_modified):
+    """Apakah salinan milik klien (If-None-Match / If-Modified-Since) masih sama."""
+    httprequest = request.httprequest
+    if httprequest.if_none_match:
+        # If-None-Match selalu memakai perbandingan lemah (RFC 9110)
+        return httprequest.if_none_match.contains_weak(tag)
+    if last_modified and httprequest.if_modified_since:
+        return last_modified <= httprequest.if_modified_since
+    return False
+
+
+def validators(headers):
+    """Ambil header validator dari response agar bisa disimpan bersama cache."""
+    return {k: headers[k] for k in ('ETag', 'Last-Modified', 'Cache-Control') if k in headers}
+
+
+def replay(saved_validators, headers):
+    """
+    Pasang kembali validator dari response yang diambil dari cache dan
+    jawab 304 bila klien sudah memiliki versi yang sama.
+    """
+    headers.update(saved_validators)
+    if 'ETag' not in saved_validators:
+        return None
+    tag = unquote_etag(saved_validators['ETag'])[0]
+    last_modified = parse_date(saved_validators.get('Last-Modified'))
+    if _is_fresh(tag, last_modified):
+        return Response(status=304, headers=headers)
+    return None
+
+
+def _fingerprint(model, domain):
+    """Satu query agregat (max write_date, max id, jumlah) atas ``domain``."""
+    max_write_date, max_id, count = model._read_group(
+        domain, aggregates=['write_date:max', 'id:max', '__count'],
+    )[0]
+    return [model._name, max_write_date, max_id, count]
+
+
+def _relations_fingerprint(model, domain, relations):
+    """
+    write_date terbaru dan jumlah record relasi Many2one ``relations`` yang
+    dirujuk record dalam ``domain``, semua relasi dalam satu query.
+
+    Nama relasi (kategori, departemen, perusahaan, ...) ikut di body,
+    tapi mengganti namanya tidak mengubah write_date record yang merujuk.
+    """
+    if not relations:
+        return []
+    query = model._search(domain)
+    columns = []
+    for fname in relations:
+        comodel = model.env[model._fields[fname].comodel_name]
+        columns.append(SQL(
+            "(SELECT ARRAY[max(write_date)::text, count(*)::text] FROM %s WHERE id IN %s)",
+            SQL.identifier(comodel._table),
+            query.subselect(SQL.identifier(model._table, fname)),
+        ))
+    model.env.cr.execute(SQL("SELECT %s", SQL(", ").join(columns)))
+    return list(model.env.cr.fetchone())
+
+
+def check_record(record, headers, relations=(), depends=()):
+    """
+    Validator untuk endpoint satu record.
+
+    ETag kuat dihitung dari model, id, write_date dan query string
+    (mis. include_image mengubah isi body), sehingga 304 bisa dijawab
+    tanpa menjalankan serializer.
+
+    :param relations: field Many2one yang nama/isinya ikut di body
+    :param depends: pasangan ``(model, domain)`` lain yang ikut menentukan
+                    isi body (mis. karyawan sebuah departemen untuk headcount)
+
+    Last-Modified hanya dikirim bila body cukup ditentukan oleh write_date
+    record ini: penghapusan record relasi/dependen tidak memajukan tanggal
+    apa pun, jadi If-Modified-Since tidak bisa diandalkan untuk kasus itu.
+    """
+    parts = [record._name, record.id, record.write_date]
+    parts += _relations_fingerprint(
+        record.with_context(active_test=False), [('id', '=', record.id)], relations)
+    for model, domain in depends:
+        parts += _fingerprint(model, domain)
+    tag = _make_tag(*parts, request.httprequest.query_string)
+    last_modified = None if relations or depends else record.write_date
+    return _evaluate(tag, False, last_modified, headers)
+
+
+def check_list(model, domain, headers, relations=(), depends=()):
+    """
+    Validator lemah untuk endpoint list.
+
+    Dihitung dari satu query agregat (max write_date, max id, jumlah)
+    atas domain yang sama. Jumlah ikut dikembalikan agar handler tidak
+    perlu menjalankan search_count lagi.
+
+    List tidak mendapat Last-Modified: record yang dihapus dari list tidak
+    mengubah write_date terbaru, jadi hanya ETag (yang memuat jumlah) yang
+    bisa mendeteksinya.
+
+    :param relations: lihat check_record
+    :param depends: lihat check_record
+    :return: tuple (response_304_atau_None, jumlah_record)
+    """
+    parts = _fingerprint(model, domain)
+    count = parts[-1]
+    parts += _relations_fingerprint(model, domain, relations)
+    for dep_model, dep_domain in depends:
+        parts += _fingerprint(dep_model, dep_domain)
+    tag = _make_tag(*parts, request.httprequest.query_string)
+    return _evaluate(tag, True, None, headers), count
+
+
+def check_lists(queries, headers, relations=()):
+    """
+    Validator lemah untuk response yang disusun dari beberapa model (mis.
+    pohon departemen beserta headcount karyawan): satu query agregat per
+    pasangan ``(model, domain)``. Seperti check_list, tanpa Last-Modified.
+
+    :param relations: tuple ``(model, domain, field_many2one)`` untuk nama
+                      relasi yang ikut di body
+    :return: response_304_atau_None
+    """
+    parts = []
+    for model, domain in queries:
+        parts += _fingerprint(model, domain)
+    for model, domain, fnames in relations:
+        parts += _relations_fingerprint(model, domain, fnames)
+    tag = _make_tag(*parts, request.httprequest.query_string)
+    return _evaluate(tag, True, None, headers)
@@ -0,0 +1,79 @@
+import logging
+import time
+
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+# Di bawah ambang ini hitungan eksak sudah murah, dan estimasi planner
+# untuk tabel/domain kecil sering meleset jauh.
+ESTIMATE_EXACT_THRESHOLD = 1000
+
+# Cache hitungan eksak sebagai cadangan bila EXPLAIN gagal
+_COUNT_CACHE_TTL = 60
+_COUNT_CACHE_SIZE = 256
+_count_cache = {}
+
+
+class CountModeError(ValueError):
+    """Nilai parameter 'count' tidak dikenal."""
+
+
+def parse_count_mode(kw):
+    """Baca parameter 'count' (exact|estimate|none), default 'exact'."""
+    mode = kw.get('count') or 'exact'
+    if mode not in COUNT_MODES:
+        raise CountModeError()
+    return mode
+
+
+def count_records(model, domain, mode):
+    """
+    Hitung total record sesuai mode yang diminta.
+
+    - exact: search_count biasa
+    - estimate: estimasi baris dari planner Postgres (EXPLAIN tanpa
+      ANALYZE, jadi tidak memindai tabel); hasil kecil dihitung ulang
+      secara eksak
+    - none: tidak menghitung sama sekali, mengembalikan None
+    """
+    if mode == 'none':
+        return None
+    if mode == 'estimate':
+        estimate = _planner_estimate(model, domain)
+        if estimate is None:
+            return _cached_count(model, domain)
+        if estimate >= ESTIMATE_EXACT_THRESHOLD:
+            return estimate
+    return model.search_count(domain)
+
+
+def _planner_estimate(model, domain):
+    """Ambil 'Plan Rows' dari EXPLAIN query pencarian, atau None bila gagal."""
+    cr = model.env.cr
+    try:
+        query = model._search(domain)
+        with cr.savepoint(flush=False):
+            cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", query.select()))
+            plan = cr.fetchone()[0]
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception as e:
+        _logger.warning("Estimasi jumlah %s gagal: %s", model._name, e)
+        return None
+
+
+def _cached_count(model, domain):
+    """search_count dengan cache per worker ber-TTL."""
+    key = (model.env.cr.dbname, model._name, model.env.uid, repr(domain))
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    count = model.search_count(domain)
+    if len(_count_cache) >= _COUNT_CACHE_SIZE:
+        _count_cache.clear()
+    _count_cache[key] = (now + _COUNT_CACHE_TTL, count)
+    return count
@@ -0,0 +1,57 @@
+import datetime
+import json
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    """Tipe yang tidak dikenal encoder JSON bawaan (dipakai kedua backend)."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        # Field Binary dibaca sebagai base64 (ASCII)
+        return value.decode('ascii')
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError('Object of type %s is not JSON serializable' % type(value).__name__)
+
+
+def _dumps_json(data):
+    # Pemisah ringkas dan ensure_ascii=False: output lebih kecil dan
+    # cukup satu kali encode str -> bytes
+    return json.dumps(data, default=_default, ensure_ascii=False,
+                      separators=(',', ':')).encode()
+
+
+BACKENDS = {'json': _dumps_json}
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def _dumps_orjson(data):
+        # orjson langsung menghasilkan bytes; subclass str seperti Markup
+        # (field Html) sudah ditangani secara native
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+    BACKENDS['orjson'] = _dumps_orjson
+
+DEFAULT_BACKEND = 'orjson' if orjson is not None else 'json'
+
+_dumps = BACKENDS[DEFAULT_BACKEND]
+
+
+def set_backend(name):
+    """Ganti backend encoder untuk proses ini (mis. untuk benchmark)."""
+    global _dumps
+    _dumps = BACKENDS[name]
+
+
+def dumps(data):
+    """Encode ``data`` menjadi bytes JSON dengan backend aktif."""
+    return _dumps(data)
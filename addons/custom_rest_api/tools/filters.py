@@ -0,0 +1,67 @@
+# Filter query string dideklarasikan per resource sebagai dict
+# ``parameter -> builder``; builder menerima nilai parameter dan
+# mengembalikan potongan domain (list kosong bila tidak ada filter).
+
+
+class FilterError(ValueError):
+    """Nilai parameter filter tidak valid."""
+
+    def __init__(self, param):
+        super().__init__(param)
+        self.param = param
+
+
+def ilike(path):
+    """Filter teks ``path ilike nilai``; nilai kosong diabaikan."""
+    def build(value):
+        return [(path, 'ilike', value)] if value else []
+    return build
+
+
+def boolean(fname):
+    """Filter boolean 'true'/'false' (nilai lain dianggap false)."""
+    def build(value):
+        return [(fname, '=', value.lower() == 'true')]
+    return build
+
+
+def id_or_name(fname, name_path=None):
+    """
+    Filter Many2one: angka dicocokkan ke id, selain itu ilike pada nama
+    (``<fname>.name`` atau ``name_path`` untuk nama yang sudah didenormalisasi).
+    """
+    def build(value):
+        if not value:
+            return []
+        try:
+            return [(fname, '=', int(value))]
+        except ValueError:
+            return [(name_path or fname + '.name', 'ilike', value)]
+    return build
+
+
+def id_in(fname):
+    """
+    Filter id (dipisah koma) langsung pada kolom Many2one. Tanpa subquery
+    ke tabel relasi seperti filter nama, dan bisa memakai index kolomnya.
+    """
+    def build(value):
+        ids = [int(item) for item in value.split(',') if item.strip()]
+        return [(fname, 'in', ids)] if ids else []
+    return build
+
+
+def build_domain(kw, spec):
+    """
+    Susun domain dari parameter query string sesuai spesifikasi filter.
+
+    :raise FilterError: bila nilai parameter tidak bisa dibaca
+    """
+    domain = []
+    for param, build in spec.items():
+        if param in kw:
+            try:
+                domain.extend(build(kw[param]))
+            except ValueError:
+                raise FilterError(param)
+    return domain
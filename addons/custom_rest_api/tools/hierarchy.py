@@ -0,0 +1,128 @@
+from collections import defaultdict
+
+from odoo.tools import SQL
+
+# Kedalaman maksimum subtree yang dikembalikan (parameter depth) dan batas
+# rekursi CTE atasan-bawahan sebagai pengaman bila data parent_id rusak
+DEFAULT_DEPTH = 3
+MAX_DEPTH = 10
+MAX_CTE_DEPTH = 50
+
+
+class DepthError(ValueError):
+    """Parameter depth bukan angka 1..MAX_DEPTH."""
+
+
+def parse_depth(kw):
+    try:
+        depth = int(kw.get('depth') or DEFAULT_DEPTH)
+    except ValueError:
+        raise DepthError(kw.get('depth'))
+    if not 1 <= depth <= MAX_DEPTH:
+        raise DepthError(depth)
+    return depth
+
+
+class Tree:
+    """
+    Pohon dari daftar edge ``(id, parent_id)`` yang sudah dibaca dengan satu
+    query. Node yang parent-nya tidak ikut terbaca (mis. diarsipkan) menjadi
+    akar, jadi tidak ada node yang hilang dari hasil.
+    """
+
+    def __init__(self, edges, root_ids=None):
+        ids = {node_id for node_id, _parent_id in edges}
+        self.children = defaultdict(list)
+        self.roots = []
+        for node_id, parent_id in edges:
+            if node_id in (root_ids or ()) or parent_id not in ids:
+                self.roots.append(node_id)
+            else:
+                self.children[parent_id].append(node_id)
+
+    def visible(self, depth):
+        """Id node sampai ``depth`` tingkat di bawah akar (akar = tingkat 0)."""
+        result, level = [], list(self.roots)
+        for _i in range(depth + 1):
+            result.extend(level)
+            level = [child for node_id in level for child in self.children[node_id]]
+        return result
+
+    def rollup(self, weights):
+        """
+        Jumlah bobot setiap subtree (node sendiri + semua turunannya),
+        dihitung sekali dari daun ke akar tanpa rekursi.
+
+        :param weights: dict ``id -> bobot`` (id yang tidak ada bernilai 0)
+        """
+        order, stack = [], list(self.roots)
+        while stack:
+            node_id = stack.pop()
+            order.append(node_id)
+            stack.extend(self.children[node_id])
+        totals = {}
+        for node_id in reversed(order):
+            totals[node_id] = weights.get(node_id, 0) + sum(
+                totals[child] for child in self.children[node_id])
+        return totals
+
+    def nest(self, items, depth, children_key='children', extra=None):
+        """
+        Susun dict hasil serializer menjadi pohon bersarang.
+
+        :param items: dict ``id -> dict`` untuk setiap node di ``visible(depth)``
+        :param extra: callable ``id -> dict`` yang ditambahkan ke setiap node
+        :return: list node akar
+        """
+        def build(node_id, level):
+            node = dict(items[node_id], **(extra(node_id) if extra else {}))
+            if level < depth:
+                node[children_key] = [build(child, level + 1) for child in self.children[node_id]]
+            else:
+                # Turunan di luar depth tidak dikirim; klien bisa meminta
+                # subtree node ini secara terpisah
+                node['has_more_children'] = bool(self.children[node_id])
+            return node
+        return [build(node_id, 0) for node_id in self.roots]
+
+
+def department_edges(Department, domain=(), root=None):
+    """
+    Edge seluruh departemen (atau subtree ``root``) dengan satu query
+    memakai parent_path ('1/5/12/') yang sudah di-index oleh _parent_store.
+    """
+    domain = list(domain)
+    if root:
+        domain.append(('parent_path', '=like', root.parent_path + '%'))
+    departments = Department.search_fetch(domain, ['parent_id'], order='parent_path')
+    return [(department.id, department.parent_id.id) for department in departments]
+
+
+def report_edges(env, employee_id, company_ids=None):
+    """
+    Edge semua bawahan langsung maupun tidak langsung dari ``employee_id``
+    dengan satu recursive CTE atas hr_employee.parent_id (karyawan tidak
+    memakai _parent_store). Hanya karyawan aktif; kedalaman dibatasi
+    MAX_CTE_DEPTH sebagai pengaman siklus.
+
+    :param company_ids: bila diisi, hanya karyawan perusahaan tersebut (atau
+        tanpa perusahaan); cabang di bawah karyawan lain ikut terpotong
+    """
+    company_filter = SQL("TRUE")
+    if company_ids is not None:
+        company_filter = SQL(
+            "(e.company_id IS NULL OR e.company_id = ANY(%s))", list(company_ids))
+    env.cr.execute(SQL("""
+        WITH RECURSIVE reports AS (
+            SELECT e.id, e.parent_id, 1 AS level
+              FROM hr_employee e
+             WHERE e.parent_id = %(root)s AND e.active AND %(company_filter)s
+            UNION ALL
+            SELECT e.id, e.parent_id, r.level + 1
+              FROM hr_employee e
+              JOIN reports r ON e.parent_id = r.id
+             WHERE e.active AND %(company_filter)s AND r.level < %(max_depth)s
+        )
+        SELECT id, parent_id FROM reports ORDER BY level, id
+    """, root=employee_id, company_filter=company_filter, max_depth=MAX_CTE_DEPTH))
+    return env.cr.fetchall()
@@ -0,0 +1,46 @@
+# Ukuran gambar yang tersedia di image.mixin. Setiap ukuran adalah field
+# Image tersimpan (attachment) yang sudah di-resize saat gambar diunggah,
+# jadi tidak ada resize saat request.
+IMAGE_FIELDS = {
+    '128': 'image_128',
+    '256': 'image_256',
+    '512': 'image_512',
+    '1024': 'image_1024',
+    '1920': 'image_1920',
+}
+
+DEFAULT_SIZE = '1920'
+
+
+class ImageSizeError(ValueError):
+    """Parameter size tidak ada di IMAGE_FIELDS."""
+
+
+def parse_size(kw):
+    """:return: kunci ukuran dari parameter ``size`` (default 1920)."""
+    size = str(kw.get('size') or DEFAULT_SIZE)
+    if size not in IMAGE_FIELDS:
+        raise ImageSizeError(size)
+    return size
+
+
+def checksums(records, fname, res_model=None):
+    """
+    Checksum attachment gambar untuk seluruh recordset dalam satu query.
+    Checksum dipakai sebagai 'unique' di URL gambar: berubah hanya bila
+    gambarnya berubah, sehingga browser/CDN boleh menyimpannya selamanya.
+
+    :param res_model: model pemilik gambar bila berbeda dari ``records``
+                      (mis. katalog produk yang id-nya sama dengan product.template)
+    :return: dict ``res_id -> checksum`` (record tanpa gambar tidak ada)
+    """
+    if not records:
+        return {}
+    # Menyebut res_field di domain menonaktifkan filter bawaan ir.attachment
+    # yang menyembunyikan attachment milik field
+    attachments = records.env['ir.attachment'].sudo().search_fetch([
+        ('res_model', '=', res_model or records._name),
+        ('res_field', '=', fname),
+        ('res_id', 'in', records.ids),
+    ], ['res_id', 'checksum'])
+    return {attachment.res_id: attachment.checksum for attachment in attachments}
@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from . import metrics
+
+# Instrumentasi per request untuk route /api/*. Bila system parameter
+# 'custom_rest_api.instrumentation' bernilai '1', setiap response mendapat
+# header Server-Timing dan satu baris log logfmt, dan latensi per route
+# disimpan di jendela bergulir untuk persentil p50/p95/p99. Terlepas dari
+# itu, setiap request dicatat ke metrik Prometheus (tools/metrics.py).
+
+_logger = logging.getLogger(__name__)
+
+# Sampel terakhir per route yang dipakai menghitung persentil
+WINDOW_SIZE = 1000
+# Ringkasan persentil semua route ditulis ke log paling sering sekali per interval
+SUMMARY_INTERVAL = 60
+
+_local = threading.local()
+
+
+def enabled(env):
+    return env['ir.config_parameter'].sudo().get_param('custom_rest_api.instrumentation') == '1'
+
+
+def reset():
+    """
+    Buang state pengukuran milik thread ini. Dipanggil di awal setiap
+    request: request sebelumnya yang gagal sebelum _post_dispatch (exception,
+    redirect) tidak boleh bocor ke request berikutnya di thread yang sama.
+    """
+    _local.request = None
+
+
+def start(route, method, timing=True, record_metrics=True):
+    """
+    Mulai mengukur request ini (dipanggil dari ir.http._pre_dispatch).
+
+    :param timing: kirim Server-Timing, tulis log dan isi histogram persentil
+    :param record_metrics: catat request ke metrik Prometheus
+    """
+    thread = threading.current_thread()
+    _local.request = {
+        'route': route,
+        'method': method,
+        'timing': timing,
+        'metrics': record_metrics,
+        'rows': None,
+        # Odoo mengisi perf_t0/query_count/query_time di thread setiap
+        # request; nilainya mencakup autentikasi dan routing juga
+        't0': getattr(thread, 'perf_t0', None) or time.time(),
+        'phases': defaultdict(float),
+    }
+
+
+@contextmanager
+def phase(name):
+    """Tambahkan durasi blok ini ke fase ``name`` (mis. 'serialize', 'encode')."""
+    current = getattr(_local, 'request', None)
+    if current is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        current['phases'][name] += time.perf_counter() - t0
+
+
+def count_rows(rows):
+    """Catat jumlah baris data di body response (metrik rows returned)."""
+    current = getattr(_local, 'request', None)
+    if current is not None:
+        current['rows'] = rows
+
+
+def finish(response):
+    """
+    Tutup pengukuran: pasang header Server-Timing, tulis log dan catat
+    latensi ke histogram route. Tidak melakukan apa pun bila request ini
+    tidak diinstrumentasi.
+    """
+    current = getattr(_local, 'request', None)
+    if current is None:
+        return
+    _local.request = None
+
+    total = time.time() - current['t0']
+    if current['metrics']:
+        metrics.observe_request(
+            current['route'], current['method'], response.status_code, total,
+            rows=current['rows'], size=response.content_length,
+        )
+    if not current['timing']:
+        return
+
+    thread = threading.current_thread()
+    queries = getattr(thread, 'query_count', 0)
+    sql_time = getattr(thread, 'query_time', 0.0)
+    phases = current['phases']
+
+    timings = [('db', sql_time, '%d queries' % queries)]
+    timings += [(name, phases[name], None) for name in ('serialize', 'encode', 'compress') if name in phases]
+    timings.append(('total', total, None))
+    response.headers['Server-Timing'] = ', '.join(
+        '%s;dur=%.1f' % (name, duration * 1000) + (';desc="%s"' % desc if desc else '')
+        for name, duration, desc in timings
+    )
+
+    _logger.info(
+        "route=%s method=%s status=%s total_ms=%.1f db_ms=%.1f queries=%d "
+        "serialize_ms=%.1f encode_ms=%.1f compress_ms=%.1f bytes=%s",
+        current['route'], current['method'], response.status_code, total * 1000,
+        sql_time * 1000, queries, phases['serialize'] * 1000, phases['encode'] * 1000,
+        phases['compress'] * 1000, response.content_length if response.content_length is not None else '-',
+    )
+    histograms.record(current['route'], total)
+
+
+class LatencyHistograms:
+    """Jendela bergulir latensi per route (per proses worker)."""
+
+    def __init__(self, window_size=WINDOW_SIZE):
+        self.window_size = window_size
+        self._samples = {}
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+        self._last_summary = time.monotonic()
+
+    def record(self, route, duration):
+        with self._lock:
+            samples = self._samples.get(route)
+            if samples is None:
+                samples = self._samples[route] = deque(maxlen=self.window_size)
+            samples.append(duration)
+            self._counts[route] += 1
+            summary_due = time.monotonic() - self._last_summary >= SUMMARY_INTERVAL
+            if summary_due:
+                self._last_summary = time.monotonic()
+        if summary_due:
+            for route_stats in self.stats():
+                _logger.info(
+                    "summary route=%(route)s count=%(count)d window=%(window)d "
+                    "p50_ms=%(p50_ms).1f p95_ms=%(p95_ms).1f p99_ms=%(p99_ms).1f", route_stats)
+
+    def stats(self):
+        """:return: list dict persentil (ms) per route, diurutkan per route"""
+        with self._lock:
+            snapshot = {route: sorted(samples) for route, samples in self._samples.items()}
+            counts = dict(self._counts)
+        return [{
+            'route': route,
+            'count': counts[route],
+            'window': len(samples),
+            'p50_ms': _percentile(samples, 50) * 1000,
+            'p95_ms': _percentile(samples, 95) * 1000,
+            'p99_ms': _percentile(samples, 99) * 1000,
+        } for route, samples in sorted(snapshot.items())]
+
+
+def _percentile(sorted_samples, percent):
+    """Persentil nearest-rank dari sampel yang sudah terurut."""
+    index = max(int(round(percent / 100 * len(sorted_samples))) - 1, 0)
+    return sorted_samples[index]
+
+
+histograms = LatencyHistograms()
@@ -0,0 +1,281 @@
+import atexit
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from odoo.tools import config
+
+from . import response_cache
+
+# Metrik Prometheus untuk route /api/*. Setiap proses (worker prefork)
+# mengumpulkan counter di memori lalu menulisnya ke file miliknya sendiri
+# (<data_dir>/rest_api_metrics/<pid>-<start>.json, paling sering sekali per
+# FLUSH_INTERVAL). /api/metrics menjumlahkan semua file, sehingga satu
+# scrape per host mencakup semua worker. File worker yang sudah mati
+# digabung ke archive.json agar counter tetap monotonik setelah worker
+# didaur ulang (limit_request / limit_memory_soft). Waktu mulai proses ikut
+# di nama file: pid yang dipakai ulang oleh worker baru tidak menimpa file
+# worker lama maupun membuatnya terlihat masih hidup.
+#
+# Aktif kecuali system parameter 'custom_rest_api.metrics' bernilai '0'.
+
+_logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1.0
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ARCHIVE = 'archive.json'
+
+HELP = {
+    'rest_api_requests_total': ('counter', 'Jumlah request REST API per route, method dan status.'),
+    'rest_api_request_duration_seconds': ('histogram', 'Latensi request REST API per route.'),
+    'rest_api_rows_returned_total': ('counter', 'Jumlah baris data yang dikembalikan per route.'),
+    'rest_api_response_bytes_total': ('counter', 'Jumlah byte body response per route.'),
+    'rest_api_rate_limited_total': ('counter', 'Request yang ditolak 429 per alasan (rate/concurrency).'),
+    'rest_api_response_cache_hits_total': ('counter', 'Hit response cache REST API.'),
+    'rest_api_response_cache_misses_total': ('counter', 'Miss response cache REST API.'),
+}
+
+
+def enabled(env):
+    return env['ir.config_parameter'].sudo().get_param('custom_rest_api.metrics', '1') != '0'
+
+
+def metrics_dir():
+    return os.path.join(config['data_dir'], 'rest_api_metrics')
+
+
+def _labels(**labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricStore:
+    """Counter dan histogram satu proses, ditulis berkala ke file per pid."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        # (nama, label) -> [jumlah per bucket..., +Inf] , sum
+        self.histograms = {}
+        self._last_flush = 0.0
+        self._dirty = False
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self.counters[(name, _labels(**labels))] += value
+            self._dirty = True
+
+    def observe(self, name, value, **labels):
+        with self._lock:
+            key = (name, _labels(**labels))
+            buckets, total = self.histograms.get(key) or ([0] * (len(DURATION_BUCKETS) + 1), 0.0)
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    buckets[index] += 1
+                    break
+            else:
+                buckets[-1] += 1
+            self.histograms[key] = (buckets, total + value)
+            self._dirty = True
+
+    def snapshot(self, extra_counters=()):
+        with self._lock:
+            counters = [[name, list(labels), value] for (name, labels), value in self.counters.items()]
+            histograms = [
+                [name, list(labels), list(buckets), total]
+                for (name, labels), (buckets, total) in self.histograms.items()
+            ]
+        counters.extend([name, [], value] for name, value in extra_counters)
+        pid = os.getpid()
+        return {'pid': pid, 'start': _process_start(pid), 'counters': counters, 'histograms': histograms}
+
+    def maybe_flush(self, force=False):
+        """Tulis snapshot proses ini ke file miliknya (atomik lewat rename)."""
+        now = time.monotonic()
+        if not force and (not self._dirty or now - self._last_flush < FLUSH_INTERVAL):
+            return
+        self._last_flush = now
+        self._dirty = False
+        directory = metrics_dir()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            snapshot = self.snapshot(_cache_counters())
+            path = os.path.join(directory, '%s-%s.json' % (snapshot['pid'], snapshot['start']))
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            _logger.warning("Metrik REST API tidak bisa ditulis ke %s: %s", directory, e)
+
+
+def _cache_counters():
+    return [
+        ('rest_api_response_cache_hits_total', response_cache.cache.hits),
+        ('rest_api_response_cache_misses_total', response_cache.cache.misses),
+    ]
+
+
+store = MetricStore()
+atexit.register(store.maybe_flush, force=True)
+
+
+def observe_request(route, method, status, duration, rows=None, size=None):
+    store.inc('rest_api_requests_total', route=route, method=method, status=status)
+    store.observe('rest_api_request_duration_seconds', duration, route=route)
+    if rows:
+        store.inc('rest_api_rows_returned_total', rows, route=route)
+    if size:
+        store.inc('rest_api_response_bytes_total', size, route=route)
+    store.maybe_flush()
+
+
+# === AGREGASI LINTAS WORKER ===
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _process_start(pid):
+    """
+    Waktu mulai proses (clock tick sejak boot, /proc/<pid>/stat); bersama
+    pid menjadi identitas unik proses. None bila /proc tidak tersedia.
+    """
+    try:
+        with open('/proc/%d/stat' % pid) as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # Nama proses (field 2) bisa berisi spasi; starttime adalah field 22
+    return int(stat.rsplit(')', 1)[1].split()[19])
+
+
+def _worker_alive(snapshot):
+    """Proses pemilik snapshot masih hidup (bukan pid yang sudah dipakai ulang)."""
+    pid = snapshot['pid']
+    if not _pid_alive(pid):
+        return False
+    start = snapshot.get('start')
+    if start is None:
+        return True
+    return _process_start(pid) in (None, start)
+
+
+def _merge(total, snapshot):
+    for name, labels, value in snapshot['counters']:
+        total['counters'][(name, tuple(map(tuple, labels)))] += value
+    for name, labels, buckets, value_sum in snapshot['histograms']:
+        key = (name, tuple(map(tuple, labels)))
+        current = total['histograms'].get(key)
+        if current is None:
+            total['histograms'][key] = (list(buckets), value_sum)
+        else:
+            total['histograms'][key] = ([a + b for a, b in zip(current[0], buckets)], current[1] + value_sum)
+
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def collect():
+    """
+    Jumlahkan file semua worker. File milik pid yang sudah mati dipindahkan
+    ke archive.json (di bawah flock) sehingga jumlah file tidak terus
+    bertambah dan counter tidak turun saat worker didaur ulang.
+    """
+    store.maybe_flush(force=True)
+    directory = metrics_dir()
+    os.makedirs(directory, exist_ok=True)
+    total = {'counters': defaultdict(float), 'histograms': {}}
+    with open(os.path.join(directory, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, ARCHIVE)
+        archive = {'counters': defaultdict(float), 'histograms': {}}
+        if os.path.exists(archive_path):
+            _merge(archive, _read(archive_path))
+        archived = False
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json') or filename == ARCHIVE:
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                snapshot = _read(path)
+            except (OSError, ValueError):
+                continue
+            if _worker_alive(snapshot):
+                _merge(total, snapshot)
+            else:
+                _merge(archive, snapshot)
+                os.unlink(path)
+                archived = True
+        if archived:
+            tmp_path = archive_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(_as_snapshot(archive), f)
+            os.replace(tmp_path, archive_path)
+    _merge(total, _as_snapshot(archive))
+    return total
+
+
+def _as_snapshot(total):
+    return {
+        'pid': 0,
+        'counters': [[name, labels, value] for (name, labels), value in total['counters'].items()],
+        'histograms': [
+            [name, labels, buckets, value_sum]
+            for (name, labels), (buckets, value_sum) in total['histograms'].items()
+        ],
+    }
+
+
+# === FORMAT EKSPOSISI TEKS PROMETHEUS ===
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in pairs
+    )
+
+
+def render(total):
+    """:return: teks exposition format 0.0.4"""
+    lines = []
+    by_name = defaultdict(list)
+    for (name, labels), value in total['counters'].items():
+        by_name[name].append((labels, value))
+    for (name, labels), histogram in total['histograms'].items():
+        by_name[name].append((labels, histogram))
+
+    for name in sorted(by_name):
+        metric_type, description = HELP.get(name, ('untyped', name))
+        lines.append('# HELP %s %s' % (name, description))
+        lines.append('# TYPE %s %s' % (name, metric_type))
+        for labels, value in sorted(by_name[name]):
+            if metric_type != 'histogram':
+                lines.append('%s%s %s' % (name, _format_labels(labels), _number(value)))
+                continue
+            buckets, value_sum = value
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + ('+Inf',), buckets):
+                cumulative += count
+                lines.append('%s_bucket%s %d' % (name, _format_labels(labels, [('le', bound)]), cumulative))
+            lines.append('%s_sum%s %s' % (name, _format_labels(labels), _number(value_sum)))
+            lines.append('%s_count%s %d' % (name, _format_labels(labels), cumulative))
+    return '\n'.join(lines) + '\n'
+
+
+def _number(value):
+    return '%d' % value if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,123 @@
+import base64
+import json
+from datetime import datetime
+
+# Urutan yang didukung untuk mode cursor (keyset). Setiap urutan harus
+# diakhiri dengan 'id' agar posisi halaman selalu unik.
+CURSOR_ORDERS = {
+    'id': 'id asc',
+    'write_date': 'write_date asc, id asc',
+}
+
+DEFAULT_CURSOR_LIMIT = 50
+
+
+class CursorError(ValueError):
+    """Token cursor atau parameter cursor tidak valid."""
+
+
+def encode_cursor(order_key, record):
+    """Buat token opaque (base64 url-safe) dari record terakhir di halaman."""
+    payload = {'k': order_key, 'id': record.id}
+    if order_key == 'write_date':
+        payload['wd'] = record.write_date.isoformat() if record.write_date else None
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, order_key):
+    """Kebalikan dari encode_cursor. Melempar CursorError bila token rusak."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        if payload.get('k') != order_key or not isinstance(payload.get('id'), int):
+            raise CursorError()
+        if order_key == 'write_date' and payload.get('wd'):
+            payload['wd'] = datetime.fromisoformat(payload['wd'])
+    except (ValueError, TypeError, AttributeError):
+        raise CursorError()
+    return payload
+
+
+def parse_cursor_params(kw):
+    """
+    Baca parameter mode cursor dari query string.
+
+    Mengembalikan None bila klien memakai mode offset (tidak mengirim
+    'cursor' maupun 'after_id'), atau tuple (order_key, posisi) dengan
+    posisi None untuk halaman pertama.
+    """
+    if 'cursor' not in kw and 'after_id' not in kw:
+        return None
+
+    order_key = kw.get('order') or 'id'
+    if order_key not in CURSOR_ORDERS:
+        raise CursorError()
+
+    if kw.get('after_id'):
+        # after_id adalah bentuk sederhana dari cursor untuk urutan id
+        if order_key != 'id':
+            raise CursorError()
+        try:
+            return order_key, {'k': order_key, 'id': int(kw['after_id'])}
+        except ValueError:
+            raise CursorError()
+
+    token = kw.get('cursor')
+    return order_key, (decode_cursor(token, order_key) if token else None)
+
+
+def keyset_domain(order_key, position):
+    """Domain 'setelah posisi ini' sesuai urutan yang dipakai."""
+    if order_key == 'write_date' and position.get('wd'):
+        return ['|',
+                ('write_date', '>', position['wd']),
+                '&', ('write_date', '=', position['wd']), ('id', '>', position['id'])]
+    if order_key == 'write_date':
+        # Record tanpa write_date diurutkan paling akhir oleh Postgres
+        return [('write_date', '=', False), ('id', '>', position['id'])]
+    return [('id', '>', position['id'])]
+
+
+def search_after(model, domain, limit, cursor):
+    """
+    Ambil satu halaman dengan keyset pagination.
+
+    Biaya query konstan berapa pun dalamnya halaman karena Postgres
+    langsung melompat ke posisi cursor lewat index, bukan membuang
+    'offset' baris. Satu baris ekstra diambil untuk mengetahui apakah
+    masih ada halaman berikutnya.
+
+    :return: tuple (records, next_cursor) dengan next_cursor None
+             pada halaman terakhir.
+    """
+    order_key, position = cursor
+    if position:
+        domain = list(domain) + keyset_domain(order_key, position)
+
+    records = model.search(domain, limit=limit + 1, order=CURSOR_ORDERS[order_key])
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_cursor(order_key, records[-1])
+    return records, next_cursor
+
+
+def search_page(model, domain, limit, offset, count_mode='exact', order=None):
+    """
+    Ambil satu halaman dengan paginasi offset.
+
+    Untuk mode hitung selain 'exact', satu baris ekstra diambil sehingga
+    'has_more' bisa diketahui tanpa query COUNT terpisah.
+
+    :param order: urutan eksplisit (default ``_order`` model)
+
+    :return: tuple (records, has_more); has_more None pada mode 'exact'
+             karena nilainya diturunkan dari total
+    """
+    if count_mode == 'exact' or not limit:
+        records = model.search(domain, limit=limit or None, offset=offset, order=order)
+        return records, (None if count_mode == 'exact' else False)
+
+    records = model.search(domain, limit=limit + 1, offset=offset, order=order)
+    return records[:limit], len(records) > limit
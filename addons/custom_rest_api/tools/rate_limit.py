@@ -0,0 +1,148 @@
+import math
+import threading
+import time
+import zlib
+
+from odoo.tools import SQL
+
+# Token bucket per klien, bisa diubah lewat ir.config_parameter:
+# 'custom_rest_api.rate_limit_rate'  request per detik (0 = rate limit mati)
+# 'custom_rest_api.rate_limit_burst' kapasitas bucket (request beruntun)
+# 'custom_rest_api.rate_limit_backend' 'memory' (per worker) atau 'postgres'
+#     (bucket bersama semua worker di tabel UNLOGGED rest_api_rate_limit)
+DEFAULT_RATE = 10
+DEFAULT_BURST = 60
+DEFAULT_BACKEND = 'memory'
+
+# Batas request bersamaan per grup route di seluruh worker
+# ('custom_rest_api.concurrency_<grup>', 0 = tanpa batas). Export besar
+# (list tanpa limit, stream, batch) dibatasi agar tidak menghabiskan
+# worker yang dibutuhkan request interaktif.
+DEFAULT_CONCURRENCY = {'export': 2}
+
+TABLE = 'rest_api_rate_limit'
+MAX_MEMORY_BUCKETS = 10000
+
+
+class RateLimited(Exception):
+    """Request ditolak; ``retry_after`` dalam detik untuk header Retry-After."""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def client_key(httprequest, uid=None):
+    """
+    Identitas klien untuk bucket: user yang sudah diautentikasi (session
+    atau API key yang divalidasi Odoo), selain itu alamat IP. Header yang
+    belum divalidasi tidak pernah dipakai: nilai acak di setiap request
+    akan mendapat bucket baru dan lolos dari rate limit.
+    """
+    if uid:
+        return 'user:%s' % uid
+    return 'ip:%s' % httprequest.remote_addr
+
+
+def _param(env, name, default):
+    return env['ir.config_parameter'].sudo().get_param('custom_rest_api.%s' % name, default)
+
+
+def _retry_after(tokens, rate):
+    return max(math.ceil((1 - tokens) / rate), 1)
+
+
+class MemoryBuckets:
+    """Token bucket di memori proses; setiap worker punya bucket sendiri."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst):
+        """:return: tuple (diizinkan, sisa token)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > MAX_MEMORY_BUCKETS:
+                self._prune(now, rate, burst)
+        return allowed, tokens
+
+    def _prune(self, now, rate, burst):
+        # Bucket yang sudah terisi penuh sama dengan bucket baru
+        self._buckets = {
+            key: (tokens, updated) for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * rate < burst
+        }
+
+
+memory_buckets = MemoryBuckets()
+
+
+def _take_postgres(registry, key, rate, burst):
+    """
+    Ambil satu token dari bucket bersama dalam satu UPSERT atomik.
+    Dijalankan di cursor terpisah yang langsung commit: lock baris bucket
+    tidak ikut tertahan selama transaksi request berjalan.
+    """
+    refilled = SQL(
+        "LEAST(%s, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * %s)",
+        burst, rate,
+    )
+    with registry.cursor() as cr:
+        cr.execute(SQL("""
+            INSERT INTO %(table)s AS b (key, tokens, allowed, updated_at)
+            VALUES (%(key)s, %(burst)s - 1, true, clock_timestamp())
+            ON CONFLICT (key) DO UPDATE SET
+                allowed = %(refilled)s >= 1,
+                tokens = CASE WHEN %(refilled)s >= 1 THEN %(refilled)s - 1 ELSE %(refilled)s END,
+                updated_at = clock_timestamp()
+            RETURNING allowed, tokens
+        """, table=SQL.identifier(TABLE), key=key, burst=burst, refilled=refilled))
+        return cr.fetchone()
+
+
+def check_rate(env, key):
+    """
+    :raise RateLimited: bila bucket klien ``key`` kosong
+    """
+    rate = float(_param(env, 'rate_limit_rate', DEFAULT_RATE))
+    if rate <= 0:
+        return
+    burst = float(_param(env, 'rate_limit_burst', DEFAULT_BURST))
+    if _param(env, 'rate_limit_backend', DEFAULT_BACKEND) == 'postgres':
+        allowed, tokens = _take_postgres(env.registry, key, rate, burst)
+    else:
+        allowed, tokens = memory_buckets.take(key, rate, burst)
+    if not allowed:
+        raise RateLimited('rate', _retry_after(tokens, rate))
+
+
+def acquire_slot(env, group):
+    """
+    Ambil satu slot konkurensi grup ``group`` dengan advisory lock
+    transaksi. Lock lepas sendiri saat transaksi request selesai, juga bila
+    worker mati, jadi tidak ada slot yang bocor.
+
+    :raise RateLimited: bila semua slot grup sedang dipakai
+    """
+    slots = int(_param(env, 'concurrency_%s' % group, DEFAULT_CONCURRENCY.get(group, 0)))
+    if slots <= 0:
+        return
+    # Kunci pertama advisory lock: hash nama grup (int4 bertanda)
+    lock_key = zlib.crc32(('custom_rest_api.%s' % group).encode()) - 2 ** 31
+    # generate_series dievaluasi berurutan dan berhenti di slot pertama
+    # yang berhasil dikunci (LIMIT 1), jadi hanya satu lock yang diambil
+    env.cr.execute(SQL("""
+        SELECT slot FROM generate_series(0, %s - 1) AS slot
+         WHERE pg_try_advisory_xact_lock(%s, slot)
+         LIMIT 1
+    """, slots, lock_key))
+    if not env.cr.fetchone():
+        raise RateLimited('concurrency', 1)
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+
+from odoo.tools import SQL
+
+# Batas default, bisa diubah lewat ir.config_parameter
+# 'custom_rest_api.cache_size' dan 'custom_rest_api.cache_ttl'
+DEFAULT_MAX_SIZE = 512
+DEFAULT_TTL = 300
+
+SEQUENCE_PREFIX = 'rest_api_cache_'
+
+
+def sequence_name(model):
+    """Nama sequence signaling untuk satu model, mis. rest_api_cache_res_company."""
+    return SEQUENCE_PREFIX + model._table
+
+
+class ResponseCache:
+    """
+    Cache LRU ber-TTL per proses worker untuk payload endpoint read-only.
+
+    Setiap entry ditandai dengan 'generation', yaitu nilai sequence
+    signaling Postgres milik model-model yang menjadi sumber datanya.
+    Override create/write/unlink (lihat models/rest_api_cache.py) menaikkan
+    sequence tersebut setelah commit, sehingga entry lama otomatis tidak
+    berlaku di semua worker; pola yang sama dengan signaling cache registry
+    Odoo, tanpa mengosongkan seluruh ormcache setiap ada partner berubah.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, entry_generation, value = entry
+            if entry_generation != generation or expires < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, generation, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+        }
+
+
+cache = ResponseCache()
+
+
+def _configure(env):
+    """Terapkan ukuran dan TTL dari system parameter (get_param sudah di-ormcache)."""
+    ICP = env['ir.config_parameter'].sudo()
+    cache.max_size = int(ICP.get_param('custom_rest_api.cache_size', DEFAULT_MAX_SIZE))
+    cache.ttl = int(ICP.get_param('custom_rest_api.cache_ttl', DEFAULT_TTL))
+
+
+def read_generation(env, model_names):
+    """Baca nilai sequence signaling semua model sumber dalam satu query."""
+    columns = [
+        SQL("(SELECT (last_value, is_called)::text FROM %s)",
+            SQL.identifier(sequence_name(env[name])))
+        for name in model_names
+    ]
+    env.cr.execute(SQL("SELECT %s", SQL(", ").join(columns)))
+    return env.cr.fetchone()
+
+
+def make_key(env, endpoint, params):
+    """Kunci cache: endpoint, parameter ternormalisasi dan cakupan user/company."""
+    return (
+        env.cr.dbname,
+        endpoint,
+        tuple(sorted((k, str(v)) for k, v in params.items())),
+        env.uid,
+        tuple(env.companies.ids),
+    )
+
+
+def lookup(env, endpoint, params, model_names):
+    """
+    :return: tuple (key, generation, value_atau_None)
+    """
+    _configure(env)
+    key = make_key(env, endpoint, params)
+    generation = read_generation(env, model_names)
+    return key, generation, cache.get(key, generation)
+
+
+def store(key, generation, value):
+    cache.set(key, generation, value)
@@ -0,0 +1,205 @@
+from collections import defaultdict, namedtuple
+
+from . import instrumentation
+
+
+def read_records(records, fields):
+    """
+    Baca seluruh recordset sekaligus dan resolve relasi Many2one secara batch.
+
+    Alih-alih mengakses ``record.relasi.name`` satu per satu (N+1 query),
+    fungsi ini menjalankan satu ``read`` untuk semua field, lalu satu
+    lookup nama untuk setiap model relasi. Jumlah query untuk satu halaman
+    menjadi O(jumlah relasi), bukan O(baris x relasi).
+
+    :param records: recordset yang akan dibaca (record sudah pasti ada)
+    :param fields: daftar nama field yang dibaca
+    :return: list dict sesuai urutan ``records``; nilai Many2one diganti
+             dengan ``{'id': ..., 'name': ...}`` atau None bila kosong
+    """
+    if not records:
+        return []
+    if not fields:
+        # read([]) berarti "semua field", jadi jangan dipanggil tanpa field
+        return [{'id': record_id} for record_id in records.ids]
+
+    rows = records.read(fields, load=None)
+
+    # Kelompokkan id relasi per model tujuan agar tiap model cukup satu query
+    many2one = {
+        fname: records._fields[fname].comodel_name
+        for fname in fields
+        if records._fields[fname].type == 'many2one'
+    }
+    ids_by_model = defaultdict(set)
+    for row in rows:
+        for fname, comodel in many2one.items():
+            if row[fname]:
+                ids_by_model[comodel].add(row[fname])
+
+    names = {
+        comodel: _read_names(records.env[comodel], ids)
+        for comodel, ids in ids_by_model.items()
+    }
+
+    for row in rows:
+        for fname, comodel in many2one.items():
+            rel_id = row[fname]
+            row[fname] = {'id': rel_id, 'name': names[comodel].get(rel_id)} if rel_id else None
+    return rows
+
+
+def m2o_name(value):
+    """Ambil nama dari nilai Many2one hasil read_records (atau None)."""
+    return value['name'] if value else None
+
+
+def _read_names(model, ids):
+    """Satu query nama untuk sekumpulan id pada satu model."""
+    name_field = 'name' if 'name' in model._fields else 'display_name'
+    records = model.browse(ids).with_context(active_test=False)
+    return {row['id']: row[name_field] for row in records.read([name_field], load=None)}
+
+
+# === SKEMA OUTPUT, SPARSE FIELDSET & EXPAND ===
+#
+# Setiap resource mendeskripsikan output-nya sebagai dict
+# ``kunci_output -> (field_sumber, getter)``. Kunci skema sekaligus menjadi
+# allowlist parameter ``fields=``, dan hanya field sumber dari kunci yang
+# diminta yang dibaca (field computed mahal tidak ikut dihitung).
+
+
+def field(fname, or_none=False):
+    """Kunci output yang langsung mengambil nilai satu field."""
+    if or_none:
+        return (fname,), lambda row: row[fname] or None
+    return (fname,), lambda row: row[fname]
+
+
+def name_of(fname):
+    """Kunci output berisi nama record Many2one (string atau None)."""
+    return (fname,), lambda row: m2o_name(row[fname])
+
+
+def relation(fname):
+    """Kunci output berisi {'id', 'name'} record Many2one atau None."""
+    return (fname,), lambda row: row[fname]
+
+
+# Kunci output yang dihitung sekali untuk seluruh recordset (mis. satu
+# GROUP BY atau satu query attachment), bukan per baris hasil read
+_Computed = namedtuple('_Computed', ['fields', 'compute', 'default'])
+
+
+def computed(compute, default=None):
+    """
+    Kunci output yang nilainya dihitung per batch.
+
+    :param compute: callable(records) -> dict ``id -> nilai``; hanya
+                    dipanggil bila kuncinya diminta
+    :param default: nilai untuk record yang tidak ada di hasil ``compute``
+    """
+    return _Computed((), compute, default)
+
+
+class FieldSelectionError(ValueError):
+    """Parameter fields/expand berisi nama yang tidak diizinkan."""
+
+    def __init__(self, param, invalid):
+        super().__init__(param, invalid)
+        self.param = param
+        self.invalid = invalid
+
+    @property
+    def message(self):
+        return 'Nilai parameter %s tidak dikenal: %s' % (self.param, ', '.join(self.invalid))
+
+
+def _parse_list(kw, param, allowed):
+    raw = kw.get(param)
+    if not raw:
+        return None
+    keys = [key.strip() for key in raw.split(',') if key.strip()]
+    invalid = [key for key in keys if key not in allowed]
+    if invalid:
+        raise FieldSelectionError(param, invalid)
+    return keys
+
+
+def parse_fields_params(kw, schema, expansions=None):
+    """
+    Baca parameter ``fields=`` dan ``expand=`` (dipisah koma).
+
+    :return: tuple (keys, expand); keys None berarti payload default
+    :raise FieldSelectionError: bila ada nama di luar allowlist
+    """
+    keys = _parse_list(kw, 'fields', schema)
+    expand = _parse_list(kw, 'expand', expansions or {}) or []
+    return keys, expand
+
+
+def serialize(records, schema, keys=None, expansions=None, expand=()):
+    """
+    Ubah recordset menjadi list dict sesuai skema.
+
+    :param keys: kunci output yang diminta (default: semua kunci skema);
+                 'id' selalu disertakan
+    :param expansions: dict ``kunci -> (field_many2one, field_nested)`` untuk
+                       relasi yang boleh di-expand menjadi objek lengkap
+    :param expand: kunci relasi yang di-expand; field relasi dibaca satu
+                   query per relasi, bukan per record
+    """
+    with instrumentation.phase('serialize'):
+        return _serialize(records, schema, keys, expansions, expand)
+
+
+def _selection(schema, keys, expansions, expand):
+    """:return: tuple (kunci output terpilih, field sumber yang perlu dibaca)"""
+    if keys is None:
+        keys = list(schema)
+    selected = [key for key in schema if key == 'id' or key in keys or key in expand]
+
+    source_fields = []
+    for key in selected:
+        source_fields.extend(schema[key][0])
+    for key in expand:
+        source_fields.append(expansions[key][0])
+    return selected, list(dict.fromkeys(f for f in source_fields if f != 'id'))
+
+
+def relation_fields(model, schema, keys=None, expansions=None, expand=()):
+    """
+    Field Many2one yang nama atau objek expand-nya ikut di output; dipakai
+    validator conditional GET (lihat tools/conditional.py).
+    """
+    _selected, source_fields = _selection(schema, keys, expansions, expand)
+    return [fname for fname in source_fields if model._fields[fname].type == 'many2one']
+
+
+def _serialize(records, schema, keys, expansions, expand):
+    selected, source_fields = _selection(schema, keys, expansions, expand)
+    rows = read_records(records, source_fields)
+
+    nested = {}
+    for key in expand:
+        fname, nested_fields = expansions[key]
+        related_ids = {row[fname]['id'] for row in rows if row[fname]}
+        related = records.env[records._fields[fname].comodel_name].browse(related_ids)
+        nested[key] = (fname, {item['id']: item for item in read_records(related, nested_fields)})
+
+    batches = {
+        key: (schema[key].compute(records), schema[key].default)
+        for key in selected
+        if isinstance(schema[key], _Computed)
+    }
+
+    result = []
+    for row in rows:
+        item = {
+            key: batches[key][0].get(row['id'], batches[key][1]) if key in batches else schema[key][1](row)
+            for key in selected
+        }
+        for key, (fname, by_id) in nested.items():
+            item[key] = by_id.get(row[fname]['id']) if row[fname] else None
+        result.append(item)
+    return result
@@ -0,0 +1,61 @@
+from odoo import api
+from odoo.tools import SQL
+
+from . import rate_limit, sync
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_batches(env, model_name, domain, batch_size=DEFAULT_BATCH_SIZE, sudo=True, slot_group=None):
+    """
+    Generator yang mengembalikan recordset per batch berukuran tetap.
+
+    Body response streaming baru diiterasi oleh Werkzeug setelah handler
+    selesai dan cursor request sudah ditutup, jadi generator ini membuka
+    cursor (read-only) sendiri dari registry. Batch diambil dengan keyset
+    'id > terakhir' dan cache ORM dikosongkan setiap batch, sehingga
+    pemakaian memori tetap datar berapa pun ukuran tabelnya.
+
+    Cursor dibuka (dan slot diambil) saat fungsi ini dipanggil, bukan saat
+    batch pertama dibaca, sehingga handler masih bisa menjawab 429.
+
+    :param env: environment request; hanya uid, context dan registry yang dipakai
+    :param slot_group: grup konkurensi (lihat tools/rate_limit.py) yang slotnya
+                       ditahan di cursor stream selama ekspor berjalan
+    :return: generator recordset, masing-masing berisi maksimal ``batch_size`` record
+    :raise rate_limit.RateLimited: bila semua slot ``slot_group`` sedang dipakai
+    """
+    registry = env.registry
+    uid = env.uid
+    context = dict(env.context)
+    domain = list(domain)
+
+    def generate():
+        with registry.cursor(readonly=True) as cr:
+            # Transaksi read-only ini bisa terbuka selama ekspor; tandai agar
+            # tidak menahan watermark feed /changes (lihat sync.watermark)
+            cr.execute(SQL("SELECT set_config('application_name', %s, true)", sync.READONLY_APPLICATION_NAME))
+            batch_env = api.Environment(cr, uid, context)
+            if slot_group:
+                # Slot ditahan transaksi cursor stream sampai ekspor selesai
+                rate_limit.acquire_slot(batch_env, slot_group)
+            # Titik henti pertama: setup selesai, belum ada batch yang dibaca
+            yield None
+            Model = batch_env[model_name]
+            if sudo:
+                Model = Model.sudo()
+            last_id = 0
+            while True:
+                records = Model.search(
+                    domain + [('id', '>', last_id)],
+                    limit=batch_size, order='id asc',
+                )
+                if not records:
+                    break
+                yield records
+                last_id = records[-1].id
+                batch_env.invalidate_all()
+
+    batches = generate()
+    next(batches)
+    return batches
@@ -0,0 +1,153 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from odoo.tools import SQL
+
+from .pagination import keyset_domain
+
+DEFAULT_SYNC_LIMIT = 1000
+MAX_SYNC_LIMIT = 5000
+# Transaksi yang lebih tua dari ini (detik) tidak lagi menahan watermark
+MAX_WATERMARK_LAG = 600
+# application_name cursor read-only modul ini; diabaikan oleh watermark()
+READONLY_APPLICATION_NAME = 'odoo-rest-api-readonly'
+
+
+class SyncTokenError(ValueError):
+    """Token sinkronisasi rusak."""
+
+
+class SyncTokenExpired(Exception):
+    """Token lebih tua dari masa retensi tombstone; klien harus full resync."""
+
+
+def encode_token(since, last_id=0, high_water=None):
+    """
+    :param since: write_date posisi keyset terakhir
+    :param high_water: batas atas jendela sinkronisasi; hanya ada pada token
+        lanjutan (has_more) agar semua halaman satu jendela memakai batas yang sama
+    """
+    payload = {'t': since.isoformat(), 'id': last_id}
+    if high_water:
+        payload['hw'] = high_water.isoformat()
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_token(token):
+    """
+    :return: tuple (datetime, last_id, high_water); token kosong berarti dari
+        awal, high_water None berarti jendela baru
+    """
+    if not token:
+        return datetime(1970, 1, 1), 0, None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        high_water = payload.get('hw') and datetime.fromisoformat(payload['hw'])
+        return datetime.fromisoformat(payload['t']), int(payload['id']), high_water or None
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise SyncTokenError()
+
+
+def watermark(cr):
+    """
+    Batas waktu aman untuk token berikutnya.
+
+    write_date diisi dengan waktu mulai transaksi, jadi transaksi yang
+    masih berjalan bisa meng-commit record dengan write_date lebih lama dari
+    "sekarang". Mengambil xact_start tertua di database ini memastikan record
+    tersebut tetap terbaca pada sinkronisasi berikutnya (paling buruk
+    terkirim dua kali, tidak pernah terlewat).
+
+    Yang tidak ikut dihitung, agar satu sesi lama tidak menahan token
+    semua klien (yang lalu mengunduh ulang jendela yang sama setiap poll):
+    - proses non-klien (autovacuum dll.) dan cursor read-only milik modul
+      ini (ekspor streaming, lihat tools/streaming.py) yang tidak menulis;
+    - transaksi yang lebih tua dari MAX_WATERMARK_LAG. Request HTTP Odoo
+      dibatasi limit_time_real jauh di bawah itu; yang tersisa praktis
+      hanya sesi 'idle in transaction' yang terlantar.
+    """
+    cr.execute(SQL("""
+        SELECT min(xact_start) AT TIME ZONE 'UTC'
+          FROM pg_stat_activity
+         WHERE datname = current_database()
+           AND backend_type = 'client backend'
+           AND xact_start IS NOT NULL
+           AND xact_start > now() - make_interval(secs => %s)
+           AND application_name != %s
+    """, MAX_WATERMARK_LAG, READONLY_APPLICATION_NAME))
+    oldest = cr.fetchone()[0]
+    now = cr.now()
+    return min(oldest, now) if oldest else now
+
+
+def changes_since(model, token, limit, serialize):
+    """
+    Kumpulkan perubahan satu model sejak token.
+
+    Record aktif yang berubah dikembalikan lewat ``serialize``; record yang
+    diarsipkan atau dihapus (tombstone) dikembalikan sebagai daftar id.
+    Perubahan dan tombstone dipaging bersama dengan keyset yang sama,
+    (write_date, id) untuk record dan (deleted_at, res_id) untuk tombstone,
+    sehingga impor maupun penghapusan massal tetap terbagi per halaman
+    dan tidak ada yang dikirim ulang di setiap halaman.
+
+    Satu jendela sinkronisasi dibatasi high water (watermark saat halaman
+    pertama dibaca) dan batas itu dibawa token has_more sampai halaman
+    terakhir; perubahan sesudahnya menunggu jendela berikutnya. Kedaluwarsa
+    token diukur dari high water tersebut (waktu jendela dibuka), bukan dari
+    posisi keyset, sehingga sinkronisasi awal atas data lama tetap selesai.
+
+    :param model: model yang sudah di-sudo
+    :param serialize: callable(recordset) -> list dict
+    :raise SyncTokenExpired: bila token lebih tua dari retensi tombstone
+    """
+    env = model.env
+    since, last_id, high_water = decode_token(token)
+    days = int(env['ir.config_parameter'].sudo().get_param(
+        'custom_rest_api.tombstone_retention_days', 30))
+    # Token akhir jendela: high water-nya adalah 'since' itu sendiri
+    if token and (high_water or since) < env.cr.now() - timedelta(days=days):
+        raise SyncTokenExpired()
+
+    if not high_water:
+        high_water = watermark(env.cr)
+    position = {'wd': since, 'id': last_id}
+    Model = model.with_context(active_test=False)
+    changed = Model.search(
+        [('write_date', '<=', high_water)] + keyset_domain('write_date', position),
+        limit=limit + 1, order='write_date asc, id asc',
+    )
+    tombstones = env['rest.api.tombstone'].sudo().search_fetch(
+        [('res_model', '=', model._name), ('deleted_at', '<=', high_water),
+         '|', ('deleted_at', '>', since),
+         '&', ('deleted_at', '=', since), ('res_id', '>', last_id)],
+        ['res_id', 'deleted_at'], limit=limit + 1, order='deleted_at asc, res_id asc',
+    )
+
+    # Gabungkan kedua urutan; masing-masing cukup limit + 1 baris agar
+    # 'limit' event pertama hasil gabungan pasti lengkap
+    events = sorted(
+        [(record.write_date, record.id, True) for record in changed] +
+        [(tombstone.deleted_at, tombstone.res_id, False) for tombstone in tombstones],
+    )
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    page = Model.browse([record_id for _date, record_id, is_record in events if is_record])
+    active = page.filtered('active') if 'active' in Model._fields else page
+    deleted = set((page - active).ids)
+    deleted.update(record_id for _date, record_id, is_record in events if not is_record)
+
+    if has_more:
+        next_token = encode_token(events[-1][0], events[-1][1], high_water)
+    else:
+        next_token = encode_token(high_water)
+
+    return {
+        'data': serialize(active),
+        'deleted': sorted(deleted),
+        'has_more': has_more,
+        'next_token': next_token,
+    }